@@ -0,0 +1,169 @@
+"""
+Benchmark: response_cache storage as JSONB vs zstd bytea (with and without
+a trained dictionary).
+
+Loads the same response bodies into three temporary tables and reports the
+average stored row size, the total table size (heap + TOAST + indexes) and
+the latency of a primary-key lookup that ends in the response JSON text:
+``response_json::text`` for JSONB, fetch + decompress for zstd.
+
+Bodies come from the current cache namespace (--source cache) or are built
+from the rule-based sections for payloads spread over the quiz answer space
+(--source rules, the default). The rule-based bodies leave out the LLM-written
+prose, so they compress better than real responses; use --source cache on a
+populated database for representative numbers.
+
+Needs DATABASE_URL and zstd (Python 3.14+ or the ``zstandard`` package).
+
+Run from backend/:
+    python -m benchmarks.bench_cache_compression [--rows 5000] [--lookups 2000] [--source rules|cache]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from itertools import islice
+from typing import Callable, List, Tuple
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import psycopg2  # noqa: E402
+from psycopg2.extras import execute_values  # noqa: E402
+
+from src.config.settings import settings  # noqa: E402
+from src.repositories.cache_repository import CacheRepository  # noqa: E402
+from src.repositories.connection_pool import close_database_pool, init_database_pool  # noqa: E402
+from src.repositories.response_codec import ResponseCodec, train_dictionary  # noqa: E402
+from src.services.cache_version import get_cache_namespace  # noqa: E402
+from src.services.canonical_payload import canonical_cache_key, canonical_payload  # noqa: E402
+from src.services.quiz_space import iter_quiz_payloads  # noqa: E402
+from src.services.run_poc import compute_deterministic_sections  # noqa: E402
+
+MODEL_NAME = "gpt-4o"
+
+
+def _rule_bodies(rows: int) -> List[Tuple[str, str]]:
+    # Every 97th payload spreads the sample over backgrounds, goals and levels.
+    bodies = []
+    for raw_payload in islice(iter_quiz_payloads(), 0, rows * 97, 97):
+        payload = canonical_payload(raw_payload)
+        sections = compute_deterministic_sections(payload)
+        body = json.dumps(
+            {"success": True, "profile_evaluation": sections["profile_evaluation"]},
+            separators=(",", ":"),
+        )
+        bodies.append((canonical_cache_key(payload), body))
+    return bodies
+
+
+def _cache_bodies(rows: int) -> List[Tuple[str, str]]:
+    db_pool = init_database_pool()
+    try:
+        samples = CacheRepository(db_pool).sample_responses(get_cache_namespace(MODEL_NAME), rows)
+    finally:
+        close_database_pool()
+    return [(f"{index:064x}", body) for index, body in enumerate(samples)]
+
+
+def _load(cur, table: str, column_type: str, rows: List[Tuple[str, object]]) -> None:
+    cur.execute(
+        f"CREATE TEMP TABLE {table} (id SERIAL PRIMARY KEY, cache_key VARCHAR(64) UNIQUE, body {column_type})"
+    )
+    cast = "::jsonb" if column_type == "JSONB" else ""
+    execute_values(cur, f"INSERT INTO {table} (cache_key, body) VALUES %s", rows, template=f"(%s, %s{cast})")
+    cur.execute(f"ANALYZE {table}")
+
+
+def _sizes(cur, table: str) -> Tuple[float, int]:
+    cur.execute(f"SELECT AVG(pg_column_size(body)), pg_total_relation_size('{table}') FROM {table}")
+    avg_row, total = cur.fetchone()
+    return float(avg_row), total
+
+
+def _lookup_latencies(
+    cur,
+    table: str,
+    select: str,
+    decode: Callable[[object], str],
+    keys: List[str],
+) -> List[float]:
+    latencies = []
+    for cache_key in keys:
+        start = time.perf_counter()
+        cur.execute(f"SELECT {select} FROM {table} WHERE cache_key = %s", (cache_key,))
+        decode(cur.fetchone()[0])
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--source", choices=["rules", "cache"], default="rules")
+    parser.add_argument("--level", type=int, default=3)
+    parser.add_argument("--dict-size", type=int, default=112_640)
+    parser.add_argument("--train-fraction", type=float, default=0.2)
+    args = parser.parse_args()
+
+    bodies = _rule_bodies(args.rows) if args.source == "rules" else _cache_bodies(args.rows)
+    if not bodies:
+        print("No response bodies to benchmark")
+        return 1
+
+    train_count = max(1, int(len(bodies) * args.train_fraction))
+    dictionary = train_dictionary([body.encode("utf-8") for _, body in bodies[:train_count]], args.dict_size)
+    plain = ResponseCodec(level=args.level)
+    with_dict = ResponseCodec(level=args.level, dictionary=dictionary)
+
+    variants = [
+        ("jsonb", "JSONB", lambda body: body, "body::text", lambda value: value),
+        (
+            "zstd",
+            "BYTEA",
+            lambda body: psycopg2.Binary(plain.compress(body.encode("utf-8"))),
+            "body",
+            lambda value: plain.decompress(bytes(value)).decode("utf-8"),
+        ),
+        (
+            "zstd+dict",
+            "BYTEA",
+            lambda body: psycopg2.Binary(with_dict.compress(body.encode("utf-8"))),
+            "body",
+            lambda value: with_dict.decompress(bytes(value)).decode("utf-8"),
+        ),
+    ]
+
+    keys = [cache_key for cache_key, _ in bodies]
+    lookup_keys = [random.choice(keys) for _ in range(args.lookups)]
+    raw_bytes = statistics.mean(len(body.encode("utf-8")) for _, body in bodies)
+
+    print(f"{len(bodies)} bodies from {args.source}, {raw_bytes:,.0f} bytes of JSON on average")
+    print(f"dictionary: {len(dictionary):,} bytes trained on {train_count} bodies; zstd level {args.level}")
+    print()
+    print(f"{'format':<10} {'avg row':>10} {'ratio':>7} {'table':>12} {'p50 read':>10} {'p95 read':>10}")
+
+    conn = psycopg2.connect(settings.database_url)
+    try:
+        with conn.cursor() as cur:
+            for name, column_type, encode, select, decode in variants:
+                table = f"bench_{name.replace('+', '_')}"
+                _load(cur, table, column_type, [(cache_key, encode(body)) for cache_key, body in bodies])
+                avg_row, total = _sizes(cur, table)
+                _lookup_latencies(cur, table, select, decode, lookup_keys[:100])  # warm-up
+                latencies = _lookup_latencies(cur, table, select, decode, lookup_keys)
+                p95 = statistics.quantiles(latencies, n=20)[-1]
+                print(
+                    f"{name:<10} {avg_row:>9,.0f}B {raw_bytes / avg_row:>6.1f}x {total / 1024:>10,.0f}KB "
+                    f"{statistics.median(latencies) * 1e6:>8.0f}µs {p95 * 1e6:>8.0f}µs"
+                )
+    finally:
+        conn.rollback()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+"""
+Microbenchmark: per-request cost of preparing the OpenAI request.
+
+Compares rebuilding everything on every cache miss (what call_openai_structured
+used to do: system prompt, model_json_schema() + normalizers, a fresh client)
+with filling in the precompiled LLMRequestTemplate and reusing the pooled client.
+
+Run from backend/:
+    python -m benchmarks.bench_llm_request_template [--iterations 2000]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/benchmark")
+
+from openai import OpenAI  # noqa: E402
+
+from src.services.llm_request import (  # noqa: E402
+    build_llm_request_template,
+    get_llm_request_template,
+    get_openai_client,
+)
+from src.services.run_poc import DEFAULT_INPUT, compute_deterministic_sections  # noqa: E402
+
+
+def _per_request_rebuild(llm_inputs) -> None:
+    OpenAI(api_key="sk-benchmark")
+    build_llm_request_template().build_messages(
+        input_payload=DEFAULT_INPUT,
+        calculated_profile_score=llm_inputs["scoring_result"]["score"],
+        calculated_interview_readiness=llm_inputs["interview_readiness_result"],
+        target_company_label=llm_inputs["target_company_label"],
+    )
+
+
+def _precompiled(llm_inputs) -> None:
+    get_openai_client("sk-benchmark")
+    get_llm_request_template().build_messages(
+        input_payload=DEFAULT_INPUT,
+        calculated_profile_score=llm_inputs["scoring_result"]["score"],
+        calculated_interview_readiness=llm_inputs["interview_readiness_result"],
+        target_company_label=llm_inputs["target_company_label"],
+    )
+
+
+def _time_per_call(fn, llm_inputs, iterations: int) -> float:
+    fn(llm_inputs)  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(llm_inputs)
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    llm_inputs = compute_deterministic_sections(DEFAULT_INPUT)
+    rebuild = _time_per_call(_per_request_rebuild, llm_inputs, args.iterations)
+    precompiled = _time_per_call(_precompiled, llm_inputs, args.iterations)
+
+    print(f"per-request rebuild : {rebuild * 1e6:10.1f} µs/request")
+    print(f"precompiled template: {precompiled * 1e6:10.1f} µs/request")
+    print(f"overhead removed    : {(rebuild - precompiled) * 1e6:10.1f} µs/request "
+          f"({rebuild / precompiled:.1f}x faster)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,212 @@
+"""
+Benchmark: the rule engine over the whole quiz answer space.
+
+Enumerates every valid tech and non-tech quiz combination (src.services.
+quiz_space), canonicalizes each payload the way the API does, and times each
+rule function over all of them. Reports calls/s and µs/call per function,
+plus the peak memory one call allocates (tracemalloc, over a sample). With
+--baseline it compares against a saved run and exits 1 when a function got
+slower or allocates more than the allowed threshold. Timings count the
+fastest of --repeat runs per chunk and are scaled by a calibration loop, so
+background load and a different machine don't read as regressions.
+
+Runs offline: no OpenAI or Postgres access.
+
+Run from backend/:
+    python -m benchmarks.bench_rule_engine --save-baseline baseline.json
+    python -m benchmarks.bench_rule_engine --baseline baseline.json [--time-threshold 0.25]
+    python -m benchmarks.bench_rule_engine --stride 50 --repeat 1   # quick run on every 50th payload
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/benchmark")
+
+from src.services.canonical_payload import canonical_payload  # noqa: E402
+from src.services.current_profile_summary import generate_current_profile_summary  # noqa: E402
+from src.services.interview_readiness_logic import calculate_interview_readiness  # noqa: E402
+from src.services.job_descriptions import generate_job_opportunities, generate_recommended_roles  # noqa: E402
+from src.services.profile_notes_logic import generate_profile_strength_notes  # noqa: E402
+from src.services.quick_wins_logic import generate_quick_wins  # noqa: E402
+from src.services.quiz_space import iter_quiz_payloads  # noqa: E402
+from src.services.scoring_logic import calculate_profile_strength  # noqa: E402
+from src.services.tools_logic import generate_tool_recommendations  # noqa: E402
+
+# (background, quiz_responses, profile strength score)
+RuleInput = Tuple[str, Dict[str, Any], int]
+
+RULE_FUNCTIONS: Dict[str, Callable[[RuleInput], Any]] = {
+    "calculate_profile_strength": lambda args: calculate_profile_strength(args[0], args[1]),
+    "calculate_interview_readiness": lambda args: calculate_interview_readiness(args[0], args[1]),
+    "generate_quick_wins": lambda args: generate_quick_wins(args[0], args[1]),
+    "generate_tool_recommendations": lambda args: generate_tool_recommendations(args[0], args[1]),
+    "generate_profile_strength_notes": lambda args: generate_profile_strength_notes(*args),
+    "generate_job_opportunities": lambda args: generate_job_opportunities(args[0], args[1]),
+    "generate_recommended_roles": lambda args: generate_recommended_roles(args[0], args[1]),
+    "generate_current_profile_summary": lambda args: generate_current_profile_summary(args[0], args[1]),
+}
+
+
+def _iter_chunks(stride: int, chunk_size: int) -> Iterator[List[RuleInput]]:
+    # Inputs are prepared a chunk at a time so the whole space never sits in
+    # memory and payload construction stays out of the timed loops.
+    payloads = islice(iter_quiz_payloads(), 0, None, stride)
+    while True:
+        chunk = []
+        for payload in islice(payloads, chunk_size):
+            payload = canonical_payload(payload)
+            background, quiz_responses = payload["background"], payload["quizResponses"]
+            score = calculate_profile_strength(background, quiz_responses)["score"]
+            chunk.append((background, quiz_responses, score))
+        if not chunk:
+            return
+        yield chunk
+
+
+def measure_throughput(stride: int, chunk_size: int, repeat: int) -> Tuple[int, Dict[str, float]]:
+    """Total seconds per function; each chunk counts its fastest of ``repeat`` runs."""
+    elapsed = {name: 0.0 for name in RULE_FUNCTIONS}
+    calls = 0
+    for chunk in _iter_chunks(stride, chunk_size):
+        calls += len(chunk)
+        for name, fn in RULE_FUNCTIONS.items():
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for rule_input in chunk:
+                    fn(rule_input)
+                best = min(best, time.perf_counter() - start)
+            elapsed[name] += best
+    return calls, elapsed
+
+
+def calibrate(repeat: int = 5) -> float:
+    """
+    Seconds for a fixed dict/string workload resembling the rules.
+
+    Timings are compared relative to this, so a baseline saved on one machine
+    (or under a different load) still gives a meaningful comparison.
+    """
+    quiz = {"currentRole": "swe-product", "experience": "3-5", "targetRole": "faang-sde"}
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for index in range(50_000):
+            role = quiz.get("currentRole", "")
+            label = f"{role}-{index % 7}" if quiz["experience"] in ("3-5", "5-8") else role
+            [label.upper(), {"title": label, "level": index % 3}]
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_allocations(sample: List[RuleInput]) -> Dict[str, Dict[str, float]]:
+    """Mean / max peak bytes allocated by one call, and bytes still held after the sample."""
+    results = {}
+    tracemalloc.start()
+    try:
+        for name, fn in RULE_FUNCTIONS.items():
+            fn(sample[0])  # warm any lazy module state before measuring
+            before_sample = tracemalloc.get_traced_memory()[0]
+            peaks = []
+            for rule_input in sample:
+                tracemalloc.reset_peak()
+                before_call = tracemalloc.get_traced_memory()[0]
+                fn(rule_input)
+                peaks.append(tracemalloc.get_traced_memory()[1] - before_call)
+            results[name] = {
+                "mean_peak_bytes": sum(peaks) / len(peaks),
+                "max_peak_bytes": max(peaks),
+                "retained_bytes": tracemalloc.get_traced_memory()[0] - before_sample,
+            }
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def compare(
+    report: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    time_threshold: float,
+    alloc_threshold: float,
+) -> List[str]:
+    regressions = []
+    # Scale the baseline's timings to this run's machine speed.
+    speed = report["_calibration"]["seconds"] / baseline["_calibration"]["seconds"]
+    for name, current in report.items():
+        previous = baseline.get(name)
+        if name.startswith("_") or previous is None:
+            continue
+        previous = {**previous, "us_per_call": previous["us_per_call"] * speed}
+        for metric, threshold in (("us_per_call", time_threshold), ("mean_peak_bytes", alloc_threshold)):
+            if previous[metric] and current[metric] > previous[metric] * (1 + threshold):
+                change = current[metric] / previous[metric] - 1
+                regressions.append(
+                    f"{name}: {metric} {previous[metric]:.1f} -> {current[metric]:.1f} "
+                    f"(+{change:.0%}, threshold {threshold:.0%})"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--stride", type=int, default=1, help="benchmark every Nth payload of the space")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per chunk; the fastest counts")
+    parser.add_argument("--alloc-sample", type=int, default=2000, help="payloads traced for allocations")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", help="write this run's results as a baseline")
+    parser.add_argument("--time-threshold", type=float, default=0.25, help="allowed µs/call increase")
+    parser.add_argument("--alloc-threshold", type=float, default=0.10, help="allowed peak-bytes increase")
+    args = parser.parse_args()
+
+    calibration = calibrate()
+    calls, elapsed = measure_throughput(args.stride, args.chunk_size, args.repeat)
+    calibration = min(calibration, calibrate())
+    # Spread the allocation sample over the space like the timing run.
+    alloc_stride = max(1, calls // args.alloc_sample) * args.stride
+    sample = next(_iter_chunks(alloc_stride, args.alloc_sample))
+    allocations = measure_allocations(sample)
+
+    report: Dict[str, Dict[str, float]] = {"_calibration": {"seconds": calibration}}
+    print(f"{calls:,} payloads (stride {args.stride}); allocations traced over {len(sample):,}")
+    print()
+    print(f"{'function':<34} {'calls/s':>12} {'µs/call':>9} {'peak KiB':>9} {'max KiB':>9}")
+    for name in RULE_FUNCTIONS:
+        us_per_call = elapsed[name] / calls * 1e6
+        report[name] = {
+            "calls_per_second": calls / elapsed[name],
+            "us_per_call": us_per_call,
+            **allocations[name],
+        }
+        print(
+            f"{name:<34} {report[name]['calls_per_second']:>12,.0f} {us_per_call:>9.2f} "
+            f"{allocations[name]['mean_peak_bytes'] / 1024:>9.1f} {allocations[name]['max_peak_bytes'] / 1024:>9.1f}"
+        )
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.time_threshold, args.alloc_threshold)
+        if regressions:
+            print("\nRegressions:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+"""
+Benchmark: run_poc end to end on the cache-miss path, with the LLM replayed.
+
+Caching is switched off, so every evaluation goes through scoring, the
+chat.completions request, output validation, the deterministic overlay and
+serialization. The completions come from a cassette (src.services.
+llm_cassette) in-process, without network access, so what is measured is our
+own CPU cost per evaluation. Reports evaluations/s, per-evaluation latency
+percentiles and the mean time per pipeline stage.
+
+Record the cassette once, against OpenAI or loadtest.mock_openai (via
+OPENAI_BASE_URL), then replay it offline as often as needed.
+
+Run from backend/:
+    python -m benchmarks.bench_run_poc --cassette run_poc.cassette.jsonl --record [--payloads 200]
+    python -m benchmarks.bench_run_poc --cassette run_poc.cassette.jsonl [--payloads 200] [--repeat 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from itertools import islice
+from typing import Any, Dict, List
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/benchmark")
+os.environ["CACHE_ENABLED"] = "false"
+
+from prometheus_client import REGISTRY  # noqa: E402
+
+from src.config.settings import settings  # noqa: E402
+from src.services.llm_cassette import get_cassette  # noqa: E402
+from src.services.quiz_space import iter_quiz_payloads  # noqa: E402
+from src.services.run_poc import run_poc  # noqa: E402
+
+STAGES = ("cache_lookup", "scoring", "raw_cache_lookup", "llm", "raw_cache_write", "overlay", "cache_write", "validation")
+
+
+def _stage_totals() -> Dict[str, float]:
+    return {
+        stage: REGISTRY.get_sample_value("evaluation_stage_duration_seconds_sum", {"stage": stage}) or 0.0
+        for stage in STAGES
+    }
+
+
+def _evaluate_all(payloads: List[Dict[str, Any]]) -> List[float]:
+    latencies = []
+    for payload in payloads:
+        start = time.perf_counter()
+        run_poc(input_payload=payload)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cassette", required=True, help="JSONL cassette to replay (or record into)")
+    parser.add_argument("--record", action="store_true", help="record missing completions over the network")
+    parser.add_argument("--payloads", type=int, default=200)
+    parser.add_argument("--payload-stride", type=int, default=97, help="take every Nth payload of the quiz space")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes over the payloads")
+    args = parser.parse_args()
+
+    settings.openai_cassette_mode = "record" if args.record else "replay"
+    settings.openai_cassette_path = args.cassette
+    payloads = list(islice(iter_quiz_payloads(), 0, args.payloads * args.payload_stride, args.payload_stride))
+
+    # The first pass warms up (and, with --record, fills the cassette).
+    try:
+        _evaluate_all(payloads)
+    except Exception as exc:
+        print(f"Evaluation failed: {exc}", file=sys.stderr)
+        if not args.record:
+            print("Is every payload in the cassette? Record it with --record first.", file=sys.stderr)
+        return 2
+    if args.record:
+        print(f"{len(get_cassette(args.cassette))} completions in {args.cassette}")
+        return 0
+
+    before = _stage_totals()
+    latencies: List[float] = []
+    for _ in range(args.repeat):
+        latencies.extend(_evaluate_all(payloads))
+    after = _stage_totals()
+
+    total = sum(latencies)
+    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+    print(f"{len(latencies):,} evaluations ({len(payloads)} payloads x {args.repeat}), replayed from {args.cassette}")
+    print(f"{len(latencies) / total:,.1f} evaluations/s")
+    print(f"p50 {statistics.median(latencies) * 1000:.2f} ms   p95 {p95 * 1000:.2f} ms   max {max(latencies) * 1000:.2f} ms")
+    print()
+    print(f"{'stage':<18} {'ms/eval':>9} {'share':>7}")
+    for stage in STAGES:
+        seconds = after[stage] - before[stage]
+        print(f"{stage:<18} {seconds / len(latencies) * 1000:>9.3f} {seconds / total:>6.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,20 +2,35 @@ CREATE TABLE IF NOT EXISTS response_cache (
     id SERIAL PRIMARY KEY,
     cache_key VARCHAR(64) NOT NULL,
     model VARCHAR(100) NOT NULL,
-    response_json JSONB NOT NULL,
+    response_json JSONB,
+    response_zstd BYTEA,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    hit_count BIGINT NOT NULL DEFAULT 0,
+    last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT unique_cache_entry UNIQUE (cache_key, model)
 );
+-- Existing deployments: add the access-tracking columns in place.
+ALTER TABLE response_cache ADD COLUMN IF NOT EXISTS hit_count BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE response_cache ADD COLUMN IF NOT EXISTS last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+-- Existing deployments: allow zstd-compressed rows (CACHE_COMPRESSION=zstd).
+ALTER TABLE response_cache ADD COLUMN IF NOT EXISTS response_zstd BYTEA;
+ALTER TABLE response_cache ALTER COLUMN response_json DROP NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_cache_key ON response_cache(cache_key);
 CREATE INDEX IF NOT EXISTS idx_model ON response_cache(model);
 CREATE INDEX IF NOT EXISTS idx_created_at ON response_cache(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_updated_at ON response_cache(updated_at);
+CREATE INDEX IF NOT EXISTS idx_last_accessed_at ON response_cache(last_accessed_at);
+CREATE INDEX IF NOT EXISTS idx_hit_count ON response_cache(hit_count, last_accessed_at);
 COMMENT ON TABLE response_cache IS 'Stores cached ChatGPT API responses keyed by SHA256 hash of input payload';
 COMMENT ON COLUMN response_cache.cache_key IS 'SHA256 hash of the normalized input payload';
-COMMENT ON COLUMN response_cache.model IS 'OpenAI model identifier';
-COMMENT ON COLUMN response_cache.response_json IS 'Full JSON response from ChatGPT API';
+COMMENT ON COLUMN response_cache.model IS 'Cache namespace: OpenAI model identifier plus version fingerprint, e.g. gpt-4o:1a2b3c4d5e6f7a8b';
+COMMENT ON COLUMN response_cache.response_json IS 'Full JSON response from ChatGPT API; NULL when stored in response_zstd';
+COMMENT ON COLUMN response_cache.response_zstd IS 'zstd-compressed response JSON (optionally with a trained dictionary); NULL when stored as JSONB';
 COMMENT ON COLUMN response_cache.created_at IS 'Timestamp when cache entry was first created';
 COMMENT ON COLUMN response_cache.updated_at IS 'Timestamp when cache entry was last updated';
+COMMENT ON COLUMN response_cache.hit_count IS 'Cache hits (L1 and Postgres), written in batches; LFU eviction order';
+COMMENT ON COLUMN response_cache.last_accessed_at IS 'Last batched hit flush touching this entry; LRU eviction order';
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
 BEGIN
@@ -23,8 +38,11 @@ BEGIN
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
+-- Only content rewrites refresh updated_at (the TTL clock); batched hit
+-- tracking updates must not.
+DROP TRIGGER IF EXISTS update_response_cache_updated_at ON response_cache;
 CREATE TRIGGER update_response_cache_updated_at
-    BEFORE UPDATE ON response_cache
+    BEFORE UPDATE OF response_json, response_zstd ON response_cache
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 CREATE OR REPLACE VIEW cache_statistics AS
@@ -37,3 +55,68 @@ SELECT
     pg_size_pretty(pg_total_relation_size('response_cache')) as table_size
 FROM response_cache;
 COMMENT ON VIEW cache_statistics IS 'Provides overview statistics of the response cache';
+CREATE TABLE IF NOT EXISTS request_frequency (
+    cache_key VARCHAR(64) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    request_count BIGINT NOT NULL DEFAULT 0,
+    last_requested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT unique_request_frequency UNIQUE (cache_key, model)
+);
+CREATE INDEX IF NOT EXISTS idx_request_frequency_count ON request_frequency(model, request_count DESC);
+COMMENT ON TABLE request_frequency IS 'Number of /evaluate requests seen per cache key; ranks payloads for cache warmup';
+COMMENT ON COLUMN request_frequency.request_count IS 'Total requests for this cache key, including cache hits';
+COMMENT ON COLUMN request_frequency.last_requested_at IS 'Timestamp of the most recent batched increment';
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    id SERIAL PRIMARY KEY,
+    cache_key VARCHAR(64) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    prompt_fingerprint VARCHAR(64) NOT NULL,
+    payload JSONB NOT NULL,
+    raw_json JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT unique_llm_response UNIQUE (cache_key, model, prompt_fingerprint)
+);
+CREATE INDEX IF NOT EXISTS idx_llm_response_fingerprint ON llm_response_cache(model, prompt_fingerprint, id);
+COMMENT ON TABLE llm_response_cache IS 'Raw LLM output before the rule-based overlay; re-overlaid when rules change';
+COMMENT ON COLUMN llm_response_cache.cache_key IS 'Canonical cache key of the payload (same as response_cache.cache_key)';
+COMMENT ON COLUMN llm_response_cache.prompt_fingerprint IS 'SHA256 of the prompt template and response schema that produced raw_json';
+COMMENT ON COLUMN llm_response_cache.payload IS 'Canonical payload, needed to recompute the overlay';
+COMMENT ON COLUMN llm_response_cache.raw_json IS 'FullProfileEvaluationResponseRaw returned by the LLM';
+CREATE TABLE IF NOT EXISTS evaluation_jobs (
+    id UUID PRIMARY KEY,
+    status VARCHAR(16) NOT NULL DEFAULT 'queued',
+    cache_key VARCHAR(64) NOT NULL,
+    payload JSONB NOT NULL,
+    result_json JSONB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id VARCHAR(100),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    lease_expires_at TIMESTAMP,
+    retry_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    CONSTRAINT evaluation_jobs_status CHECK (status IN ('queued', 'running', 'done', 'failed'))
+);
+-- Databases created before retry_at existed.
+ALTER TABLE evaluation_jobs ADD COLUMN IF NOT EXISTS retry_at TIMESTAMP;
+CREATE INDEX IF NOT EXISTS idx_evaluation_jobs_queued ON evaluation_jobs(created_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_evaluation_jobs_lease ON evaluation_jobs(lease_expires_at) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_evaluation_jobs_finished ON evaluation_jobs(finished_at) WHERE status IN ('done', 'failed');
+COMMENT ON TABLE evaluation_jobs IS 'Queue of asynchronous /evaluate/jobs submissions, consumed by src.services.evaluation_worker';
+COMMENT ON COLUMN evaluation_jobs.status IS 'queued -> running -> done | failed; failed attempts go back to queued until JOB_MAX_ATTEMPTS';
+COMMENT ON COLUMN evaluation_jobs.payload IS 'Canonical payload to evaluate';
+COMMENT ON COLUMN evaluation_jobs.result_json IS 'FullProfileEvaluationResponse once the job is done';
+COMMENT ON COLUMN evaluation_jobs.lease_expires_at IS 'A running job whose lease has expired (worker died) is claimed again';
+COMMENT ON COLUMN evaluation_jobs.retry_at IS 'A queued job that failed an attempt is not claimed again before this time';
+
+CREATE TABLE IF NOT EXISTS llm_rate_limit (
+    name VARCHAR(100) PRIMARY KEY,
+    requests DOUBLE PRECISION NOT NULL,
+    tokens DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+COMMENT ON TABLE llm_rate_limit IS 'Shared OpenAI RPM/TPM token buckets (src.services.llm_admission), one row per model';
+COMMENT ON COLUMN llm_rate_limit.requests IS 'Requests left in the bucket as of updated_at';
+COMMENT ON COLUMN llm_rate_limit.tokens IS 'Tokens left in the bucket as of updated_at';
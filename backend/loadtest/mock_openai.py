@@ -0,0 +1,255 @@
+"""
+Local stand-in for OpenAI's chat.completions endpoint, for load tests.
+
+Answers POST /v1/chat/completions with a chat.completion whose message is a
+schema-valid FullProfileEvaluationResponseRaw, after a delay drawn from a
+configurable latency distribution. A share of requests can instead fail
+with a 500, be rate limited (429 with Retry-After) or get truncated JSON
+back, which exercises the client's retry and correction paths. Answers are
+derived from a hash of the prompt, so the same payload always gets the same
+evaluation.
+
+Point the API at it with OPENAI_BASE_URL=http://127.0.0.1:8100/v1.
+
+Latency specs (seconds):
+    fixed:S  uniform:LOW,HIGH  normal:MEAN,STDDEV  lognormal:MEDIAN,SIGMA
+
+GET /stats returns the request counters, POST /stats/reset zeroes them.
+
+Run from backend/:
+    python -m loadtest.mock_openai [--port 8100] [--latency lognormal:1.5,0.4]
+        [--error-rate 0.02] [--rate-limit-rate 0.05] [--retry-after 1]
+        [--malformed-rate 0.02] [--seed 1]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from src.models.models_raw import FullProfileEvaluationResponseRaw
+
+LatencySampler = Callable[[random.Random], float]
+
+_STRENGTHS = [
+    "Consistent problem-solving practice",
+    "Production experience shipping features end to end",
+    "Comfort with backend fundamentals (APIs, databases, caching)",
+    "Exposure to system design discussions",
+    "Strong ownership of deliverables in the current role",
+    "Familiarity with cloud deployment and CI/CD",
+    "Clear motivation for the target role",
+]
+_AREAS = [
+    "Depth in distributed system design trade-offs",
+    "Timed DSA practice on medium/hard problems",
+    "Mock interviews to build interview stamina",
+    "A public portfolio of non-trivial projects",
+    "Quantifying impact on the resume",
+    "Hands-on experience with the target stack",
+    "Structured preparation for behavioural rounds",
+]
+_BADGES = ["Consistent Learner", "Builder", "Problem Solver", "System Thinker", "Career Switcher", "Rising Talent"]
+_EXPERIENCE_BANDS = ["0-1", "1-3", "3-5", "5-7", "7-10", "10+"]
+
+
+def parse_latency(spec: str) -> LatencySampler:
+    """Build a latency sampler from a ``kind:params`` spec (see module docstring)."""
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(value) for value in params.split(",")] if params else []
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec!r}") from None
+
+    if kind == "fixed" and len(values) == 1:
+        seconds = values[0]
+        return lambda rng: seconds
+    if kind == "uniform" and len(values) == 2:
+        low, high = values
+        return lambda rng: rng.uniform(low, high)
+    if kind == "normal" and len(values) == 2:
+        mean, stddev = values
+        return lambda rng: max(0.0, rng.gauss(mean, stddev))
+    if kind == "lognormal" and len(values) == 2:
+        median, sigma = values
+        mu = math.log(median) if median > 0 else 0.0
+        return lambda rng: rng.lognormvariate(mu, sigma) if median > 0 else 0.0
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+
+def build_evaluation(seed: bytes) -> str:
+    """A schema-valid raw evaluation, chosen deterministically from ``seed``."""
+    rng = random.Random(seed)
+    percentile = rng.randint(15, 95)
+    evaluation = FullProfileEvaluationResponseRaw.model_validate({
+        "profile_evaluation": {
+            "skill_analysis": {
+                "strengths": rng.sample(_STRENGTHS, 3),
+                "areas_to_develop": rng.sample(_AREAS, 3),
+            },
+            "experience_benchmark": {
+                "your_experience_years": rng.choice(_EXPERIENCE_BANDS),
+                "typical_for_target_role_years": rng.choice(_EXPERIENCE_BANDS),
+                "gap_analysis": "Experience is broadly in line with the target role; close the gaps below to compete.",
+            },
+            "interview_readiness": {
+                "technical_notes": "Fundamentals are in place; timed practice and mock rounds will lift consistency.",
+            },
+            "peer_comparison": {
+                "percentile": percentile,
+                "summary": f"Ahead of roughly {percentile}% of peers with a similar background.",
+                "metrics": {"better_than_peers_percent": percentile},
+            },
+            "success_likelihood": {
+                "score_percent": rng.randint(30, 90),
+                "notes": "Likely within 4-6 months with steady preparation.",
+            },
+            "badges": rng.sample(_BADGES, rng.randint(1, 3)),
+        }
+    })
+    return evaluation.model_dump_json()
+
+
+def _error_body(message: str, error_type: str, code: Optional[str] = None) -> Dict[str, Any]:
+    return {"error": {"message": message, "type": error_type, "param": None, "code": code}}
+
+
+class MockStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.ok = 0
+        self.malformed = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+
+def create_app(
+    latency: str = "fixed:0",
+    error_rate: float = 0.0,
+    rate_limit_rate: float = 0.0,
+    retry_after: float = 1.0,
+    malformed_rate: float = 0.0,
+    seed: Optional[int] = None,
+) -> FastAPI:
+    sample_latency = parse_latency(latency)
+    # Fault injection and latency share one generator; the event loop is
+    # single-threaded, so no lock is needed.
+    rng = random.Random(seed)
+    stats = MockStats()
+    app = FastAPI(title="Mock OpenAI", docs_url=None, redoc_url=None)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages: List[Dict[str, Any]] = body.get("messages", [])
+        stats.requests += 1
+
+        if rng.random() < rate_limit_rate:
+            stats.rate_limited += 1
+            return JSONResponse(
+                _error_body("Rate limit reached for requests (mock).", "requests", "rate_limit_exceeded"),
+                status_code=429,
+                headers={"Retry-After": f"{retry_after:g}"},
+            )
+
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            await asyncio.sleep(sample_latency(rng))
+        finally:
+            stats.in_flight -= 1
+
+        if rng.random() < error_rate:
+            stats.errors += 1
+            return JSONResponse(_error_body("The server had an error (mock).", "server_error"), status_code=500)
+
+        prompt = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+        content = build_evaluation(hashlib.sha256(prompt.encode("utf-8")).digest())
+        if rng.random() < malformed_rate:
+            stats.malformed += 1
+            content = content[: len(content) // 2]
+        else:
+            stats.ok += 1
+
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": f"chatcmpl-mock-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content, "refusal": None},
+                    "finish_reason": "stop",
+                    "logprobs": None,
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": 0},
+            },
+        }
+
+    @app.get("/stats")
+    async def get_stats() -> Dict[str, int]:
+        return stats.snapshot()
+
+    @app.post("/stats/reset")
+    async def reset_stats() -> Dict[str, int]:
+        stats.reset()
+        return stats.snapshot()
+
+    return app
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="lognormal:1.5,0.4", help="latency distribution spec, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with a 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with a 429")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="share of replies with truncated JSON")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    try:
+        parse_latency(args.latency)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    app = create_app(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
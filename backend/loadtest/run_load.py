@@ -0,0 +1,234 @@
+"""
+Load test: drive the real API against the local OpenAI stand-in.
+
+Starts loadtest.mock_openai and the FastAPI app (uvicorn, with
+OPENAI_BASE_URL pointing at the mock) as subprocesses, sends POST /evaluate
+requests from --concurrency workers until --requests have completed (or
+--duration seconds have passed) and reports throughput, latency percentiles
+per status code and the mock's own counters. Pass --app-url / --mock-url to
+use servers that are already running instead of starting them.
+
+Payloads are spread over the quiz answer space; --distinct bounds how many
+different ones are sent, which sets the mix of cache hits and misses. The
+app reads its other settings (DATABASE_URL, CACHE_ENABLED, ...) from the
+environment as usual; CACHE_ENABLED=false sends every request to the mock.
+
+Run from backend/:
+    python -m loadtest.run_load --requests 500 --concurrency 32 --distinct 200 \\
+        --mock-args="--latency lognormal:1.0,0.5 --rate-limit-rate 0.05" [--json report.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from src.services.quiz_space import iter_quiz_payloads
+
+API_PREFIX = "/career-profile-tool/api"
+
+# (status code or exception name, seconds)
+Sample = Tuple[str, float]
+
+
+def _sample_payloads(distinct: int, stride: int) -> List[Dict[str, Any]]:
+    return list(islice(iter_quiz_payloads(), 0, distinct * stride, stride))
+
+
+def _wait_until_up(url: str, process: Optional[subprocess.Popen], timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode} before it came up")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def _start_mock(port: int, mock_args: str) -> subprocess.Popen:
+    command = [sys.executable, "-m", "loadtest.mock_openai", "--port", str(port), *shlex.split(mock_args)]
+    return subprocess.Popen(command)
+
+
+def _start_app(port: int, mock_url: str, workers: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["OPENAI_BASE_URL"] = f"{mock_url}/v1"
+    env.setdefault("OPENAI_API_KEY", "sk-loadtest")
+    command = [
+        sys.executable, "-m", "uvicorn", "src.api.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+    ]
+    return subprocess.Popen(command, env=env)
+
+
+async def run_load(
+    app_url: str,
+    payloads: List[Dict[str, Any]],
+    concurrency: int,
+    total_requests: Optional[int],
+    duration: Optional[float],
+    timeout: float,
+    seed: Optional[int],
+) -> Tuple[List[Sample], float]:
+    rng = random.Random(seed)
+    samples: List[Sample] = []
+    issued = 0
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal issued
+        while True:
+            if total_requests is not None and issued >= total_requests:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            issued += 1
+            payload = rng.choice(payloads)
+            request_started = time.perf_counter()
+            try:
+                response = await client.post(f"{API_PREFIX}/evaluate", json=payload)
+                outcome = str(response.status_code)
+            except httpx.HTTPError as exc:
+                outcome = type(exc).__name__
+            samples.append((outcome, time.perf_counter() - request_started))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=app_url, timeout=timeout, limits=limits) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+    if len(latencies) < 2:
+        value = latencies[0] * 1000 if latencies else 0.0
+        return {"count": len(latencies), "p50_ms": value, "p90_ms": value, "p95_ms": value, "p99_ms": value, "max_ms": value}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "count": len(latencies),
+        "p50_ms": cuts[49] * 1000,
+        "p90_ms": cuts[89] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+def build_report(samples: List[Sample], elapsed: float, concurrency: int, distinct: int) -> Dict[str, Any]:
+    by_outcome: Dict[str, List[float]] = {}
+    for outcome, latency in samples:
+        by_outcome.setdefault(outcome, []).append(latency)
+    ok = sum(len(latencies) for outcome, latencies in by_outcome.items() if outcome.startswith("2"))
+    return {
+        "requests": len(samples),
+        "concurrency": concurrency,
+        "distinct_payloads": distinct,
+        "elapsed_seconds": elapsed,
+        "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+        "success_rps": ok / elapsed if elapsed else 0.0,
+        "status_counts": dict(Counter(outcome for outcome, _ in samples)),
+        "latency": {
+            "all": _latency_summary([latency for _, latency in samples]),
+            **{outcome: _latency_summary(latencies) for outcome, latencies in sorted(by_outcome.items())},
+        },
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{report['requests']:,} requests in {report['elapsed_seconds']:.1f}s at concurrency "
+        f"{report['concurrency']} over {report['distinct_payloads']:,} distinct payloads"
+    )
+    print(f"throughput: {report['throughput_rps']:.1f} req/s ({report['success_rps']:.1f} req/s successful)")
+    print()
+    print(f"{'status':<12} {'count':>7} {'p50 ms':>9} {'p90 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for outcome, summary in report["latency"].items():
+        print(
+            f"{outcome:<12} {summary['count']:>7,} {summary['p50_ms']:>9.1f} {summary['p90_ms']:>9.1f} "
+            f"{summary['p95_ms']:>9.1f} {summary['p99_ms']:>9.1f} {summary['max_ms']:>9.1f}"
+        )
+    if report.get("mock"):
+        print()
+        print("mock: " + ", ".join(f"{key}={value}" for key, value in report["mock"].items()))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200, help="stop after this many requests")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds instead")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--distinct", type=int, default=100, help="number of different payloads sent")
+    parser.add_argument("--payload-stride", type=int, default=97, help="take every Nth payload of the quiz space")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request client timeout in seconds")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--app-url", help="use an already running API instead of starting one")
+    parser.add_argument("--app-port", type=int, default=8101)
+    parser.add_argument("--app-workers", type=int, default=1)
+    parser.add_argument("--mock-url", help="use an already running mock instead of starting one")
+    parser.add_argument("--mock-port", type=int, default=8100)
+    parser.add_argument("--mock-args", default="", help="extra arguments for loadtest.mock_openai")
+    parser.add_argument("--startup-timeout", type=float, default=30.0)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    payloads = _sample_payloads(args.distinct, args.payload_stride)
+    processes: List[subprocess.Popen] = []
+    try:
+        mock_url = args.mock_url
+        if mock_url is None:
+            mock_url = f"http://127.0.0.1:{args.mock_port}"
+            processes.append(_start_mock(args.mock_port, args.mock_args))
+            _wait_until_up(f"{mock_url}/stats", processes[-1], args.startup_timeout)
+
+        app_url = args.app_url
+        if app_url is None:
+            app_url = f"http://127.0.0.1:{args.app_port}"
+            processes.append(_start_app(args.app_port, mock_url, args.app_workers))
+            _wait_until_up(f"{app_url}{API_PREFIX}/health", processes[-1], args.startup_timeout)
+
+        httpx.post(f"{mock_url}/stats/reset", timeout=5.0)
+        samples, elapsed = asyncio.run(
+            run_load(
+                app_url,
+                payloads,
+                args.concurrency,
+                None if args.duration else args.requests,
+                args.duration,
+                args.timeout,
+                args.seed,
+            )
+        )
+        report = build_report(samples, elapsed, args.concurrency, len(payloads))
+        report["mock"] = httpx.get(f"{mock_url}/stats", timeout=5.0).json()
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    _print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,16 +2,53 @@
 FastAPI application for Free Profile Evaluation.
 Handles HTTP endpoints for profile evaluation.
 """
+import asyncio
+import gzip
+import hashlib
+import json
 import logging
 import os
-from typing import Dict, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from uuid import UUID
 
-from fastapi import FastAPI, HTTPException, APIRouter
-from pydantic import BaseModel, ConfigDict
+from fastapi import FastAPI, HTTPException, APIRouter, Depends, Path, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from pydantic import BaseModel, ConfigDict, ValidationError
 
+from src.api.middleware import PrometheusMiddleware, RequestIdMiddleware
+from src.config.metrics import register_stats
+from src.config.tracing import set_span_exporter
 from src.models import FullProfileEvaluationResponse
-from src.services.run_poc import run_poc
+from src.repositories.cache_invalidation import listen_for_invalidations
+from src.repositories.cache_pruner import CachePruner
+from src.repositories.cache_repository import AsyncCacheRepository, CacheRepository, cache_access
+from src.repositories.connection_pool import (
+    close_database_pool,
+    get_database_pool_stats,
+    init_database_pool,
+)
+from src.repositories.job_repository import JobRepository
+from src.repositories.memory_cache import get_l1_cache
+from src.repositories.request_frequency_repository import (
+    RequestFrequencyRepository,
+    request_frequency,
+)
+from src.services.cache_version import get_cache_namespace
+from src.services.canonical_payload import canonical_cache_key, canonical_payload
+from src.services.circuit_breaker import get_llm_circuit_breaker
+from src.services.llm_admission import LLMAdmissionTimeout
+from src.services.llm_request import close_openai_clients, get_llm_request_template, llm_usage
+from src.services.run_poc import (
+    evaluation_flights,
+    run_poc_batch_async,
+    run_poc_json_async,
+    stream_run_poc_async,
+)
 from src.config.logging_config import setup_logging, get_logger
+from src.config.settings import settings
 
 # Setup logging
 setup_logging()
@@ -55,7 +92,92 @@ class EvaluationRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
-app = FastAPI(title="Full Profile Evaluation API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pool per process, opened before the first request and closed on
+    # shutdown so connections are never leaked between evaluations.
+    db_pool = await asyncio.to_thread(init_database_pool)
+    app.state.cache_repository = AsyncCacheRepository(CacheRepository(db_pool))
+    app.state.job_repository = JobRepository(db_pool)
+    # Build the OpenAI schema and static prompt before the first request.
+    get_llm_request_template()
+    logger.info(f"Cache namespace: {get_cache_namespace('gpt-4o')}")
+    # Request counts for cache warmup and cache hit counts for eviction are
+    # written in batches off the request path.
+    background_tasks = [
+        asyncio.create_task(
+            request_frequency.run_periodic_flush(
+                RequestFrequencyRepository(db_pool).increment_many,
+                settings.request_frequency_flush_interval,
+            )
+        ),
+        asyncio.create_task(
+            cache_access.run_periodic_flush(
+                CacheRepository(db_pool).record_hits,
+                settings.cache_access_flush_interval,
+            )
+        ),
+    ]
+    l1_cache = get_l1_cache()
+    if db_pool is not None and l1_cache is not None:
+        # Deletes and rewrites by other processes (cache_admin, reoverlay, pruning).
+        background_tasks.append(asyncio.create_task(listen_for_invalidations(l1_cache)))
+    pruner = CachePruner.from_settings(db_pool)
+    if db_pool is not None and pruner.enabled:
+        background_tasks.append(asyncio.create_task(pruner.run_periodic(settings.cache_prune_interval)))
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        for task in background_tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await close_openai_clients()
+        await asyncio.to_thread(close_database_pool)
+        # Flush and close the span exporter (it is re-created on next use).
+        set_span_exporter(None)
+
+
+def get_cache_repository(request: Request) -> AsyncCacheRepository:
+    return request.app.state.cache_repository
+
+
+def get_job_repository(request: Request) -> JobRepository:
+    return request.app.state.job_repository
+
+
+app = FastAPI(title="Full Profile Evaluation API", lifespan=lifespan)
+
+if settings.enable_metrics:
+    app.add_middleware(PrometheusMiddleware)
+    # Process-wide component stats, read at scrape time.
+    register_stats("singleflight", evaluation_flights.stats, counters=("executions", "coalesced"))
+    register_stats(
+        "l1_cache",
+        lambda: get_l1_cache().stats() if get_l1_cache() is not None else {},
+        counters=("hits", "misses", "evictions"),
+    )
+    register_stats(
+        "openai_usage",
+        llm_usage.snapshot,
+        counters=("requests", "prompt_tokens", "cached_prompt_tokens", "completion_tokens"),
+    )
+    register_stats("db_pool", get_database_pool_stats)
+    register_stats(
+        "llm_breaker",
+        lambda: get_llm_circuit_breaker().stats() if get_llm_circuit_breaker() is not None else {},
+        counters=("rejected",),
+    )
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+# Outermost, so the request ID and root span cover every other middleware.
+app.add_middleware(RequestIdMiddleware)
 
 # Create API router for all endpoints
 api_router = APIRouter()
@@ -66,16 +188,63 @@ api_router = APIRouter()
 # Both configurations result in same-origin requests, eliminating CORS issues
 
 
+# Header on POST /evaluate with the key for GET /evaluation/{key}.
+EVALUATION_KEY_HEADER = "X-Evaluation-Key"
+
+# Evaluations are ~6 KB of JSON; anything much smaller is not worth gzipping.
+_GZIP_MINIMUM_SIZE = 500
+
+
+def _evaluation_etag(body: bytes, content_encoding: Optional[str] = None) -> str:
+    # Strong ETag over the stored body (canonical_response_json, the same
+    # bytes from every worker), so it changes whenever the stored evaluation does (e.g. after a deploy moves the cache namespace). Each
+    # content coding is its own representation and gets its own validator.
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    if content_encoding:
+        return f'"{digest}-{content_encoding}"'
+    return f'"{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison: W/"x" matches "x".
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
 @api_router.post("/evaluate", response_model=FullProfileEvaluationResponse)
-async def evaluate_profile(request: EvaluationRequest) -> FullProfileEvaluationResponse:
+async def evaluate_profile(
+    request: EvaluationRequest,
+    cache_repository: AsyncCacheRepository = Depends(get_cache_repository),
+) -> Response:
     logger.info("Received profile evaluation request")
 
     try:
-        result = run_poc(
+        cache_key, response_json, degraded = await run_poc_json_async(
             input_payload=request.model_dump(),
+            cache_repository=cache_repository,
         )
         logger.info("Profile evaluation completed successfully")
-        return result
+        # Already a serialized FullProfileEvaluationResponse in its stored
+        # form, so it is sent as-is; response_model only documents the body
+        # in the OpenAPI schema.
+        body = response_json.encode("utf-8")
+        if degraded:
+            # Rule-based fallbacks are not stored: there is nothing for GET
+            # /evaluation/{key} to serve and nothing to revalidate.
+            headers = {"Cache-Control": "no-store"}
+        else:
+            headers = {EVALUATION_KEY_HEADER: cache_key, "ETag": _evaluation_etag(body)}
+        return Response(content=body, media_type="application/json", headers=headers)
+    except LLMAdmissionTimeout as exc:
+        # Over the OpenAI quota: the client should come back later.
+        raise HTTPException(
+            status_code=503,
+            detail=str(exc),
+            headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+        ) from exc
     except RuntimeError as exc:
         logger.exception("Evaluation failed due to configuration error")
         raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -87,6 +256,261 @@ async def evaluate_profile(request: EvaluationRequest) -> FullProfileEvaluationR
         ) from exc
 
 
+@api_router.get("/evaluation/{cache_key}", response_model=FullProfileEvaluationResponse)
+async def get_evaluation(
+    request: Request,
+    cache_key: str = Path(..., pattern="^[0-9a-f]{64}$"),
+    cache_repository: AsyncCacheRepository = Depends(get_cache_repository),
+) -> Response:
+    """
+    A stored evaluation by its canonical key (the X-Evaluation-Key header of
+    POST /evaluate), for repeat views without re-posting the quiz.
+
+    Responses carry a strong ETag and a public Cache-Control so nginx or a
+    CDN can cache them; If-None-Match with the current ETag gets a 304.
+    Bodies are gzipped for clients that accept it, with a "-gzip" ETag. Unknown or expired keys
+    are a 404; POST the quiz again to re-create them.
+    """
+    response_json = await cache_repository.get(cache_key, get_cache_namespace("gpt-4o"))
+    if response_json is None:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+
+    body = response_json.encode("utf-8")
+    use_gzip = len(body) >= _GZIP_MINIMUM_SIZE and "gzip" in request.headers.get("accept-encoding", "")
+    etag = _evaluation_etag(body, "gzip" if use_gzip else None)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.evaluation_max_age}",
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Long-polling GET /evaluate/jobs/{id} re-reads the job this often.
+_JOB_LONG_POLL_INTERVAL = 0.5
+
+
+@api_router.post("/evaluate/jobs", status_code=202)
+async def submit_evaluation_job(
+    request: EvaluationRequest,
+    http_request: Request,
+    cache_repository: AsyncCacheRepository = Depends(get_cache_repository),
+    job_repository: JobRepository = Depends(get_job_repository),
+) -> Response:
+    """
+    Queue an evaluation and return its job ID straight away; an evaluation
+    worker (python -m src.services.evaluation_worker) picks it up. Poll
+    GET /evaluate/jobs/{job_id} for the result. A payload that is already
+    cached becomes a job that is done from the start.
+    """
+    payload = canonical_payload(request.model_dump())
+    cache_key = canonical_cache_key(payload)
+    cached_json = await cache_repository.get(cache_key, get_cache_namespace("gpt-4o"))
+    if cached_json is not None:
+        # Queued jobs are counted by the worker when it evaluates them.
+        request_frequency.record(cache_key, "gpt-4o")
+
+    job_id = await asyncio.to_thread(job_repository.enqueue, cache_key, payload, cached_json)
+    if job_id is None:
+        raise HTTPException(status_code=503, detail="Evaluation queue is unavailable")
+
+    status = "done" if cached_json is not None else "queued"
+    logger.info(f"Evaluation job {job_id} submitted ({status})")
+    return Response(
+        content=json.dumps({"job_id": job_id, "status": status, "evaluation_key": cache_key}),
+        status_code=202,
+        media_type="application/json",
+        headers={"Location": f"{http_request.url.path}/{job_id}"},
+    )
+
+
+def _job_timestamp(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+@api_router.get("/evaluate/jobs/{job_id}")
+async def get_evaluation_job(
+    job_id: UUID,
+    wait: float = Query(0.0, ge=0, description="seconds to wait for the job to finish (long poll)"),
+    job_repository: JobRepository = Depends(get_job_repository),
+) -> Response:
+    """
+    Status of an evaluation job: queued, running, done or failed. With
+    ``wait`` the request is held (up to JOB_MAX_WAIT seconds) until the job
+    is done or failed. Done jobs carry the FullProfileEvaluationResponse in
+    ``result``; failed ones the reason in ``error``.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(wait, settings.job_max_wait)
+    while True:
+        try:
+            job = await asyncio.to_thread(job_repository.get, str(job_id))
+        except Exception as exc:
+            logger.warning(f"Job lookup failed: {exc}")
+            raise HTTPException(status_code=503, detail="Evaluation queue is unavailable") from exc
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        remaining = deadline - loop.time()
+        if job["status"] in ("done", "failed") or remaining <= 0:
+            break
+        await asyncio.sleep(min(_JOB_LONG_POLL_INTERVAL, remaining))
+
+    body = json.dumps({
+        "job_id": job["id"],
+        "status": job["status"],
+        "evaluation_key": job["cache_key"],
+        "attempts": job["attempts"],
+        "error": job["error"] if job["status"] == "failed" else None,
+        "created_at": _job_timestamp(job["created_at"]),
+        "started_at": _job_timestamp(job["started_at"]),
+        "finished_at": _job_timestamp(job["finished_at"]),
+    })
+    if job["result_json"] is not None:
+        # The stored result is spliced in as is rather than parsed and re-encoded.
+        body = f'{body[:-1]},"result":{job["result_json"]}}}'
+    return Response(content=body, media_type="application/json")
+
+
+def _ndjson_line(event: str, data) -> bytes:
+    return (json.dumps({"event": event, "data": jsonable_encoder(data)}) + "\n").encode("utf-8")
+
+
+@api_router.post("/evaluate/stream")
+async def evaluate_profile_stream(
+    request: EvaluationRequest,
+    cache_repository: AsyncCacheRepository = Depends(get_cache_repository),
+) -> StreamingResponse:
+    """
+    Stream the evaluation as newline-delimited JSON events.
+
+    The "deterministic" event carries the rule-based sections (score, current
+    profile, tools, quick wins, opportunities, roles) as soon as they are
+    computed; the "complete" event carries the full FullProfileEvaluationResponse.
+    Cache hits emit only "complete". Failures emit a final "error" event.
+    """
+    logger.info("Received streaming profile evaluation request")
+    payload = request.model_dump()
+
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async for event, data in stream_run_poc_async(
+                input_payload=payload,
+                cache_repository=cache_repository,
+            ):
+                yield _ndjson_line(event, data)
+            logger.info("Streaming profile evaluation completed successfully")
+        except RuntimeError as exc:
+            logger.exception("Evaluation failed due to configuration error")
+            yield _ndjson_line("error", {"detail": str(exc)})
+        except Exception:  # pragma: no cover - unexpected path
+            logger.exception("Unexpected error while generating evaluation")
+            yield _ndjson_line(
+                "error",
+                {"detail": "Failed to generate evaluation. Check server logs for details."},
+            )
+
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        # Stop nginx from buffering the response so the first event is not held back.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _batch_items(request: Request) -> AsyncIterator[Any]:
+    """
+    The items of a batch body: a JSON array, or newline-delimited JSON
+    objects parsed line by line as the body arrives. Malformed JSON raises
+    ValueError.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" not in content_type and "jsonlines" not in content_type:
+        items = json.loads(await request.body())
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Batch body must be a JSON array or NDJSON")
+        for item in items:
+            yield item
+        return
+
+    pending = b""
+    async for chunk in request.stream():
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if pending.strip():
+        yield json.loads(pending)
+
+
+def _batch_error_detail(exc: Exception) -> str:
+    if isinstance(exc, RuntimeError):
+        return str(exc)
+    return "Failed to generate evaluation. Check server logs for details."
+
+
+@api_router.post("/evaluate/batch")
+async def evaluate_profile_batch(
+    request: Request,
+    cache_repository: AsyncCacheRepository = Depends(get_cache_repository),
+) -> StreamingResponse:
+    """
+    Evaluate many profiles in one request.
+
+    The body is a JSON array of EvaluationRequest objects, or one object per
+    line with ``Content-Type: application/x-ndjson``. Results stream back as
+    NDJSON in completion order, one line per input item:
+    ``{"index": i, "status": "ok", "result": {...}}`` or
+    ``{"index": i, "status": "error", "detail": "..."}``.
+    """
+    payloads = []
+    errors = []
+    index = 0
+    try:
+        async for item in _batch_items(request):
+            if index == settings.batch_max_items:
+                # Rejected before the rest of the body is read.
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Batch too large: more than {settings.batch_max_items} items",
+                )
+            try:
+                payloads.append(EvaluationRequest.model_validate(item).model_dump())
+            except ValidationError as exc:
+                errors.append({"index": index, "errors": exc.errors(include_url=False)})
+            index += 1
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Malformed batch body: {exc}") from exc
+    if errors:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(errors))
+
+    logger.info(f"Received batch profile evaluation request ({len(payloads)} items)")
+
+    async def results() -> AsyncIterator[bytes]:
+        async for indices, body, error in run_poc_batch_async(
+            payloads, cache_repository=cache_repository
+        ):
+            if error is None:
+                # One serialized body is reused for every duplicate of this payload.
+                lines = [f'{{"index":{index},"status":"ok","result":{body}}}\n' for index in indices]
+            else:
+                detail = json.dumps(_batch_error_detail(error))
+                lines = [f'{{"index":{index},"status":"error","detail":{detail}}}\n' for index in indices]
+            yield "".join(lines).encode("utf-8")
+        logger.info("Batch profile evaluation completed")
+
+    return StreamingResponse(
+        results(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @api_router.get("/health")
 @api_router.head("/health")
 async def healthcheck() -> Dict[str, str]:
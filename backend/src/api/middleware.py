@@ -0,0 +1,90 @@
+"""ASGI middleware for the API."""
+import re
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+from src.config.tracing import reset_request_id, set_request_id, span
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Client-supplied IDs end up in logs and trace files, so only short,
+# plain tokens are accepted; anything else gets a fresh ID.
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class RequestIdMiddleware:
+    """
+    Gives every request an ID (the caller's X-Request-ID when valid), makes it
+    the current request ID for logging and tracing, wraps the request in a
+    root span and echoes the ID back in the X-Request-ID response header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+                current.set_attribute("status", message["status"])
+            await send(message)
+
+        token = set_request_id(request_id)
+        try:
+            with span("http.request", method=scope["method"], path=scope["path"]) as current:
+                await self.app(scope, receive, send_with_request_id)
+        finally:
+            reset_request_id(token)
+
+
+class PrometheusMiddleware:
+    """
+    Counts requests and records their latency per route template.
+
+    Plain ASGI rather than BaseHTTPMiddleware so streamed responses are timed
+    until their last chunk, not until the headers are sent. Requests that
+    match no route share the "unmatched" label to keep cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, route_label, str(status)).inc()
+            HTTP_REQUEST_SECONDS.labels(method, route_label).observe(time.perf_counter() - start)
@@ -3,6 +3,7 @@ import sys
 from typing import Any, Dict
 
 from .settings import settings
+from .tracing import RequestIdFilter
 
 
 class JSONFormatter(logging.Formatter):
@@ -38,6 +39,7 @@ def setup_logging() -> None:
         root_logger.removeHandler(handler)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(getattr(logging, settings.log_level.upper()))
+    console_handler.addFilter(RequestIdFilter())
 
     if settings.log_format == "json":
         formatter = JSONFormatter()
@@ -0,0 +1,155 @@
+"""
+Prometheus metrics for the API, the evaluation pipeline and its backends.
+
+Metrics live in the default prometheus_client registry and are served on
+GET /metrics when ENABLE_METRICS is set. Recording is cheap enough to stay
+on unconditionally; only the endpoint and the HTTP middleware are switched
+off by the setting.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from src.config.tracing import span
+
+# Requests are dominated either by a cache hit (milliseconds) or by an LLM
+# call (seconds), so the buckets cover both ends.
+_REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+_STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start until the last response byte is sent",
+    ["method", "route"],
+    buckets=_REQUEST_BUCKETS,
+)
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by tier (l1, postgres, raw) and result (hit, miss, error)",
+    ["tier", "result"],
+)
+CACHE_WRITES = Counter(
+    "cache_writes_total",
+    "Cache writes by tier (postgres, raw) and result (ok, error)",
+    ["tier", "result"],
+)
+
+OPENAI_REQUEST_SECONDS = Histogram(
+    "openai_request_duration_seconds",
+    "Latency of individual chat.completions calls",
+    ["model", "outcome"],
+    buckets=_REQUEST_BUCKETS,
+)
+OPENAI_RETRIES = Counter(
+    "openai_retries_total",
+    "chat.completions attempts that were retried, by reason (error, empty, invalid)",
+    ["model", "reason"],
+)
+
+LLM_ADMISSION_QUEUE = Gauge(
+    "llm_admission_queue_depth",
+    "Callers in this process waiting for OpenAI rate-limit admission",
+)
+LLM_ADMISSION_WAIT_SECONDS = Histogram(
+    "llm_admission_wait_seconds",
+    "Time spent waiting for OpenAI rate-limit admission",
+    buckets=_WAIT_BUCKETS,
+)
+LLM_ADMISSIONS = Counter(
+    "llm_admissions_total",
+    "OpenAI rate-limit admission decisions by result (admitted, timeout)",
+    ["result"],
+)
+
+LLM_BREAKER_STATE = Gauge(
+    "llm_breaker_state",
+    "OpenAI circuit breaker state (0 closed, 1 half-open, 2 open)",
+)
+LLM_BREAKER_TRANSITIONS = Counter(
+    "llm_breaker_transitions_total",
+    "OpenAI circuit breaker state changes by new state",
+    ["state"],
+)
+DEGRADED_EVALUATIONS = Counter(
+    "degraded_evaluations_total",
+    "Evaluations answered with rule-based fallbacks because the LLM was unavailable",
+)
+
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled Postgres connection",
+    buckets=_WAIT_BUCKETS,
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Postgres connection checkouts by result (ok, timeout)",
+    ["result"],
+)
+
+EVALUATION_STAGE_SECONDS = Histogram(
+    "evaluation_stage_duration_seconds",
+    "Time spent in each stage of the evaluation pipeline",
+    ["stage"],
+    buckets=_STAGE_BUCKETS,
+)
+
+
+@contextmanager
+def observe_stage(stage: str) -> Iterator[None]:
+    """
+    Time a block of the evaluation pipeline (also recorded when it raises),
+    both in the stage histogram and as a tracing span.
+    """
+    start = time.perf_counter()
+    try:
+        with span(stage):
+            yield
+    finally:
+        EVALUATION_STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+class StatsCollector:
+    """
+    Exports a component's ``stats()`` dict at scrape time as ``<prefix>_<key>``:
+    keys in ``counters`` become counters, every other numeric value a gauge.
+    """
+
+    def __init__(self, prefix: str, stats: Callable[[], Dict[str, Any]], counters: Iterable[str] = ()):
+        self._prefix = prefix
+        self._stats = stats
+        self._counters = set(counters)
+
+    def collect(self):
+        for key, value in self._stats().items():
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            name = f"{self._prefix}_{key}"
+            if key in self._counters:
+                yield CounterMetricFamily(name, f"{self._prefix} {key}", value=value)
+            else:
+                yield GaugeMetricFamily(name, f"{self._prefix} {key}", value=value)
+
+
+_registered_stats: Dict[str, StatsCollector] = {}
+_registered_stats_lock = threading.Lock()
+
+
+def register_stats(prefix: str, stats: Callable[[], Dict[str, Any]], counters: Iterable[str] = ()) -> None:
+    """Register (once per prefix) a stats() callable with the default registry."""
+    with _registered_stats_lock:
+        if prefix in _registered_stats:
+            return
+        collector = StatsCollector(prefix, stats, counters)
+        REGISTRY.register(collector)
+        _registered_stats[prefix] = collector
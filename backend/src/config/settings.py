@@ -14,15 +14,53 @@ class Settings(BaseSettings):
     port: int = 8000
     openai_api_key: str
     openai_model: str = "gpt-4o"
+    openai_base_url: Optional[str] = None
+    openai_cassette_mode: str = "off"
+    openai_cassette_path: str = "llm_cassette.jsonl"
     openai_timeout: int = 60
     openai_max_retries: int = 3
     openai_retry_delay: float = 1.5
+    openai_rpm_limit: Optional[int] = None
+    openai_tpm_limit: Optional[int] = None
+    openai_admission_max_wait: float = 30.0
+    openai_completion_token_estimate: int = 1000
+    llm_breaker_enabled: bool = True
+    llm_breaker_window: float = 60.0
+    llm_breaker_min_calls: int = 10
+    llm_breaker_failure_rate: float = 0.5
+    llm_breaker_slow_call_seconds: float = 20.0
+    llm_breaker_slow_call_rate: float = 0.5
+    llm_breaker_open_seconds: float = 30.0
     database_url: str
     db_pool_size: int = 10
     db_max_overflow: int = 20
     db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
     cache_enabled: bool = True
     cache_ttl: Optional[int] = None 
+    cache_fingerprint: Optional[str] = None
+    cache_max_entries: Optional[int] = None
+    cache_max_bytes: Optional[int] = None
+    cache_eviction_policy: str = "lru"
+    cache_prune_interval: float = 300.0
+    cache_prune_batch_size: int = 1000
+    cache_access_flush_interval: float = 30.0
+    cache_compression: str = "none"
+    cache_zstd_level: int = 3
+    cache_zstd_dictionary_path: Optional[str] = None
+    l1_cache_enabled: bool = True
+    l1_cache_max_bytes: int = 64 * 1024 * 1024
+    l1_cache_ttl: Optional[int] = 3600
+    evaluation_max_age: int = 86400
+    job_lease_seconds: float = 300.0
+    job_max_attempts: int = 3
+    job_poll_interval: float = 1.0
+    job_max_wait: float = 30.0
+    job_retention: float = 7 * 24 * 3600.0
+    batch_max_items: int = 1000
+    batch_max_concurrency: int = 8
+    request_frequency_enabled: bool = True
+    request_frequency_flush_interval: float = 30.0
     allowed_origins: str = "http://localhost:3000,http://127.0.0.1:3000"
 
     def get_cors_origins(self) -> List[str]:
@@ -33,6 +71,8 @@ class Settings(BaseSettings):
     aws_access_key_id: Optional[str] = None
     aws_secret_access_key: Optional[str] = None
     enable_metrics: bool = True
+    tracing_exporter: str = "none"
+    tracing_file: str = "traces.jsonl"
     sentry_dsn: Optional[str] = None
 
     model_config = SettingsConfigDict(
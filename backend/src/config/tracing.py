@@ -0,0 +1,272 @@
+"""
+Lightweight request tracing.
+
+``span(name, **attributes)`` times a block and records it under the current
+span (tracked in a contextvar, so it follows asyncio tasks and
+``asyncio.to_thread`` calls). Finished spans go to the configured exporter:
+
+    TRACING_EXPORTER=none      tracing off (default); span() is a no-op
+    TRACING_EXPORTER=console   one JSON line per span on stderr
+    TRACING_EXPORTER=jsonl     appended to TRACING_FILE
+    TRACING_EXPORTER=pkg.module:Exporter   any class with export()/shutdown()
+
+The request ID set by RequestIdMiddleware is the trace ID of every span in
+that request and is attached to log records by RequestIdFilter.
+
+Break down the slowest requests of a JSONL trace file (from backend/):
+    python -m src.config.tracing traces.jsonl [--top 10]
+"""
+import argparse
+import asyncio
+import functools
+import importlib
+import json
+import logging
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.config.settings import settings
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def set_request_id(request_id: Optional[str]):
+    """Set the request ID for the current context; returns a token for reset_request_id."""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token) -> None:
+    _request_id.reset(token)
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds the current request ID to log records (read by JSONFormatter)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id = _request_id.get()
+        if request_id is not None and not hasattr(record, "request_id"):
+            record.request_id = request_id
+        return True
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start_time", "_start", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def finish(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": round((time.perf_counter() - self._start) * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter:
+    """Receives finished spans as dicts. Must be thread-safe."""
+
+    def export(self, span: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class NoopSpanExporter(SpanExporter):
+    def export(self, span: Dict[str, Any]) -> None:
+        pass
+
+
+class ConsoleSpanExporter(SpanExporter):
+    def __init__(self, stream=None):
+        self._stream = stream or sys.stderr
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict[str, Any]) -> None:
+        line = json.dumps(span, default=str)
+        with self._lock:
+            self._stream.write(line + "\n")
+
+
+class JsonlFileSpanExporter(SpanExporter):
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict[str, Any]) -> None:
+        line = json.dumps(span, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _exporter_from_settings() -> SpanExporter:
+    name = settings.tracing_exporter
+    if name == "none":
+        return NoopSpanExporter()
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "jsonl":
+        return JsonlFileSpanExporter(settings.tracing_file)
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+_exporter: Optional[SpanExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def get_span_exporter() -> SpanExporter:
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = _exporter_from_settings()
+    return _exporter
+
+
+def set_span_exporter(exporter: Optional[SpanExporter]) -> None:
+    """Replace the exporter (None re-reads settings); the old one is shut down."""
+    global _exporter
+    with _exporter_lock:
+        previous, _exporter = _exporter, exporter
+    if previous is not None:
+        previous.shutdown()
+
+
+def tracing_enabled() -> bool:
+    return not isinstance(get_span_exporter(), NoopSpanExporter)
+
+
+@contextmanager
+def _recording_span(name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+    parent = _current_span.get()
+    if parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    else:
+        trace_id, parent_id = _request_id.get() or uuid.uuid4().hex, None
+
+    current = Span(name, trace_id, parent_id, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.status = "error"
+        current.attributes["error"] = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        _current_span.reset(token)
+        get_span_exporter().export(current.finish())
+
+
+@contextmanager
+def _noop_span() -> Iterator[_NoopSpan]:
+    yield _NOOP_SPAN
+
+
+def span(name: str, **attributes: Any):
+    """Context manager timing a block as a child of the current span."""
+    if not tracing_enabled():
+        return _noop_span()
+    return _recording_span(name, attributes)
+
+
+def traced(name: str):
+    """Decorator form of span() for plain and async functions."""
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def summarize(spans: List[Dict[str, Any]], top: int) -> List[Dict[str, Any]]:
+    """The ``top`` slowest traces, each with its spans in start order."""
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    for record in spans:
+        traces.setdefault(record["trace_id"], []).append(record)
+
+    summaries = []
+    for trace_id, records in traces.items():
+        roots = [record for record in records if record["parent_id"] is None]
+        root = max(roots or records, key=lambda record: record["duration_ms"])
+        summaries.append({
+            "trace_id": trace_id,
+            "name": root["name"],
+            "duration_ms": root["duration_ms"],
+            "spans": [
+                {"name": record["name"], "duration_ms": record["duration_ms"], "status": record["status"]}
+                for record in sorted(records, key=lambda record: record["start_time"])
+            ],
+        })
+    summaries.sort(key=lambda summary: summary["duration_ms"], reverse=True)
+    return summaries[:top]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Show the slowest traces in a JSONL span file.")
+    parser.add_argument("path")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    with open(args.path, encoding="utf-8") as handle:
+        spans = [json.loads(line) for line in handle if line.strip()]
+
+    for summary in summarize(spans, args.top):
+        print(f"{summary['duration_ms']:10.1f} ms  {summary['name']}  trace={summary['trace_id']}")
+        for record in summary["spans"]:
+            marker = " !" if record["status"] == "error" else ""
+            print(f"{'':14}{record['duration_ms']:10.1f} ms  {record['name']}{marker}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,12 +1,9 @@
 from enum import Enum
-from typing import List, TYPE_CHECKING, Any, Dict
+from typing import List, Any, Dict
 
 from pydantic import BaseModel, Field
 
 
-if TYPE_CHECKING:
-    from models_raw import FullProfileEvaluationResponseRaw
-
 class ProfileStrengthStatus(Enum):
     NEEDS_IMPROVEMENT = "Needs Improvement"
     EXCELLENT = "Excellent"
@@ -287,6 +284,10 @@ class ProfileEvaluation(BaseModel):
 # Full response model
 class FullProfileEvaluationResponse(BaseModel):
     profile_evaluation: ProfileEvaluation
+    degraded: bool = Field(
+        default=False,
+        description="True when the LLM was unavailable and its sections were generated by rules instead",
+    )
 
 
 # --- Helpers to hydrate derived fields -----------------------------------------------------
@@ -357,11 +358,10 @@ def _peer_comparison_label_from_percentile(percentile: int) -> PeerComparisonLab
 
 
 def enrich_full_profile_evaluation(
-    raw: "FullProfileEvaluationResponseRaw",
+    data: Dict[str, Any],
 ) -> FullProfileEvaluationResponse:
-    """Augment a raw response with derived fields and validate against the full schema."""
+    """Augment a merged (LLM + rule engine) response with derived fields and validate it."""
 
-    data = raw.model_dump()
     profile = data["profile_evaluation"]
     profile["profile_strength_status"] = _profile_strength_status_from_score(
         profile["profile_strength_score"]
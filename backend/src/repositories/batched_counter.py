@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from collections import Counter
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from src.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CountWriter = Callable[[Dict[Tuple[Hashable, ...], int]], bool]
+
+
+class BatchedCounter:
+    """
+    Counts events in memory and writes them out in periodic batches, so
+    recording an event never adds a database round trip to the request.
+
+    ``write`` receives {key: count} and returns False on failure, in which
+    case the counts are kept for the next flush, up to ``max_pending`` keys.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        enabled: Optional[Callable[[], bool]] = None,
+        max_pending: int = 100_000,
+    ):
+        self._name = name
+        self._enabled = enabled or (lambda: True)
+        self._max_pending = max_pending
+        self._pending: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, *key: Hashable) -> None:
+        if not self._enabled():
+            return
+        with self._lock:
+            self._pending[key] += 1
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self, write: CountWriter) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+
+        if not pending:
+            return 0
+
+        if not write(dict(pending)):
+            # Keep the counts for the next attempt, unless the database has
+            # been unavailable for so long that they would grow without bound.
+            with self._lock:
+                if len(self._pending) + len(pending) <= self._max_pending:
+                    self._pending.update(pending)
+                else:
+                    logger.warning(f"{self._name}: dropping {len(pending)} unflushed counters")
+            return 0
+        return len(pending)
+
+    async def run_periodic_flush(self, write: CountWriter, interval: float) -> None:
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                await asyncio.to_thread(self.flush, write)
+        finally:
+            flushed = await asyncio.to_thread(self.flush, write)
+            logger.info(f"{self._name}: flushed {flushed} pending counters on shutdown")
@@ -0,0 +1,90 @@
+"""
+Cross-process invalidation of the L1 response cache.
+
+Every API and worker process keeps its own L1 copy of hot response_cache
+rows. Whatever deletes or rewrites rows (cache_admin, reoverlay, the
+pruner) sends a Postgres NOTIFY on L1_INVALIDATION_CHANNEL in the same
+transaction, with the L1 key of each row as payload or an empty payload for
+"everything". listen_for_invalidations drops those entries from the local
+L1 once the transaction has committed.
+"""
+import asyncio
+from typing import Optional, Sequence
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+from src.config.logging_config import get_logger
+from src.config.settings import settings
+from src.repositories.memory_cache import LRUByteCache
+
+logger = get_logger(__name__)
+
+L1_INVALIDATION_CHANNEL = "response_cache_l1"
+
+# After the listening connection drops, wait this long before reconnecting.
+_RECONNECT_INTERVAL_SECONDS = 30.0
+
+
+def l1_key(cache_key: str, model: str) -> str:
+    """The L1 key of a response_cache row; SQL: model || ':' || cache_key."""
+    return f"{model}:{cache_key}"
+
+
+def notify_invalidated(cur, l1_keys: Optional[Sequence[str]] = None) -> None:
+    """Queue an invalidation of ``l1_keys`` (None: the whole L1), sent on commit."""
+    if l1_keys is None:
+        cur.execute("SELECT pg_notify(%s, '')", (L1_INVALIDATION_CHANNEL,))
+    elif l1_keys:
+        cur.execute(
+            "SELECT pg_notify(%s, key) FROM unnest(%s::text[]) AS key",
+            (L1_INVALIDATION_CHANNEL, list(l1_keys)),
+        )
+
+
+def _connect_listener():
+    conn = psycopg2.connect(settings.database_url)
+    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    with conn.cursor() as cur:
+        cur.execute(f"LISTEN {L1_INVALIDATION_CHANNEL}")
+    return conn
+
+
+async def _listen(conn, l1: LRUByteCache) -> None:
+    loop = asyncio.get_running_loop()
+    readable = asyncio.Event()
+    loop.add_reader(conn.fileno(), readable.set)
+    try:
+        while True:
+            await readable.wait()
+            readable.clear()
+            conn.poll()
+            while conn.notifies:
+                notification = conn.notifies.pop(0)
+                if notification.payload:
+                    l1.delete(notification.payload)
+                else:
+                    l1.clear()
+    finally:
+        loop.remove_reader(conn.fileno())
+
+
+async def listen_for_invalidations(l1: LRUByteCache) -> None:
+    """Apply invalidations to ``l1`` until cancelled, reconnecting as needed."""
+    while True:
+        try:
+            conn = await asyncio.to_thread(_connect_listener)
+        except Exception as exc:
+            logger.warning(f"L1 invalidation listener could not connect: {exc}")
+            await asyncio.sleep(_RECONNECT_INTERVAL_SECONDS)
+            continue
+
+        # Invalidations sent while no connection was listening are lost.
+        l1.clear()
+        try:
+            await _listen(conn, l1)
+        except Exception as exc:
+            logger.warning(f"L1 invalidation listener disconnected: {exc}")
+        finally:
+            conn.close()
+        await asyncio.sleep(_RECONNECT_INTERVAL_SECONDS)
@@ -0,0 +1,163 @@
+import asyncio
+import math
+from typing import Any, Dict, Optional, Tuple
+
+from src.config.logging_config import get_logger
+from src.config.settings import settings
+from src.repositories.cache_invalidation import L1_INVALIDATION_CHANNEL
+from src.repositories.connection_pool import DatabasePool
+
+logger = get_logger(__name__)
+
+_EVICTION_ORDER = {
+    "lru": "last_accessed_at ASC NULLS FIRST",
+    "lfu": "hit_count ASC, last_accessed_at ASC NULLS FIRST",
+}
+
+# Any constant works; it only has to be the same in every API process so
+# that one of them prunes at a time.
+_PRUNE_LOCK_ID = 720_461_913
+
+
+class CachePruner:
+    """
+    Keeps response_cache bounded: deletes entries older than ``ttl_seconds``,
+    then evicts by LRU (last_accessed_at) or LFU (hit_count) until the table is
+    within ``max_entries`` rows and ``max_bytes`` of stored responses.
+
+    Deletes run in chunks of ``batch_size`` rows, each in its own short
+    transaction, so pruning never holds long locks on the table. Each chunk
+    notifies the L1 caches of every process (see cache_invalidation).
+    """
+
+    def __init__(
+        self,
+        db_pool: DatabasePool,
+        *,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: str = "lru",
+        batch_size: int = 1000,
+    ):
+        if policy not in _EVICTION_ORDER:
+            raise ValueError(f"Unknown cache eviction policy {policy!r}; use 'lru' or 'lfu'")
+        self._pool = db_pool
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._order = _EVICTION_ORDER[policy]
+        self._batch_size = batch_size
+
+    @classmethod
+    def from_settings(cls, db_pool: DatabasePool) -> "CachePruner":
+        return cls(
+            db_pool,
+            ttl_seconds=settings.cache_ttl,
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.cache_max_bytes,
+            policy=settings.cache_eviction_policy,
+            batch_size=settings.cache_prune_batch_size,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._ttl_seconds or self._max_entries or self._max_bytes)
+
+    def _delete_chunks(self, conn, where: str, params: Tuple[Any, ...], limit: Optional[int] = None) -> int:
+        deleted = 0
+        while limit is None or deleted < limit:
+            chunk = self._batch_size if limit is None else min(self._batch_size, limit - deleted)
+            with conn.cursor() as cur:
+                # Every API process drops the deleted rows from its L1 on commit.
+                cur.execute(
+                    f"""
+                    WITH deleted AS (
+                        DELETE FROM response_cache
+                        WHERE id IN (
+                            SELECT id FROM response_cache
+                            {where}
+                            LIMIT %s
+                        )
+                        RETURNING model, cache_key
+                    )
+                    SELECT pg_notify(%s, model || ':' || cache_key) FROM deleted
+                    """,
+                    (*params, chunk, L1_INVALIDATION_CHANNEL)
+                )
+                chunk_deleted = cur.rowcount
+            conn.commit()
+            deleted += chunk_deleted
+            if chunk_deleted < chunk:
+                break
+        return deleted
+
+    def _rows_over_cap(self, conn) -> int:
+        with conn.cursor() as cur:
+            if self._max_bytes:
+                cur.execute(
+                    """
+                    SELECT COUNT(*), COALESCE(SUM(
+                        COALESCE(pg_column_size(response_json), 0)
+                        + COALESCE(pg_column_size(response_zstd), 0)
+                    ), 0)
+                    FROM response_cache
+                    """
+                )
+                entries, size_bytes = cur.fetchone()
+            else:
+                cur.execute("SELECT COUNT(*) FROM response_cache")
+                entries, size_bytes = cur.fetchone()[0], 0
+
+        excess = 0
+        if self._max_entries and entries > self._max_entries:
+            excess = entries - self._max_entries
+        if self._max_bytes and size_bytes > self._max_bytes and entries:
+            average_row = size_bytes / entries
+            excess = max(excess, math.ceil((size_bytes - self._max_bytes) / average_row))
+        return excess
+
+    def prune(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {"expired": 0, "evicted": 0, "skipped": False}
+
+        with self._pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_lock(%s)", (_PRUNE_LOCK_ID,))
+                acquired = cur.fetchone()[0]
+            if not acquired:
+                report["skipped"] = True
+                return report
+
+            try:
+                if self._ttl_seconds:
+                    report["expired"] = self._delete_chunks(
+                        conn,
+                        "WHERE updated_at < CURRENT_TIMESTAMP - %s * INTERVAL '1 second'",
+                        (self._ttl_seconds,),
+                    )
+
+                excess = self._rows_over_cap(conn)
+                if excess:
+                    report["evicted"] = self._delete_chunks(
+                        conn, f"ORDER BY {self._order}", (), limit=excess
+                    )
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT pg_advisory_unlock(%s)", (_PRUNE_LOCK_ID,))
+
+        if report["expired"] or report["evicted"]:
+            logger.info(
+                f"🧹 Cache prune: {report['expired']} expired, {report['evicted']} evicted"
+            )
+        return report
+
+    async def run_periodic(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.prune)
+            except Exception as exc:
+                logger.error(f"Cache prune failed: {exc}")
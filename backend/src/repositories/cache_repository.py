@@ -1,134 +1,437 @@
+import asyncio
 import hashlib
 import json
 from contextlib import contextmanager
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import psycopg2
-from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import Json, RealDictCursor, execute_values
 
-from src.config.exceptions import CacheError, DatabaseError
+from src.config.exceptions import CacheError
 from src.config.logging_config import get_logger
+from src.config.metrics import CACHE_LOOKUPS, CACHE_WRITES
 from src.config.settings import settings
+from src.repositories.batched_counter import BatchedCounter
+from src.repositories.cache_invalidation import l1_key, notify_invalidated
+from src.repositories.connection_pool import DatabasePool, get_database_pool
+from src.repositories.memory_cache import LRUByteCache, get_l1_cache
+from src.repositories.response_codec import get_response_codec, get_write_codec
 
 logger = get_logger(__name__)
 
+# Hits per (cache_key, namespace), L1 hits included, flushed to
+# CacheRepository.record_hits by the app lifespan. Drives LRU/LFU eviction.
+cache_access = BatchedCounter("cache_access")
 
-class CacheRepository:
-    def __init__(self):
-        self._pool: Optional[pool.SimpleConnectionPool] = None
-        self._disabled = False
 
-    def _initialize_pool(self) -> Optional[pool.SimpleConnectionPool]:
-        if self._disabled:
+def _ttl_clause() -> Tuple[str, Tuple[Any, ...]]:
+    """SQL filter that hides entries older than CACHE_TTL seconds."""
+    if not settings.cache_ttl:
+        return "", ()
+    return "AND updated_at > CURRENT_TIMESTAMP - %s * INTERVAL '1 second'", (settings.cache_ttl,)
+
+
+def canonical_response_json(response: Any) -> str:
+    """
+    The one text form a cached evaluation is stored and sent in (sorted keys,
+    no whitespace), so every worker serves identical bytes for a strong ETag.
+    ``response`` is the JSON-mode dump of a FullProfileEvaluationResponse.
+    """
+    return json.dumps(response, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _encode_body(response_json: str) -> Tuple[Optional[str], Optional[Any]]:
+    """(response_json, response_zstd) column values for a cache write."""
+    codec = get_write_codec()
+    if codec is None:
+        return response_json, None
+    return None, psycopg2.Binary(codec.compress(response_json.encode("utf-8")))
+
+
+def _decode_body(cache_key: str, row: Dict[str, Any]) -> Optional[str]:
+    """Response JSON of a response_cache row, whichever column holds it."""
+    if row['response_zstd'] is None:
+        if row['response_json'] is None:
             return None
+        # JSONB keeps the content but not the bytes; back to the stored form
+        # once per read from Postgres (the result is kept in L1).
+        return canonical_response_json(json.loads(row['response_json']))
 
-        if self._pool is not None:
-            return self._pool
+    codec = get_response_codec()
+    if codec is None:
+        logger.warning(f"Cache entry {cache_key[:16]}... is zstd-compressed but zstd is unavailable")
+        return None
+    try:
+        return codec.decompress(bytes(row['response_zstd'])).decode("utf-8")
+    except Exception as exc:
+        logger.warning(f"Cache entry {cache_key[:16]}... could not be decompressed: {exc}")
+        return None
 
-        try:
-            self._pool = pool.SimpleConnectionPool(
-                minconn=1,
-                maxconn=settings.db_pool_size,
-                dsn=settings.database_url
-            )
 
-            # Test connection
-            with self._get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("SELECT 1")
+class CacheRepository:
+    def __init__(
+        self,
+        db_pool: Optional[DatabasePool] = None,
+        l1_cache: Optional[LRUByteCache] = None,
+        access_tracker: Optional[BatchedCounter] = None,
+    ):
+        # Repositories are cheap; the connection pool behind them is shared
+        # process-wide (see connection_pool.init_database_pool).
+        self._pool = db_pool
+        self._l1 = l1_cache if l1_cache is not None else get_l1_cache()
+        self._access = access_tracker if access_tracker is not None else cache_access
+        self._disabled = not settings.cache_enabled
+
+    def _get_pool(self) -> Optional[DatabasePool]:
+        if self._disabled:
+            return None
 
-            logger.info("✅ Cache repository initialized successfully")
+        if self._pool is not None and not self._pool.closed:
             return self._pool
 
-        except Exception as exc:
-            logger.error(f"Failed to initialize cache: {exc}")
-            if not settings.cache_enabled:
-                logger.warning("Cache disabled - continuing without caching")
-                self._disabled = True
-                return None
-            raise CacheError(f"Failed to initialize cache: {exc}")
+        self._pool = get_database_pool()
+        return self._pool
 
     @contextmanager
     def _get_connection(self):
-        pool_instance = self._initialize_pool()
+        pool_instance = self._get_pool()
 
         if pool_instance is None:
             raise CacheError("Database pool not initialized")
 
-        conn = pool_instance.getconn()
-        try:
+        with pool_instance.connection() as conn:
             yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            pool_instance.putconn(conn)
 
     @staticmethod
     def generate_cache_key(payload: Dict[str, Any], model: str) -> str:
         serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"))
         return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
 
+    @staticmethod
+    def _l1_key(cache_key: str, model: str) -> str:
+        return l1_key(cache_key, model)
+
+    def get_from_memory(self, cache_key: str, model: str) -> Optional[str]:
+        """L1 lookup only; never touches Postgres, safe to call on the event loop."""
+        if self._disabled or self._l1 is None:
+            return None
+
+        cached = self._l1.get(self._l1_key(cache_key, model))
+        if cached is None:
+            CACHE_LOOKUPS.labels("l1", "miss").inc()
+            return None
+
+        CACHE_LOOKUPS.labels("l1", "hit").inc()
+        logger.info(f"⚡ L1 cache HIT for key: {cache_key[:16]}...")
+        self._access.record(cache_key, model)
+        return cached.decode("utf-8")
+
+    def _remember(self, cache_key: str, model: str, response_json: str) -> None:
+        if self._l1 is not None:
+            self._l1.set(self._l1_key(cache_key, model), response_json.encode("utf-8"))
+
+    def _forget(self, cache_key: Optional[str] = None, model: Optional[str] = None) -> None:
+        if self._l1 is None:
+            return
+        if cache_key is not None and model is not None:
+            self._l1.delete(self._l1_key(cache_key, model))
+        else:
+            self._l1.clear()
+
     def get(self, cache_key: str, model: str) -> Optional[str]:
         if self._disabled or not settings.cache_enabled:
             return None
 
+        in_memory = self.get_from_memory(cache_key, model)
+        if in_memory is not None:
+            return in_memory
+        return self._get_from_db(cache_key, model)
+
+    def _get_from_db(self, cache_key: str, model: str) -> Optional[str]:
+        """Postgres lookup for a key already missed in L1; a hit is copied into L1."""
+        if self._disabled or not settings.cache_enabled:
+            return None
+
+        ttl_clause, ttl_params = _ttl_clause()
         try:
             with self._get_connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute(
-                        """
-                        SELECT response_json
+                        f"""
+                        SELECT response_json::text AS response_json, response_zstd
                         FROM response_cache
-                        WHERE cache_key = %s AND model = %s
+                        WHERE cache_key = %s AND model = %s {ttl_clause}
                         """,
-                        (cache_key, model)
+                        (cache_key, model, *ttl_params)
                     )
                     result = cur.fetchone()
 
-                    if result:
-                        logger.info(f"✅ Cache HIT for key: {cache_key[:16]}...")
-                        response_data = result['response_json']
-                        if isinstance(response_data, dict):
-                            return json.dumps(response_data)
-                        return response_data
-
-                    logger.info(f"❌ Cache MISS for key: {cache_key[:16]}...")
-                    return None
-
         except Exception as exc:
+            CACHE_LOOKUPS.labels("postgres", "error").inc()
             logger.warning(f"Cache read failed: {exc}")
             return None
 
+        response_data = _decode_body(cache_key, result) if result else None
+        if response_data is None:
+            CACHE_LOOKUPS.labels("postgres", "miss").inc()
+            logger.info(f"❌ Cache MISS for key: {cache_key[:16]}...")
+            return None
+
+        CACHE_LOOKUPS.labels("postgres", "hit").inc()
+        logger.info(f"✅ Cache HIT for key: {cache_key[:16]}...")
+        self._access.record(cache_key, model)
+        self._remember(cache_key, model, response_data)
+        return response_data
+
+    def get_many(self, cache_keys: Iterable[str], model: str) -> Dict[str, str]:
+        """
+        Look up several keys at once: L1 first, then a single Postgres query
+        for the rest. Returns only the keys that were found.
+        """
+        if self._disabled or not settings.cache_enabled:
+            return {}
+
+        found: Dict[str, str] = {}
+        missing = []
+        for cache_key in dict.fromkeys(cache_keys):
+            in_memory = self.get_from_memory(cache_key, model)
+            if in_memory is not None:
+                found[cache_key] = in_memory
+            else:
+                missing.append(cache_key)
+
+        if not missing:
+            return found
+
+        ttl_clause, ttl_params = _ttl_clause()
+        try:
+            with self._get_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute(
+                        f"""
+                        SELECT cache_key, response_json::text AS response_json, response_zstd
+                        FROM response_cache
+                        WHERE cache_key = ANY(%s) AND model = %s {ttl_clause}
+                        """,
+                        (missing, model, *ttl_params)
+                    )
+                    rows = cur.fetchall()
+        except Exception as exc:
+            CACHE_LOOKUPS.labels("postgres", "error").inc(len(missing))
+            logger.warning(f"Cache multi-read failed: {exc}")
+            return found
+
+        hits = 0
+        for row in rows:
+            response_data = _decode_body(row['cache_key'], row)
+            if response_data is None:
+                continue
+            hits += 1
+            self._remember(row['cache_key'], model, response_data)
+            self._access.record(row['cache_key'], model)
+            found[row['cache_key']] = response_data
+
+        CACHE_LOOKUPS.labels("postgres", "hit").inc(hits)
+        CACHE_LOOKUPS.labels("postgres", "miss").inc(len(missing) - hits)
+        logger.info(f"✅ Cache multi-read: {len(found)} hits, {len(missing) - hits} misses")
+        return found
+
     def set(self, cache_key: str, model: str, response_json: str) -> bool:
         if self._disabled or not settings.cache_enabled:
             return False
 
+        self._remember(cache_key, model, response_json)
+
         try:
             with self._get_connection() as conn:
                 with conn.cursor() as cur:
                     cur.execute(
                         """
-                        INSERT INTO response_cache (cache_key, model, response_json)
-                        VALUES (%s, %s, %s::jsonb)
+                        INSERT INTO response_cache (cache_key, model, response_json, response_zstd)
+                        VALUES (%s, %s, %s::jsonb, %s)
                         ON CONFLICT (cache_key, model)
                         DO UPDATE SET
                             response_json = EXCLUDED.response_json,
+                            response_zstd = EXCLUDED.response_zstd,
                             updated_at = CURRENT_TIMESTAMP
                         """,
-                        (cache_key, model, response_json)
+                        (cache_key, model, *_encode_body(response_json))
                     )
 
+            CACHE_WRITES.labels("postgres", "ok").inc()
             logger.info(f"💾 Cache WRITE for key: {cache_key[:16]}...")
             return True
 
         except Exception as exc:
+            CACHE_WRITES.labels("postgres", "error").inc()
             logger.error(f"Cache write failed: {exc}")
             return False
 
+    def record_hits(self, counts: Dict[Tuple[str, str], int]) -> bool:
+        """Apply batched hit counts ({(cache_key, model): hits}) in one UPDATE."""
+        if self._disabled or not settings.cache_enabled:
+            return True
+
+        try:
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
+                    execute_values(
+                        cur,
+                        """
+                        UPDATE response_cache AS r
+                        SET hit_count = r.hit_count + v.hits,
+                            last_accessed_at = CURRENT_TIMESTAMP
+                        FROM (VALUES %s) AS v(cache_key, model, hits)
+                        WHERE r.cache_key = v.cache_key AND r.model = v.model
+                        """,
+                        [(cache_key, model, hits) for (cache_key, model), hits in counts.items()],
+                        template="(%s, %s, %s::bigint)",
+                    )
+            return True
+
+        except Exception as exc:
+            logger.warning(f"Cache access tracking write failed: {exc}")
+            return False
+
+    def set_many(self, entries: List[Tuple[str, str]], model: str) -> int:
+        """Upsert (cache_key, response_json) pairs in one statement."""
+        if self._disabled or not settings.cache_enabled or not entries:
+            return 0
+
+        for cache_key, response_json in entries:
+            self._remember(cache_key, model, response_json)
+
+        try:
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
+                    execute_values(
+                        cur,
+                        """
+                        INSERT INTO response_cache (cache_key, model, response_json, response_zstd)
+                        VALUES %s
+                        ON CONFLICT (cache_key, model)
+                        DO UPDATE SET
+                            response_json = EXCLUDED.response_json,
+                            response_zstd = EXCLUDED.response_zstd,
+                            updated_at = CURRENT_TIMESTAMP
+                        """,
+                        [
+                            (cache_key, model, *_encode_body(response_json))
+                            for cache_key, response_json in entries
+                        ],
+                        template="(%s, %s, %s::jsonb, %s)",
+                    )
+                    # Rewrites (reoverlay): other processes drop their L1 copies.
+                    notify_invalidated(cur, [self._l1_key(cache_key, model) for cache_key, _ in entries])
+
+            CACHE_WRITES.labels("postgres", "ok").inc(len(entries))
+            logger.info(f"💾 Cache WRITE for {len(entries)} keys")
+            return len(entries)
+
+        except Exception as exc:
+            CACHE_WRITES.labels("postgres", "error").inc(len(entries))
+            logger.error(f"Cache batch write failed: {exc}")
+            return 0
+
+    # Raw LLM tier: the model's own output (FullProfileEvaluationResponseRaw)
+    # before the rule-based overlay, keyed by the prompt/schema fingerprint so
+    # rule changes can be re-applied without calling the LLM again.
+
+    def get_raw(self, cache_key: str, model: str, prompt_fingerprint: str) -> Optional[str]:
+        if self._disabled or not settings.cache_enabled:
+            return None
+
+        try:
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        SELECT raw_json::text
+                        FROM llm_response_cache
+                        WHERE cache_key = %s AND model = %s AND prompt_fingerprint = %s
+                        """,
+                        (cache_key, model, prompt_fingerprint)
+                    )
+                    row = cur.fetchone()
+
+        except Exception as exc:
+            CACHE_LOOKUPS.labels("raw", "error").inc()
+            logger.warning(f"Raw LLM cache read failed: {exc}")
+            return None
+
+        if row is None:
+            CACHE_LOOKUPS.labels("raw", "miss").inc()
+            return None
+        CACHE_LOOKUPS.labels("raw", "hit").inc()
+        logger.info(f"♻️ Raw LLM cache HIT for key: {cache_key[:16]}...")
+        return row[0]
+
+    def set_raw(
+        self,
+        cache_key: str,
+        model: str,
+        prompt_fingerprint: str,
+        payload: Dict[str, Any],
+        raw_json: str,
+    ) -> bool:
+        if self._disabled or not settings.cache_enabled:
+            return False
+
+        try:
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        INSERT INTO llm_response_cache
+                            (cache_key, model, prompt_fingerprint, payload, raw_json)
+                        VALUES (%s, %s, %s, %s, %s::jsonb)
+                        ON CONFLICT (cache_key, model, prompt_fingerprint)
+                        DO UPDATE SET
+                            payload = EXCLUDED.payload,
+                            raw_json = EXCLUDED.raw_json,
+                            updated_at = CURRENT_TIMESTAMP
+                        """,
+                        (cache_key, model, prompt_fingerprint, Json(payload), raw_json)
+                    )
+            CACHE_WRITES.labels("raw", "ok").inc()
+            return True
+
+        except Exception as exc:
+            CACHE_WRITES.labels("raw", "error").inc()
+            logger.error(f"Raw LLM cache write failed: {exc}")
+            return False
+
+    def iter_raw(
+        self,
+        model: str,
+        prompt_fingerprint: str,
+        batch_size: int = 500,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Batches of {cache_key, payload, raw_json} rows, paged by id."""
+        last_id = 0
+        while True:
+            with self._get_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute(
+                        """
+                        SELECT id, cache_key, payload, raw_json::text AS raw_json
+                        FROM llm_response_cache
+                        WHERE model = %s AND prompt_fingerprint = %s AND id > %s
+                        ORDER BY id
+                        LIMIT %s
+                        """,
+                        (model, prompt_fingerprint, last_id, batch_size)
+                    )
+                    rows = cur.fetchall()
+
+            if not rows:
+                return
+            last_id = rows[-1]["id"]
+            yield [dict(row) for row in rows]
+
     def delete(self, cache_key: str, model: str) -> bool:
+        self._forget(cache_key, model)
+
         try:
             with self._get_connection() as conn:
                 with conn.cursor() as cur:
@@ -136,13 +439,17 @@ class CacheRepository:
                         "DELETE FROM response_cache WHERE cache_key = %s AND model = %s",
                         (cache_key, model)
                     )
-                    return cur.rowcount > 0
+                    deleted = cur.rowcount > 0
+                    notify_invalidated(cur, [self._l1_key(cache_key, model)])
+                    return deleted
 
         except Exception as exc:
             logger.error(f"Cache delete failed: {exc}")
             return False
 
     def clear(self, model: Optional[str] = None) -> int:
+        self._forget()
+
         try:
             with self._get_connection() as conn:
                 with conn.cursor() as cur:
@@ -155,6 +462,7 @@ class CacheRepository:
                         cur.execute("DELETE FROM response_cache")
 
                     deleted_count = cur.rowcount
+                    notify_invalidated(cur)
                     logger.info(f"Cleared {deleted_count} cache entries")
                     return deleted_count
 
@@ -162,6 +470,108 @@ class CacheRepository:
             logger.error(f"Failed to clear cache: {exc}")
             return 0
 
+    # Namespace administration (see src/services/cache_admin.py)
+
+    def namespace_stats(self) -> List[Dict[str, Any]]:
+        """Entry count, size and age per response_cache namespace."""
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        model AS namespace,
+                        COUNT(*) AS entries,
+                        SUM(
+                            COALESCE(pg_column_size(response_json), 0)
+                            + COALESCE(pg_column_size(response_zstd), 0)
+                        )::bigint AS size_bytes,
+                        MIN(created_at) AS oldest_entry,
+                        MAX(updated_at) AS latest_entry
+                    FROM response_cache
+                    GROUP BY model
+                    ORDER BY MAX(updated_at) DESC
+                    """
+                )
+                return [dict(row) for row in cur.fetchall()]
+
+    def sample_responses(self, model: str, limit: int) -> List[str]:
+        """Up to ``limit`` random response bodies from one namespace (zstd dictionary training)."""
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT cache_key, response_json::text AS response_json, response_zstd
+                    FROM response_cache
+                    WHERE model = %s
+                    ORDER BY random()
+                    LIMIT %s
+                    """,
+                    (model, limit)
+                )
+                rows = cur.fetchall()
+
+        bodies = (_decode_body(row['cache_key'], row) for row in rows)
+        return [body for body in bodies if body is not None]
+
+    def raw_fingerprint_stats(self) -> List[Dict[str, Any]]:
+        """Entry count, size and age per (model, prompt_fingerprint) of the raw LLM tier."""
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        model,
+                        prompt_fingerprint,
+                        COUNT(*) AS entries,
+                        SUM(pg_column_size(raw_json) + pg_column_size(payload))::bigint AS size_bytes,
+                        MIN(created_at) AS oldest_entry,
+                        MAX(updated_at) AS latest_entry
+                    FROM llm_response_cache
+                    GROUP BY model, prompt_fingerprint
+                    ORDER BY MAX(updated_at) DESC
+                    """
+                )
+                return [dict(row) for row in cur.fetchall()]
+
+    def _delete_in_batches(self, table: str, column: str, keep: List[str], batch_size: int) -> int:
+        # Short transactions keep row locks and WAL bursts small on big tables.
+        deleted = 0
+        while True:
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"""
+                        DELETE FROM {table}
+                        WHERE id IN (
+                            SELECT id FROM {table}
+                            WHERE NOT ({column} = ANY(%s))
+                            LIMIT %s
+                        )
+                        """,
+                        (keep, batch_size)
+                    )
+                    batch_deleted = cur.rowcount
+            deleted += batch_deleted
+            if batch_deleted < batch_size:
+                return deleted
+
+    def delete_other_namespaces(self, keep: List[str], batch_size: int = 5000) -> int:
+        """Delete response_cache entries whose namespace is not in ``keep``."""
+        self._forget()
+        deleted = self._delete_in_batches("response_cache", "model", keep, batch_size)
+        if deleted:
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
+                    notify_invalidated(cur)
+        logger.info(f"Garbage-collected {deleted} cache entries outside {keep}")
+        return deleted
+
+    def delete_other_prompt_fingerprints(self, keep: List[str], batch_size: int = 5000) -> int:
+        """Delete raw LLM entries whose prompt fingerprint is not in ``keep``."""
+        deleted = self._delete_in_batches("llm_response_cache", "prompt_fingerprint", keep, batch_size)
+        logger.info(f"Garbage-collected {deleted} raw LLM entries")
+        return deleted
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics.
@@ -183,7 +593,7 @@ class CacheRepository:
                             MAX(created_at) as latest_entry,
                             MIN(created_at) as oldest_entry,
                             pg_size_pretty(
-                                SUM(LENGTH(response_json::text))::bigint
+                                SUM(COALESCE(LENGTH(response_json::text), OCTET_LENGTH(response_zstd)))::bigint
                             ) as total_size
                         FROM response_cache
                         """
@@ -212,3 +622,63 @@ class CacheRepository:
                     return True
         except Exception:
             return False
+
+
+class AsyncCacheRepository:
+    """
+    Async facade over CacheRepository.
+
+    psycopg2 is a blocking driver, so each call is dispatched to the default
+    thread pool and the event loop stays free while Postgres answers.
+    """
+
+    def __init__(self, repository: Optional[CacheRepository] = None):
+        self._repository = repository or CacheRepository()
+
+    @property
+    def repository(self) -> CacheRepository:
+        return self._repository
+
+    @staticmethod
+    def generate_cache_key(payload: Dict[str, Any], model: str) -> str:
+        return CacheRepository.generate_cache_key(payload, model)
+
+    async def get(self, cache_key: str, model: str) -> Optional[str]:
+        # L1 hits are served inline; only Postgres lookups need a worker thread.
+        in_memory = self._repository.get_from_memory(cache_key, model)
+        if in_memory is not None:
+            return in_memory
+        return await asyncio.to_thread(self._repository._get_from_db, cache_key, model)
+
+    async def get_many(self, cache_keys: Iterable[str], model: str) -> Dict[str, str]:
+        return await asyncio.to_thread(self._repository.get_many, list(cache_keys), model)
+
+    async def set(self, cache_key: str, model: str, response_json: str) -> bool:
+        return await asyncio.to_thread(self._repository.set, cache_key, model, response_json)
+
+    async def get_raw(self, cache_key: str, model: str, prompt_fingerprint: str) -> Optional[str]:
+        return await asyncio.to_thread(self._repository.get_raw, cache_key, model, prompt_fingerprint)
+
+    async def set_raw(
+        self,
+        cache_key: str,
+        model: str,
+        prompt_fingerprint: str,
+        payload: Dict[str, Any],
+        raw_json: str,
+    ) -> bool:
+        return await asyncio.to_thread(
+            self._repository.set_raw, cache_key, model, prompt_fingerprint, payload, raw_json
+        )
+
+    async def delete(self, cache_key: str, model: str) -> bool:
+        return await asyncio.to_thread(self._repository.delete, cache_key, model)
+
+    async def clear(self, model: Optional[str] = None) -> int:
+        return await asyncio.to_thread(self._repository.clear, model)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._repository.get_stats)
+
+    async def health_check(self) -> bool:
+        return await asyncio.to_thread(self._repository.health_check)
@@ -0,0 +1,213 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from psycopg2 import pool
+
+from src.config.exceptions import DatabaseError
+from src.config.logging_config import get_logger
+from src.config.metrics import DB_POOL_CHECKOUTS, DB_POOL_WAIT_SECONDS
+from src.config.settings import settings
+
+logger = get_logger(__name__)
+
+# After a failed connect attempt, wait this long before trying Postgres again
+# instead of paying a connect timeout on every request.
+_RETRY_INTERVAL_SECONDS = 30.0
+
+
+class DatabasePool:
+    """
+    Process-wide, thread-safe psycopg2 connection pool.
+
+    Sizing follows the usual pool_size / max_overflow split: ``pool_size``
+    connections are kept open between checkouts, up to ``max_overflow``
+    extra connections are opened under load and closed again on return.
+    Callers wait at most ``pool_timeout`` seconds for a free connection,
+    and connections older than ``max_lifetime`` seconds are recycled.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        *,
+        pool_size: int,
+        max_overflow: int,
+        pool_timeout: float,
+        max_lifetime: float,
+    ):
+        max_connections = pool_size + max_overflow
+        self._pool = pool.ThreadedConnectionPool(
+            minconn=pool_size,
+            maxconn=max_connections,
+            dsn=dsn,
+        )
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._pool_timeout = pool_timeout
+        self._max_lifetime = max_lifetime
+        self._opened_at: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._pool_size = pool_size
+        self._max_connections = max_connections
+        self._in_use = 0
+
+    @classmethod
+    def from_settings(cls) -> "DatabasePool":
+        return cls(
+            settings.database_url,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            max_lifetime=settings.db_pool_recycle,
+        )
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _is_expired(self, conn) -> bool:
+        with self._lock:
+            opened_at = self._opened_at.setdefault(id(conn), time.monotonic())
+        return time.monotonic() - opened_at > self._max_lifetime
+
+    def _discard(self, conn) -> None:
+        with self._lock:
+            self._opened_at.pop(id(conn), None)
+        self._pool.putconn(conn, close=True)
+
+    def _checkout(self):
+        while True:
+            conn = self._pool.getconn()
+            if not conn.closed and not self._is_expired(conn):
+                return conn
+            self._discard(conn)
+
+    def _checkin(self, conn) -> None:
+        if conn.closed or self._is_expired(conn):
+            self._discard(conn)
+        else:
+            self._pool.putconn(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator:
+        if self._closed:
+            raise DatabaseError("Database pool is closed")
+
+        wait_started = time.perf_counter()
+        if not self._slots.acquire(timeout=self._pool_timeout):
+            DB_POOL_CHECKOUTS.labels("timeout").inc()
+            raise DatabaseError(
+                f"Timed out after {self._pool_timeout}s waiting for a database connection"
+            )
+
+        try:
+            conn = self._checkout()
+            DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - wait_started)
+            DB_POOL_CHECKOUTS.labels("ok").inc()
+            with self._lock:
+                self._in_use += 1
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                with self._lock:
+                    self._in_use -= 1
+                self._checkin(conn)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_use": self._in_use,
+                "pool_size": self._pool_size,
+                "max_connections": self._max_connections,
+            }
+
+    def ping(self) -> None:
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._pool.closeall()
+        with self._lock:
+            self._opened_at.clear()
+
+
+_shared_pool: Optional[DatabasePool] = None
+_shared_pool_lock = threading.Lock()
+_last_failed_attempt: Optional[float] = None
+
+
+def init_database_pool() -> Optional[DatabasePool]:
+    """
+    Create (once) and return the shared pool.
+
+    Returns None when caching is disabled or Postgres is unreachable; the
+    next call after the retry interval tries again.
+    """
+    global _shared_pool, _last_failed_attempt
+
+    if not settings.cache_enabled:
+        return None
+
+    with _shared_pool_lock:
+        if _shared_pool is not None and not _shared_pool.closed:
+            return _shared_pool
+
+        if (
+            _last_failed_attempt is not None
+            and time.monotonic() - _last_failed_attempt < _RETRY_INTERVAL_SECONDS
+        ):
+            return None
+
+        try:
+            db_pool = DatabasePool.from_settings()
+            db_pool.ping()
+        except Exception as exc:
+            _last_failed_attempt = time.monotonic()
+            logger.error(f"Failed to initialize database pool: {exc}")
+            return None
+
+        _shared_pool = db_pool
+        _last_failed_attempt = None
+        logger.info(
+            "✅ Database pool initialized "
+            f"(pool_size={settings.db_pool_size}, max_overflow={settings.db_max_overflow})"
+        )
+        return _shared_pool
+
+
+def get_database_pool() -> Optional[DatabasePool]:
+    if _shared_pool is not None and not _shared_pool.closed:
+        return _shared_pool
+    return init_database_pool()
+
+
+def get_database_pool_stats() -> Dict[str, int]:
+    """Stats of the shared pool, or {} if none is open; never opens one."""
+    db_pool = _shared_pool
+    if db_pool is None or db_pool.closed:
+        return {}
+    return db_pool.stats()
+
+
+def close_database_pool() -> None:
+    global _shared_pool
+
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            return
+        _shared_pool.close()
+        _shared_pool = None
+        logger.info("Database pool closed")
@@ -0,0 +1,204 @@
+import uuid
+from typing import Any, Dict, Optional
+
+from psycopg2.extras import Json, RealDictCursor
+
+from src.config.logging_config import get_logger
+from src.repositories.connection_pool import DatabasePool, get_database_pool
+
+logger = get_logger(__name__)
+
+
+class JobRepository:
+    """
+    The evaluation_jobs work queue.
+
+    Jobs are claimed with FOR UPDATE SKIP LOCKED, so concurrent workers (in
+    any number of processes) each get a different job without blocking on
+    each other. A claim holds a lease, which the worker renews while it
+    evaluates; a running job whose lease expired is treated as abandoned
+    and can be claimed again.
+    """
+
+    def __init__(self, db_pool: Optional[DatabasePool] = None):
+        self._pool = db_pool
+
+    def _get_pool(self) -> Optional[DatabasePool]:
+        if self._pool is not None and not self._pool.closed:
+            return self._pool
+
+        self._pool = get_database_pool()
+        return self._pool
+
+    def enqueue(self, cache_key: str, payload: Dict[str, Any], result_json: Optional[str] = None) -> Optional[str]:
+        """
+        Add a job and return its ID (None if Postgres is unavailable). With
+        ``result_json`` (a cache hit at submission) the job is stored as done.
+        """
+        pool_instance = self._get_pool()
+        if pool_instance is None:
+            return None
+
+        job_id = str(uuid.uuid4())
+        try:
+            with pool_instance.connection() as conn:
+                with conn.cursor() as cur:
+                    if result_json is None:
+                        cur.execute(
+                            "INSERT INTO evaluation_jobs (id, cache_key, payload) VALUES (%s, %s, %s)",
+                            (job_id, cache_key, Json(payload)),
+                        )
+                    else:
+                        cur.execute(
+                            """
+                            INSERT INTO evaluation_jobs
+                                (id, status, cache_key, payload, result_json, started_at, finished_at)
+                            VALUES (%s, 'done', %s, %s, %s::jsonb, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                            """,
+                            (job_id, cache_key, Json(payload), result_json),
+                        )
+            return job_id
+
+        except Exception as exc:
+            logger.error(f"Job enqueue failed: {exc}")
+            return None
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """Take the oldest queued (or abandoned) job, or None if there is none."""
+        pool_instance = self._get_pool()
+        if pool_instance is None:
+            return None
+
+        with pool_instance.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    WITH next_job AS (
+                        SELECT id FROM evaluation_jobs
+                        WHERE (status = 'queued' AND (retry_at IS NULL OR retry_at <= CURRENT_TIMESTAMP))
+                           OR (status = 'running' AND lease_expires_at < CURRENT_TIMESTAMP)
+                        ORDER BY created_at
+                        LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    UPDATE evaluation_jobs AS job
+                    SET status = 'running',
+                        attempts = job.attempts + 1,
+                        worker_id = %s,
+                        started_at = CURRENT_TIMESTAMP,
+                        lease_expires_at = CURRENT_TIMESTAMP + %s * INTERVAL '1 second',
+                        retry_at = NULL
+                    FROM next_job
+                    WHERE job.id = next_job.id
+                    RETURNING job.id::text AS id, job.cache_key, job.payload, job.attempts
+                    """,
+                    (worker_id, lease_seconds),
+                )
+                row = cur.fetchone()
+        return dict(row) if row else None
+
+    def renew_lease(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend the lease on a running job; False if it is no longer this worker's."""
+        pool_instance = self._get_pool()
+        if pool_instance is None:
+            return False
+
+        with pool_instance.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE evaluation_jobs
+                    SET lease_expires_at = CURRENT_TIMESTAMP + %s * INTERVAL '1 second'
+                    WHERE id = %s AND worker_id = %s AND status = 'running'
+                    """,
+                    (lease_seconds, job_id, worker_id),
+                )
+                return cur.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result_json: str) -> bool:
+        """Store the result; False if the job is no longer this worker's (lease lost)."""
+        pool_instance = self._get_pool()
+        if pool_instance is None:
+            return False
+
+        with pool_instance.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE evaluation_jobs
+                    SET status = 'done', result_json = %s::jsonb, error = NULL,
+                        finished_at = CURRENT_TIMESTAMP, lease_expires_at = NULL
+                    WHERE id = %s AND worker_id = %s AND status = 'running'
+                    """,
+                    (result_json, job_id, worker_id),
+                )
+                return cur.rowcount == 1
+
+    def fail(
+        self, job_id: str, worker_id: str, error: str, max_attempts: int, retry_after: float = 0.0
+    ) -> Optional[str]:
+        """
+        Record a failed attempt: the job is queued again while it has attempts
+        left (claimable after ``retry_after`` seconds), otherwise it fails for
+        good. Returns the new status.
+        """
+        pool_instance = self._get_pool()
+        if pool_instance is None:
+            return None
+
+        with pool_instance.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE evaluation_jobs
+                    SET status = CASE WHEN attempts < %s THEN 'queued' ELSE 'failed' END,
+                        error = %s,
+                        worker_id = NULL,
+                        lease_expires_at = NULL,
+                        retry_at = CURRENT_TIMESTAMP + %s * INTERVAL '1 second',
+                        finished_at = CASE WHEN attempts < %s THEN NULL ELSE CURRENT_TIMESTAMP END
+                    WHERE id = %s AND worker_id = %s AND status = 'running'
+                    RETURNING status
+                    """,
+                    (max_attempts, error, retry_after, max_attempts, job_id, worker_id),
+                )
+                row = cur.fetchone()
+        return row[0] if row else None
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        pool_instance = self._get_pool()
+        if pool_instance is None:
+            return None
+
+        with pool_instance.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT id::text AS id, status, cache_key, attempts, error,
+                           created_at, started_at, finished_at,
+                           result_json::text AS result_json
+                    FROM evaluation_jobs
+                    WHERE id = %s
+                    """,
+                    (job_id,),
+                )
+                row = cur.fetchone()
+        return dict(row) if row else None
+
+    def delete_finished(self, older_than_seconds: float) -> int:
+        """Delete done/failed jobs that finished more than ``older_than_seconds`` ago."""
+        pool_instance = self._get_pool()
+        if pool_instance is None:
+            return 0
+
+        with pool_instance.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    DELETE FROM evaluation_jobs
+                    WHERE status IN ('done', 'failed')
+                      AND finished_at < CURRENT_TIMESTAMP - %s * INTERVAL '1 second'
+                    """,
+                    (older_than_seconds,),
+                )
+                return cur.rowcount
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.config.settings import settings
+
+
+class LRUByteCache:
+    """
+    Bounded, thread-safe in-process LRU cache of serialized responses.
+
+    Entries are raw bytes so the memory accounting is exact; the cache
+    evicts least-recently-used entries once ``max_bytes`` is exceeded and
+    treats entries older than ``ttl_seconds`` as misses.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: Optional[float] = None):
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self._max_bytes:
+            return
+
+        expires_at = (
+            time.monotonic() + self._ttl_seconds if self._ttl_seconds else None
+        )
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at)
+            self._size_bytes += len(value)
+
+            while self._size_bytes > self._max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._size_bytes -= len(value)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+_shared_l1_cache: Optional[LRUByteCache] = None
+_shared_l1_lock = threading.Lock()
+
+
+def l1_ttl_seconds() -> Optional[int]:
+    """L1_CACHE_TTL, capped at CACHE_TTL so L1 never outlives a Postgres entry's TTL."""
+    limits = [ttl for ttl in (settings.l1_cache_ttl, settings.cache_ttl) if ttl]
+    return min(limits) if limits else None
+
+
+def get_l1_cache() -> Optional[LRUByteCache]:
+    """Process-wide L1 cache, or None when disabled in settings."""
+    global _shared_l1_cache
+
+    if not settings.l1_cache_enabled:
+        return None
+
+    with _shared_l1_lock:
+        if _shared_l1_cache is None:
+            _shared_l1_cache = LRUByteCache(
+                max_bytes=settings.l1_cache_max_bytes,
+                ttl_seconds=l1_ttl_seconds(),
+            )
+        return _shared_l1_cache
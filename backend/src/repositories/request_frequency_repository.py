@@ -0,0 +1,85 @@
+from typing import Dict, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from src.config.logging_config import get_logger
+from src.config.settings import settings
+from src.repositories.batched_counter import BatchedCounter
+from src.repositories.connection_pool import DatabasePool, get_database_pool
+
+logger = get_logger(__name__)
+
+
+class RequestFrequencyRepository:
+    """How often each cache key has been requested; drives cache warmup."""
+
+    def __init__(self, db_pool: Optional[DatabasePool] = None):
+        self._pool = db_pool
+
+    def _get_pool(self) -> Optional[DatabasePool]:
+        if not settings.cache_enabled:
+            return None
+
+        if self._pool is not None and not self._pool.closed:
+            return self._pool
+
+        self._pool = get_database_pool()
+        return self._pool
+
+    def increment_many(self, counts: Dict[Tuple[str, str], int]) -> bool:
+        """Add ``counts`` (keyed by (cache_key, model)) in one upsert."""
+        if not settings.cache_enabled:
+            # No database to write to; report success so the counts are dropped.
+            return True
+
+        pool_instance = self._get_pool()
+        if pool_instance is None or not counts:
+            return False
+
+        try:
+            with pool_instance.connection() as conn:
+                with conn.cursor() as cur:
+                    execute_values(
+                        cur,
+                        """
+                        INSERT INTO request_frequency (cache_key, model, request_count)
+                        VALUES %s
+                        ON CONFLICT (cache_key, model)
+                        DO UPDATE SET
+                            request_count = request_frequency.request_count + EXCLUDED.request_count,
+                            last_requested_at = CURRENT_TIMESTAMP
+                        """,
+                        [(cache_key, model, count) for (cache_key, model), count in counts.items()],
+                    )
+            return True
+
+        except Exception as exc:
+            logger.warning(f"Request frequency write failed: {exc}")
+            return False
+
+    def get_counts(self, model: str) -> Dict[str, int]:
+        pool_instance = self._get_pool()
+        if pool_instance is None:
+            return {}
+
+        try:
+            with pool_instance.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "SELECT cache_key, request_count FROM request_frequency WHERE model = %s",
+                        (model,)
+                    )
+                    return dict(cur.fetchall())
+
+        except Exception as exc:
+            logger.warning(f"Request frequency read failed: {exc}")
+            return {}
+
+
+# Process-wide request counts fed by the evaluation entry points; flushed
+# to RequestFrequencyRepository.increment_many by the app lifespan. Nothing
+# is recorded without the cache database (CACHE_ENABLED=false).
+request_frequency = BatchedCounter(
+    "request_frequency",
+    enabled=lambda: settings.request_frequency_enabled and settings.cache_enabled,
+)
@@ -0,0 +1,128 @@
+"""
+zstd codec for cached response bodies.
+
+Uses the standard library's compression.zstd (Python 3.14+) and falls back to
+the ``zstandard`` package. With neither installed, compressed storage is
+unavailable and responses stay in the JSONB column.
+
+A dictionary trained on our own responses (see ``cache_admin train-dict``)
+carries the persona copy that every evaluation repeats, so each row only
+stores what is specific to it. zstd frames record the dictionary ID they were
+written with; a frame whose dictionary is not loaded fails to decode and is
+treated as a cache miss.
+"""
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+from src.config.logging_config import get_logger
+from src.config.settings import settings
+
+logger = get_logger(__name__)
+
+try:
+    from compression import zstd as _stdlib_zstd
+except ImportError:
+    _stdlib_zstd = None
+
+try:
+    import zstandard as _zstandard
+except ImportError:
+    _zstandard = None
+
+ZSTD_AVAILABLE = _stdlib_zstd is not None or _zstandard is not None
+
+
+class ResponseCodec:
+    """Compresses and decompresses response bodies, optionally with a dictionary."""
+
+    def __init__(self, level: int = 3, dictionary: Optional[bytes] = None):
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd support requires Python 3.14+ or the 'zstandard' package")
+        self._level = level
+        self._local = threading.local()
+
+        if _stdlib_zstd is not None:
+            self._dict = _stdlib_zstd.ZstdDict(dictionary) if dictionary else None
+            self.dict_id = self._dict.dict_id if self._dict is not None else 0
+        else:
+            self._dict = _zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            self.dict_id = self._dict.dict_id() if self._dict is not None else 0
+
+    def _zstandard_contexts(self):
+        # zstandard contexts are not thread-safe; cache reads and writes run
+        # on the default thread pool, so each worker thread gets its own.
+        contexts = getattr(self._local, "contexts", None)
+        if contexts is None:
+            dict_kwargs = {"dict_data": self._dict} if self._dict is not None else {}
+            contexts = (
+                _zstandard.ZstdCompressor(level=self._level, **dict_kwargs),
+                _zstandard.ZstdDecompressor(**dict_kwargs),
+                _zstandard.ZstdDecompressor(),
+            )
+            self._local.contexts = contexts
+        return contexts
+
+    def compress(self, data: bytes) -> bytes:
+        if _stdlib_zstd is not None:
+            return _stdlib_zstd.compress(data, level=self._level, zstd_dict=self._dict)
+        return self._zstandard_contexts()[0].compress(data)
+
+    def decompress(self, frame: bytes) -> bytes:
+        frame_dict_id = frame_dictionary_id(frame)
+        if frame_dict_id not in (0, self.dict_id):
+            raise ValueError(
+                f"Frame needs zstd dictionary {frame_dict_id}, loaded dictionary is {self.dict_id}"
+            )
+
+        if _stdlib_zstd is not None:
+            zstd_dict = self._dict if frame_dict_id else None
+            return _stdlib_zstd.decompress(frame, zstd_dict=zstd_dict)
+        _, with_dict, without_dict = self._zstandard_contexts()
+        return (with_dict if frame_dict_id else without_dict).decompress(frame)
+
+
+def frame_dictionary_id(frame: bytes) -> int:
+    if _stdlib_zstd is not None:
+        return _stdlib_zstd.get_frame_info(frame).dictionary_id
+    return _zstandard.get_frame_parameters(frame).dict_id
+
+
+def train_dictionary(samples: List[bytes], dict_size: int) -> bytes:
+    """Train a zstd dictionary of at most ``dict_size`` bytes from sample responses."""
+    if _stdlib_zstd is not None:
+        return _stdlib_zstd.train_dict(samples, dict_size).dict_content
+    if _zstandard is not None:
+        return _zstandard.train_dictionary(dict_size, samples).as_bytes()
+    raise RuntimeError("zstd support requires Python 3.14+ or the 'zstandard' package")
+
+
+@lru_cache(maxsize=1)
+def get_response_codec() -> Optional[ResponseCodec]:
+    """
+    Process-wide codec built from CACHE_ZSTD_LEVEL / CACHE_ZSTD_DICTIONARY_PATH.
+
+    Available whenever zstd is installed, so compressed rows stay readable
+    after CACHE_COMPRESSION is switched back to "none".
+    """
+    if not ZSTD_AVAILABLE:
+        if settings.cache_compression == "zstd":
+            logger.warning("CACHE_COMPRESSION=zstd but zstd is unavailable; storing JSONB")
+        return None
+
+    dictionary = None
+    if settings.cache_zstd_dictionary_path:
+        dictionary = Path(settings.cache_zstd_dictionary_path).read_bytes()
+
+    codec = ResponseCodec(level=settings.cache_zstd_level, dictionary=dictionary)
+    if settings.cache_compression == "zstd":
+        logger.info(f"🗜️ Cache compression: zstd level {settings.cache_zstd_level}, dictionary {codec.dict_id or 'none'}")
+    return codec
+
+
+def get_write_codec() -> Optional[ResponseCodec]:
+    """Codec for new cache writes, or None when responses are stored as JSONB."""
+    if settings.cache_compression != "zstd":
+        return None
+    return get_response_codec()
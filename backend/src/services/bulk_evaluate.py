@@ -0,0 +1,288 @@
+"""
+Offline bulk evaluation over JSONL.
+
+Reads one evaluation payload per line and writes one JSONL result per line:
+
+    {"index": 0, "cache_key": "...", "status": "ok", "source": "cache", "result": {...}}
+    {"index": 1, "cache_key": "...", "status": "degraded", "source": "fallback", "result": {...}}
+    {"index": 2, "status": "error", "detail": "..."}
+
+The input is read lazily, one chunk at a time. The rule modules run in a
+process pool and the LLM calls for cache misses run concurrently on one
+event loop. The output file doubles as the
+checkpoint: re-running with the same output path skips every index that
+already has an "ok" line, so an interrupted run resumes without repeating
+OpenAI calls. "degraded" lines (rule-based fallbacks written while the
+OpenAI circuit breaker was open) and errors are retried; the last line for
+an index is its current result.
+
+Usage (from backend/):
+    python -m src.services.bulk_evaluate payloads.jsonl results.jsonl \
+        [--concurrency 8] [--workers 4] [--chunk-size 500]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, IO, Iterator, List, Optional, Set, Tuple
+
+from src.config.logging_config import get_logger
+from src.repositories.cache_repository import AsyncCacheRepository, CacheRepository
+from src.repositories.connection_pool import close_database_pool, init_database_pool
+from src.services.llm_request import close_openai_clients, llm_usage
+from src.services.cache_version import get_cache_namespace
+from src.services.canonical_payload import canonical_cache_key, canonical_payload
+from src.services.run_poc import compute_deterministic_sections, evaluate_and_cache_async
+
+logger = get_logger(__name__)
+
+MODEL_NAME = "gpt-4o"
+
+
+def _prepare(item: Tuple[int, Any]) -> Dict[str, Any]:
+    """Process-pool task: normalise, key and run the rule modules for one payload."""
+    index, payload_input = item
+    try:
+        payload = canonical_payload(payload_input)
+        return {
+            "index": index,
+            "payload": payload,
+            "cache_key": canonical_cache_key(payload),
+            "deterministic": compute_deterministic_sections(payload),
+        }
+    except Exception as exc:
+        return {"index": index, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def _prepare_chunk(chunk: List[Tuple[int, Any]]) -> List[Dict[str, Any]]:
+    return [_prepare(item) for item in chunk]
+
+
+def _load_checkpoint(output_path: str) -> Set[int]:
+    """
+    Indices already evaluated successfully in a previous run, read line by
+    line.
+
+    A line cut off by an interrupted write is dropped so appending resumes
+    on a clean line boundary.
+    """
+    done: Set[int] = set()
+    if not os.path.exists(output_path):
+        return done
+
+    complete = 0
+    with open(output_path, "rb+") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                f.truncate(complete)
+                break
+            complete += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == "ok":
+                done.add(record["index"])
+    return done
+
+
+def _read_chunks(
+    input_path: str, done: Set[int], chunk_size: int
+) -> Iterator[Tuple[List[Tuple[int, Any]], List[Dict[str, Any]]]]:
+    """
+    (pending payloads, error records for invalid lines) per ``chunk_size``
+    pending payloads, read lazily so the input never has to fit in memory.
+    """
+    pending: List[Tuple[int, Any]] = []
+    invalid: List[Dict[str, Any]] = []
+    with open(input_path, "r", encoding="utf-8") as f:
+        index = 0
+        for line in f:
+            if not line.strip():
+                continue
+            if index not in done:
+                try:
+                    pending.append((index, json.loads(line)))
+                except ValueError as exc:
+                    invalid.append({"index": index, "status": "error", "detail": f"Invalid JSON: {exc}"})
+            index += 1
+            if len(pending) == chunk_size:
+                yield pending, invalid
+                pending, invalid = [], []
+    if pending or invalid:
+        yield pending, invalid
+
+
+class BulkRun:
+    def __init__(self, out: IO[str], cache_repo: AsyncCacheRepository, concurrency: int):
+        self._out = out
+        self._cache_repo = cache_repo
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.counts = {"ok": 0, "degraded": 0, "error": 0, "cache_hits": 0, "evaluated": 0}
+
+    def write(self, record: Dict[str, Any], result_json: Optional[str] = None) -> None:
+        if result_json is None:
+            line = json.dumps(record)
+        else:
+            # Splice the already-serialized result in rather than re-encoding it.
+            line = json.dumps(record)[:-1] + f', "result": {result_json}}}'
+        self._out.write(line + "\n")
+        self.counts[record["status"]] += 1
+
+    async def _evaluate(self, prepared: Dict[str, Any]) -> Tuple[Optional[str], bool, Optional[str]]:
+        """(result JSON, degraded, error) for one distinct payload."""
+        async with self._semaphore:
+            try:
+                result, result_json = await evaluate_and_cache_async(
+                    prepared["payload"],
+                    prepared["cache_key"],
+                    MODEL_NAME,
+                    self._cache_repo,
+                    prepared["deterministic"],
+                )
+                return result_json, result.degraded, None
+            except Exception as exc:
+                logger.error(f"Evaluation failed for index {prepared['index']}: {exc}")
+                return None, False, f"{type(exc).__name__}: {exc}"
+
+    async def run_chunk(self, prepared_chunk: List[Dict[str, Any]]) -> None:
+        by_key: Dict[str, List[Dict[str, Any]]] = {}
+        for prepared in prepared_chunk:
+            if "error" in prepared:
+                self.write({"index": prepared["index"], "status": "error", "detail": prepared["error"]})
+            else:
+                by_key.setdefault(prepared["cache_key"], []).append(prepared)
+
+        cached = await self._cache_repo.get_many(by_key.keys(), get_cache_namespace(MODEL_NAME))
+        for cache_key, result_json in cached.items():
+            for prepared in by_key.pop(cache_key):
+                self.counts["cache_hits"] += 1
+                self.write(
+                    {"index": prepared["index"], "cache_key": cache_key, "status": "ok", "source": "cache"},
+                    result_json,
+                )
+
+        async def evaluate_group(group: List[Dict[str, Any]]) -> None:
+            result_json, degraded, error = await self._evaluate(group[0])
+            self.counts["evaluated"] += 1
+            # A degraded result is not cached and not checkpointed, so a re-run asks the LLM again.
+            status, source = ("degraded", "fallback") if degraded else ("ok", "llm")
+            for prepared in group:
+                if error is None:
+                    self.write(
+                        {"index": prepared["index"], "cache_key": prepared["cache_key"], "status": status, "source": source},
+                        result_json,
+                    )
+                else:
+                    self.write({"index": prepared["index"], "status": "error", "detail": error})
+            self._out.flush()
+
+        await asyncio.gather(*(evaluate_group(group) for group in by_key.values()))
+        self._out.flush()
+        os.fsync(self._out.fileno())
+
+
+async def run_bulk(
+    input_path: str,
+    output_path: str,
+    *,
+    concurrency: int,
+    workers: Optional[int],
+    chunk_size: int,
+) -> Dict[str, Any]:
+    done = _load_checkpoint(output_path)
+    if done:
+        logger.info(f"Resuming: {len(done)} payloads already evaluated")
+
+    db_pool = await asyncio.to_thread(init_database_pool)
+    cache_repo = AsyncCacheRepository(CacheRepository(db_pool))
+    usage_before = llm_usage.snapshot()
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    chunks = _read_chunks(input_path, done, chunk_size)
+
+    try:
+        with open(output_path, "a", encoding="utf-8") as out, ProcessPoolExecutor(workers) as executor:
+            bulk = BulkRun(out, cache_repo, concurrency)
+
+            def prepare(chunk):
+                return loop.run_in_executor(executor, _prepare_chunk, chunk)
+
+            # Prepare the next chunk in the process pool while the current
+            # one waits on Postgres and OpenAI.
+            current = next(chunks, None)
+            next_prepared = prepare(current[0]) if current else None
+            read = 0
+            while current is not None:
+                pending, invalid = current
+                for record in invalid:
+                    bulk.write(record)
+                prepared_chunk = await next_prepared
+                current = next(chunks, None)
+                if current is not None:
+                    next_prepared = prepare(current[0])
+                await bulk.run_chunk(prepared_chunk)
+                read += len(pending)
+                logger.info(f"Progress: {read} payloads")
+    finally:
+        await close_openai_clients()
+        await asyncio.to_thread(close_database_pool)
+
+    elapsed = time.perf_counter() - started
+    usage_after = llm_usage.snapshot()
+    usage = {key: usage_after[key] - usage_before[key] for key in usage_after}
+    processed = bulk.counts["ok"] + bulk.counts["degraded"] + bulk.counts["error"]
+    ok = bulk.counts["ok"]
+
+    return {
+        "skipped_from_checkpoint": len(done),
+        "processed": processed,
+        "ok": ok,
+        "degraded": bulk.counts["degraded"],
+        "errors": bulk.counts["error"],
+        "cache_hits": bulk.counts["cache_hits"],
+        "cache_hit_ratio": round(bulk.counts["cache_hits"] / ok, 4) if ok else 0.0,
+        "llm_evaluations": bulk.counts["evaluated"],
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(processed / elapsed, 2) if elapsed else 0.0,
+        "openai_requests": usage["requests"],
+        "prompt_tokens": usage["prompt_tokens"],
+        "cached_prompt_tokens": usage["cached_prompt_tokens"],
+        "completion_tokens": usage["completion_tokens"],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate a JSONL file of payloads.")
+    parser.add_argument("input", help="JSONL file with one evaluation payload per line")
+    parser.add_argument("output", help="JSONL results file; also the resume checkpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent OpenAI calls")
+    parser.add_argument("--workers", type=int, default=None, help="processes for the rule modules")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    if not os.environ.get("OPENAI_API_KEY"):
+        print(
+            "Error: OPENAI_API_KEY is not set. Set it in your environment and re-run.",
+            file=sys.stderr,
+        )
+        return 2
+
+    report = asyncio.run(
+        run_bulk(
+            args.input,
+            args.output,
+            concurrency=args.concurrency,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+    )
+    print(json.dumps(report, indent=2))
+    return 0 if report["errors"] == 0 and report["degraded"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,161 @@
+"""
+Cache administration by version namespace.
+
+Usage (from backend/):
+    python -m src.services.cache_admin fingerprint
+    python -m src.services.cache_admin list
+    python -m src.services.cache_admin count [--namespace NS]
+    python -m src.services.cache_admin gc [--keep NS ...] [--raw] [--dry-run] [--batch-size 5000]
+    python -m src.services.cache_admin prune
+    python -m src.services.cache_admin train-dict --out zstd.dict [--samples 2000] [--dict-size 112640]
+
+``prune`` runs one TTL / size-cap eviction pass with the CACHE_* settings,
+the same pass the API runs every CACHE_PRUNE_INTERVAL seconds.
+
+``train-dict`` trains a zstd dictionary on responses sampled from the current
+namespace; point CACHE_ZSTD_DICTIONARY_PATH at it and set
+CACHE_COMPRESSION=zstd. Rows written with a dictionary need that same file to
+be read back, so keep old dictionaries until their rows have been rewritten.
+
+``gc`` deletes response_cache entries from every namespace except the
+current one (and any given with --keep). With --raw it also deletes raw LLM
+entries produced by an old prompt/schema fingerprint.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.repositories.cache_pruner import CachePruner
+from src.repositories.cache_repository import CacheRepository
+from src.repositories.connection_pool import close_database_pool, get_database_pool, init_database_pool
+from src.repositories.response_codec import train_dictionary
+from src.services.cache_version import get_cache_fingerprint, get_cache_namespace
+from src.services.llm_request import get_llm_request_template
+
+MODEL_NAME = "gpt-4o"
+
+
+def _print(data: Any) -> None:
+    print(json.dumps(data, indent=2, default=str))
+
+
+def cmd_list(repo: CacheRepository, current: str, args: argparse.Namespace) -> int:
+    prompt_fingerprint = get_llm_request_template().fingerprint
+    _print({
+        "current_namespace": current,
+        "response_cache": [
+            {**row, "current": row["namespace"] == current} for row in repo.namespace_stats()
+        ],
+        "llm_response_cache": [
+            {**row, "current": row["prompt_fingerprint"] == prompt_fingerprint}
+            for row in repo.raw_fingerprint_stats()
+        ],
+    })
+    return 0
+
+
+def cmd_count(repo: CacheRepository, current: str, args: argparse.Namespace) -> int:
+    stats = {row["namespace"]: row["entries"] for row in repo.namespace_stats()}
+    if args.namespace:
+        _print({"namespace": args.namespace, "entries": stats.get(args.namespace, 0)})
+        return 0
+
+    _print({
+        "current_namespace": current,
+        "current_entries": stats.get(current, 0),
+        "stale_entries": sum(count for namespace, count in stats.items() if namespace != current),
+        "stale_namespaces": len([namespace for namespace in stats if namespace != current]),
+    })
+    return 0
+
+
+def cmd_gc(repo: CacheRepository, current: str, args: argparse.Namespace) -> int:
+    keep = [current, *(args.keep or [])]
+    prompt_fingerprint = get_llm_request_template().fingerprint
+
+    if args.dry_run:
+        report: Dict[str, Any] = {
+            "keep": keep,
+            "would_delete": sum(
+                row["entries"] for row in repo.namespace_stats() if row["namespace"] not in keep
+            ),
+        }
+        if args.raw:
+            report["would_delete_raw"] = sum(
+                row["entries"]
+                for row in repo.raw_fingerprint_stats()
+                if row["prompt_fingerprint"] != prompt_fingerprint
+            )
+        _print(report)
+        return 0
+
+    report = {"keep": keep, "deleted": repo.delete_other_namespaces(keep, args.batch_size)}
+    if args.raw:
+        report["deleted_raw"] = repo.delete_other_prompt_fingerprints([prompt_fingerprint], args.batch_size)
+    _print(report)
+    return 0
+
+
+def cmd_prune(repo: CacheRepository, current: str, args: argparse.Namespace) -> int:
+    _print(CachePruner.from_settings(get_database_pool()).prune())
+    return 0
+
+
+def cmd_train_dict(repo: CacheRepository, current: str, args: argparse.Namespace) -> int:
+    samples = [body.encode("utf-8") for body in repo.sample_responses(current, args.samples)]
+    if not samples:
+        print(f"Error: no cached responses in namespace {current}", file=sys.stderr)
+        return 1
+
+    dictionary = train_dictionary(samples, args.dict_size)
+    Path(args.out).write_bytes(dictionary)
+    _print({"namespace": current, "samples": len(samples), "dict_bytes": len(dictionary), "out": args.out})
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect and garbage-collect cache namespaces.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("fingerprint", help="print the current fingerprint and namespace")
+    subparsers.add_parser("list", help="entries per namespace and per prompt fingerprint")
+    count_parser = subparsers.add_parser("count", help="current vs stale entry counts")
+    count_parser.add_argument("--namespace")
+    gc_parser = subparsers.add_parser("gc", help="delete entries from old namespaces")
+    gc_parser.add_argument("--keep", action="append", help="additional namespace to keep")
+    gc_parser.add_argument("--raw", action="store_true", help="also delete raw LLM output from old prompts")
+    gc_parser.add_argument("--dry-run", action="store_true")
+    gc_parser.add_argument("--batch-size", type=int, default=5000)
+    subparsers.add_parser("prune", help="expire and evict entries per the CACHE_* settings")
+    train_parser = subparsers.add_parser("train-dict", help="train a zstd dictionary on cached responses")
+    train_parser.add_argument("--out", required=True)
+    train_parser.add_argument("--samples", type=int, default=2000)
+    train_parser.add_argument("--dict-size", type=int, default=112_640)
+    args = parser.parse_args(argv)
+
+    current = get_cache_namespace(MODEL_NAME)
+    if args.command == "fingerprint":
+        _print({"fingerprint": get_cache_fingerprint(), "namespace": current})
+        return 0
+
+    db_pool = init_database_pool()
+    if db_pool is None:
+        print("Error: database unavailable; check DATABASE_URL and CACHE_ENABLED", file=sys.stderr)
+        return 2
+
+    commands = {
+        "list": cmd_list,
+        "count": cmd_count,
+        "gc": cmd_gc,
+        "prune": cmd_prune,
+        "train-dict": cmd_train_dict,
+    }
+    try:
+        return commands[args.command](CacheRepository(db_pool), current, args)
+    finally:
+        close_database_pool()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
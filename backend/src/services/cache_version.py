@@ -0,0 +1,65 @@
+"""
+Version fingerprint for cached evaluations.
+
+A cached response depends on more than the payload and the model name: the
+prompt, the response schema, personas.json and the rule modules that build
+the deterministic sections all shape it. The fingerprint hashes all of them,
+and is computed once per process from the shipped sources (or taken from
+CACHE_FINGERPRINT when a deploy pins it). It is part of the cache namespace,
+so a release that changes any of these inputs never serves results built by
+the previous one.
+"""
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
+from src.config.settings import settings
+from src.services.llm_request import get_llm_request_template
+
+_SRC_ROOT = Path(__file__).resolve().parent.parent
+
+# Everything, besides the LLM request itself, that changes a cached response.
+FINGERPRINTED_SOURCES: List[str] = [
+    "config/personas.json",
+    "models/models.py",
+    "services/canonical_payload.py",
+    "services/current_profile_summary.py",
+    "services/interview_readiness_logic.py",
+    "services/job_descriptions.py",
+    "services/peer_comparison_logic.py",
+    "services/persona_matcher.py",
+    "services/profile_notes_logic.py",
+    "services/quick_wins_logic.py",
+    "services/run_poc.py",
+    "services/scoring_logic.py",
+    "services/timeline_logic.py",
+    "services/tools_logic.py",
+    "utils/label_mappings.py",
+]
+
+# Hex characters of the fingerprint used in namespaces.
+_NAMESPACE_FINGERPRINT_LENGTH = 16
+
+
+def compute_fingerprint() -> str:
+    digest = hashlib.sha256()
+    digest.update(get_llm_request_template().fingerprint.encode("utf-8"))
+    for relative_path in FINGERPRINTED_SOURCES:
+        digest.update(b"\0" + relative_path.encode("utf-8") + b"\0")
+        digest.update((_SRC_ROOT / relative_path).read_bytes())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_cache_fingerprint() -> str:
+    return settings.cache_fingerprint or compute_fingerprint()
+
+
+def get_cache_namespace(model: str) -> str:
+    """Value stored in response_cache.model: the model plus the fingerprint."""
+    return f"{model}:{get_cache_fingerprint()[:_NAMESPACE_FINGERPRINT_LENGTH]}"
+
+
+if __name__ == "__main__":
+    print(compute_fingerprint())
@@ -0,0 +1,205 @@
+"""
+Popularity-driven cache warmup.
+
+Enumerates every payload the quiz can produce (src/services/quiz_space.py),
+ranks them by how often each was requested (request_frequency table), and
+evaluates the top N that are not cached yet, under a requests-per-minute
+limit. Run after a deploy or a cache flush so the most common profiles are
+served from cache instead of paying the cold LLM latency.
+
+Usage (from backend/):
+    python -m src.services.cache_warmup --top 500 [--background tech] \
+        [--rate 60] [--concurrency 4] [--include-unobserved] [--dry-run]
+"""
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.logging_config import get_logger
+from src.repositories.cache_repository import AsyncCacheRepository, CacheRepository
+from src.repositories.connection_pool import close_database_pool, init_database_pool
+from src.repositories.request_frequency_repository import RequestFrequencyRepository
+from src.services.llm_request import close_openai_clients, llm_usage
+from src.services.quiz_space import iter_quiz_payloads
+from src.services.cache_version import get_cache_namespace
+from src.services.canonical_payload import canonical_cache_key, canonical_payload
+from src.services.run_poc import evaluate_and_cache_async
+
+logger = get_logger(__name__)
+
+MODEL_NAME = "gpt-4o"
+
+_CACHE_LOOKUP_CHUNK = 1000
+
+
+class RateLimiter:
+    """Spaces call starts at least 60 / ``per_minute`` seconds apart."""
+
+    def __init__(self, per_minute: float):
+        self._interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_start > now:
+                await asyncio.sleep(self._next_start - now)
+            self._next_start = max(now, self._next_start) + self._interval
+
+
+def rank_payloads(
+    counts: Dict[str, int],
+    top: int,
+    *,
+    background: Optional[str] = None,
+    include_unobserved: bool = False,
+) -> List[Tuple[int, str, Dict[str, Any]]]:
+    """
+    The ``top`` most requested payloads of the quiz space as
+    (request_count, cache_key, payload). Unobserved payloads (count 0) are
+    only used to fill the remaining slots when ``include_unobserved`` is set,
+    in enumeration order.
+    """
+    def candidates():
+        # Quiz labels map 1:1 to option values, so every enumerated payload
+        # already has its own canonical key.
+        for order, payload in enumerate(iter_quiz_payloads(background)):
+            cache_key = canonical_cache_key(payload)
+            count = counts.get(cache_key, 0)
+            if count or include_unobserved:
+                yield count, -order, cache_key, payload
+
+    ranked = heapq.nlargest(top, candidates(), key=lambda item: item[:2])
+    return [(count, cache_key, payload) for count, _, cache_key, payload in ranked]
+
+
+async def _filter_uncached(
+    cache_repo: AsyncCacheRepository,
+    ranked: List[Tuple[int, str, Dict[str, Any]]],
+) -> List[Tuple[int, str, Dict[str, Any]]]:
+    uncached = []
+    for start in range(0, len(ranked), _CACHE_LOOKUP_CHUNK):
+        chunk = ranked[start:start + _CACHE_LOOKUP_CHUNK]
+        cached = await cache_repo.get_many([cache_key for _, cache_key, _ in chunk], get_cache_namespace(MODEL_NAME))
+        uncached.extend(item for item in chunk if item[1] not in cached)
+    return uncached
+
+
+async def run_warmup(
+    *,
+    top: int,
+    background: Optional[str],
+    rate_per_minute: float,
+    concurrency: int,
+    include_unobserved: bool,
+    dry_run: bool,
+) -> Dict[str, Any]:
+    db_pool = await asyncio.to_thread(init_database_pool)
+    if db_pool is None:
+        raise RuntimeError("Cache warmup needs the Postgres cache; check DATABASE_URL and CACHE_ENABLED")
+
+    cache_repo = AsyncCacheRepository(CacheRepository(db_pool))
+    usage_before = llm_usage.snapshot()
+    started = time.perf_counter()
+
+    try:
+        counts = await asyncio.to_thread(RequestFrequencyRepository(db_pool).get_counts, MODEL_NAME)
+        ranked = await asyncio.to_thread(
+            rank_payloads,
+            counts,
+            top,
+            background=background,
+            include_unobserved=include_unobserved,
+        )
+        pending = await _filter_uncached(cache_repo, ranked)
+        logger.info(
+            f"Warmup: {len(ranked)} ranked payloads, {len(ranked) - len(pending)} already cached, "
+            f"{len(pending)} to evaluate"
+        )
+
+        results = {"warmed": 0, "degraded": 0, "failed": 0}
+        if not dry_run:
+            limiter = RateLimiter(rate_per_minute)
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def warm(cache_key: str, payload: Dict[str, Any]) -> None:
+                async with semaphore:
+                    await limiter.wait()
+                    try:
+                        result, _ = await evaluate_and_cache_async(
+                            canonical_payload(payload), cache_key, MODEL_NAME, cache_repo
+                        )
+                        # The LLM circuit breaker was open: answered, but nothing was cached.
+                        if result.degraded:
+                            results["degraded"] += 1
+                        else:
+                            results["warmed"] += 1
+                    except Exception as exc:
+                        results["failed"] += 1
+                        logger.error(f"Warmup failed for key {cache_key[:16]}...: {exc}")
+
+            await asyncio.gather(*(warm(cache_key, payload) for _, cache_key, payload in pending))
+    finally:
+        await close_openai_clients()
+        await asyncio.to_thread(close_database_pool)
+
+    usage_after = llm_usage.snapshot()
+    return {
+        "observed_keys": len(counts),
+        "ranked": len(ranked),
+        "already_cached": len(ranked) - len(pending),
+        "to_warm": len(pending),
+        "requests_covered": sum(count for count, _, _ in ranked),
+        "warmed": results["warmed"],
+        "degraded": results["degraded"],
+        "failed": results["failed"],
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "openai_requests": usage_after["requests"] - usage_before["requests"],
+        "prompt_tokens": usage_after["prompt_tokens"] - usage_before["prompt_tokens"],
+        "completion_tokens": usage_after["completion_tokens"] - usage_before["completion_tokens"],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-populate response_cache for the most requested quiz payloads.")
+    parser.add_argument("--top", type=int, default=500, help="number of payloads to keep warm")
+    parser.add_argument("--background", choices=["tech", "non-tech"], default=None)
+    parser.add_argument("--rate", type=float, default=60.0, help="max OpenAI calls per minute")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--include-unobserved",
+        action="store_true",
+        help="fill remaining slots with never-requested payloads",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="rank and report without calling OpenAI")
+    args = parser.parse_args(argv)
+
+    if not args.dry_run and not os.environ.get("OPENAI_API_KEY"):
+        print(
+            "Error: OPENAI_API_KEY is not set. Set it in your environment and re-run.",
+            file=sys.stderr,
+        )
+        return 2
+
+    report = asyncio.run(
+        run_warmup(
+            top=args.top,
+            background=args.background,
+            rate_per_minute=args.rate,
+            concurrency=args.concurrency,
+            include_unobserved=args.include_unobserved,
+            dry_run=args.dry_run,
+        )
+    )
+    print(json.dumps(report, indent=2))
+    return 0 if report["failed"] == 0 and report["degraded"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+"""
+Canonical form of an evaluation payload.
+
+Only some payload fields change the evaluation. The rest are display-only:
+
+- quizResponses.primaryGoal: already carried by requirementType.
+- goals.targetCompany: free text that the frontend defaults to 'Not specified'.
+- the order of goals.requirementType / goals.topicOfInterest.
+
+Two requests that differ only in those fields map to the same ordered feature
+tuple, and so to the same cache key and the same LLM input.
+
+currentRoleLabel / targetRoleLabel / targetCompanyLabel are features: the
+rule modules and the prompt prefer the frontend's labels over the ones in
+src/utils/label_mappings.py, and the two sets differ. The frontend derives
+each label from its option value, so they do not add keys in practice.
+
+Key-space report (from backend/):
+    python -m src.services.canonical_payload [payloads.jsonl]
+"""
+import hashlib
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+KEY_VERSION = "canonical-v2"
+
+QUIZ_FEATURES: Tuple[str, ...] = (
+    "currentRole",
+    "experience",
+    "targetRole",
+    "problemSolving",
+    "systemDesign",
+    "portfolio",
+    "mockInterviews",
+    "currentCompany",
+    "currentSkill",
+    "requirementType",
+    "targetCompany",
+    "currentRoleLabel",
+    "targetRoleLabel",
+    "targetCompanyLabel",
+)
+
+# Order-insensitive: stored sorted and de-duplicated.
+GOAL_LIST_FEATURES: Tuple[str, ...] = ("requirementType", "topicOfInterest")
+
+
+def canonical_features(payload: Dict[str, Any]) -> Tuple[Any, ...]:
+    """(background, *QUIZ_FEATURES values, *sorted GOAL_LIST_FEATURES lists)."""
+    quiz_responses = payload.get("quizResponses") or {}
+    goals = payload.get("goals") or {}
+    return (
+        payload.get("background"),
+        *(quiz_responses.get(field) for field in QUIZ_FEATURES),
+        *(tuple(sorted(set(goals.get(field) or []))) for field in GOAL_LIST_FEATURES),
+    )
+
+
+def canonical_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """The payload rebuilt from its features; this is what the rules and the LLM see."""
+    features = canonical_features(payload)
+    quiz_values = features[1:1 + len(QUIZ_FEATURES)]
+    goal_values = features[1 + len(QUIZ_FEATURES):]
+    return {
+        "background": features[0],
+        # Absent fields stay absent so the rule modules fall back to their defaults.
+        "quizResponses": {
+            field: value for field, value in zip(QUIZ_FEATURES, quiz_values) if value is not None
+        },
+        "goals": {field: list(value) for field, value in zip(GOAL_LIST_FEATURES, goal_values)},
+    }
+
+
+def canonical_cache_key(payload: Dict[str, Any]) -> str:
+    serialized = json.dumps([KEY_VERSION, *canonical_features(payload)], separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def key_space_report(payloads: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Distinct cache keys before (whole-payload hash) and after canonicalization."""
+    from src.repositories.cache_repository import CacheRepository
+
+    total = 0
+    raw_keys = set()
+    canonical_keys = set()
+    for payload in payloads:
+        total += 1
+        raw_keys.add(CacheRepository.generate_cache_key(payload, "gpt-4o"))
+        canonical_keys.add(canonical_cache_key(payload))
+
+    return {
+        "payloads": total,
+        "distinct_raw_keys": len(raw_keys),
+        "distinct_canonical_keys": len(canonical_keys),
+        "shrink_ratio": round(len(canonical_keys) / len(raw_keys), 4) if raw_keys else 1.0,
+    }
+
+
+def _read_jsonl(path: str) -> Iterable[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if args:
+        payloads = _read_jsonl(args[0])
+    else:
+        from src.services.quiz_space import iter_quiz_payloads
+
+        payloads = iter_quiz_payloads()
+
+    print(json.dumps(key_space_report(payloads), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
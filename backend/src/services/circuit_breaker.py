@@ -0,0 +1,178 @@
+"""
+Circuit breaker for the OpenAI chat.completions call.
+
+Every attempt is recorded with its outcome and latency. While the breaker is
+closed, it opens once the last LLM_BREAKER_WINDOW seconds hold at least
+LLM_BREAKER_MIN_CALLS calls and either the failure rate reaches
+LLM_BREAKER_FAILURE_RATE or the share of calls slower than
+LLM_BREAKER_SLOW_CALL_SECONDS reaches LLM_BREAKER_SLOW_CALL_RATE. An open
+breaker rejects calls immediately (LLMUnavailable) for LLM_BREAKER_OPEN_SECONDS,
+then lets a single probe through (half-open): a fast success closes it again,
+anything else re-opens it.
+
+The state is per process; every process detects an outage on its own traffic.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from src.config.logging_config import get_logger
+from src.config.metrics import LLM_BREAKER_STATE, LLM_BREAKER_TRANSITIONS
+from src.config.settings import settings
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class LLMUnavailable(RuntimeError):
+    """The circuit breaker is open: the LLM is not called."""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        window: float,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_seconds: float,
+        slow_call_rate: float,
+        open_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        # (finished at, failed, slow) per call in the window.
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()
+        self._rejected = 0
+        LLM_BREAKER_STATE.set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def _transition(self, state: str, reason: str) -> None:
+        self._state = state
+        self._probe_started = None
+        if state == OPEN:
+            self._opened_at = self._clock()
+        if state == CLOSED:
+            self._calls.clear()
+        LLM_BREAKER_STATE.set(_STATE_VALUES[state])
+        LLM_BREAKER_TRANSITIONS.labels(state).inc()
+        if state == CLOSED:
+            logger.info(f"✅ Circuit breaker {self.name} closed ({reason})")
+        else:
+            logger.warning(f"⚡ Circuit breaker {self.name} {state.replace('_', '-')} ({reason})")
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead; a caller that gets True must record its outcome."""
+        with self._lock:
+            now = self._clock()
+            if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+                self._transition(HALF_OPEN, f"probing after {self.open_seconds:.0f}s")
+            if self._state == HALF_OPEN:
+                # One probe at a time; a probe that never reported back (its
+                # caller was cancelled) is given up after open_seconds.
+                if self._probe_started is None or now - self._probe_started >= self.open_seconds:
+                    self._probe_started = now
+                    return True
+            elif self._state == CLOSED:
+                return True
+            self._rejected += 1
+            return False
+
+    def release(self) -> None:
+        """
+        A call that allow() let through was not made after all (e.g. it got no
+        OpenAI quota): it records no outcome, and a half-open breaker lets the
+        next caller probe instead of waiting for the probe to time out.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_started = None
+
+    def record_success(self, duration: float) -> None:
+        self._record(False, duration)
+
+    def record_failure(self, duration: float) -> None:
+        self._record(True, duration)
+
+    def _record(self, failed: bool, duration: float) -> None:
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            now = self._clock()
+            if self._state == HALF_OPEN:
+                if failed or slow:
+                    self._transition(OPEN, "probe " + ("failed" if failed else f"took {duration:.1f}s"))
+                else:
+                    self._transition(CLOSED, "probe succeeded")
+                return
+            if self._state == OPEN:
+                # A call that started before the breaker opened.
+                return
+
+            self._calls.append((now, failed, slow))
+            while self._calls and self._calls[0][0] < now - self.window:
+                self._calls.popleft()
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for _, call_failed, _ in self._calls if call_failed)
+            slow_calls = sum(1 for _, _, call_slow in self._calls if call_slow)
+            if failures / total >= self.failure_rate:
+                self._transition(OPEN, f"{failures}/{total} calls failed in {self.window:.0f}s")
+            elif slow_calls / total >= self.slow_call_rate:
+                self._transition(
+                    OPEN, f"{slow_calls}/{total} calls slower than {self.slow_call_seconds:.0f}s"
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state,
+                "calls_in_window": len(self._calls),
+                "failures_in_window": sum(1 for _, failed, _ in self._calls if failed),
+                "slow_calls_in_window": sum(1 for _, _, slow in self._calls if slow),
+                "rejected": self._rejected,
+            }
+
+
+_breaker: Optional[CircuitBreaker] = None
+_breaker_lock = threading.Lock()
+
+
+def get_llm_circuit_breaker() -> Optional[CircuitBreaker]:
+    """The process-wide OpenAI breaker, or None when LLM_BREAKER_ENABLED is off."""
+    global _breaker
+    if not settings.llm_breaker_enabled:
+        return None
+    with _breaker_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(
+                "openai",
+                window=settings.llm_breaker_window,
+                min_calls=settings.llm_breaker_min_calls,
+                failure_rate=settings.llm_breaker_failure_rate,
+                slow_call_seconds=settings.llm_breaker_slow_call_seconds,
+                slow_call_rate=settings.llm_breaker_slow_call_rate,
+                open_seconds=settings.llm_breaker_open_seconds,
+            )
+        return _breaker
@@ -0,0 +1,245 @@
+"""
+Worker for asynchronous evaluation jobs (POST /evaluate/jobs).
+
+Claims jobs from the evaluation_jobs table (FOR UPDATE SKIP LOCKED, so any
+number of worker processes can share the queue without two of them taking
+the same job), evaluates each through the normal pipeline (cache, single
+flight, LLM) and stores the result on the job. Failed attempts are queued
+again up to JOB_MAX_ATTEMPTS. A worker renews the lease (JOB_LEASE_SECONDS)
+on each job every third of the lease while it evaluates it; a job whose
+worker died is claimed again once its lease has expired. A degraded result (the OpenAI
+circuit breaker was open) is a failed attempt too, retried once the breaker
+probes OpenAI again (LLM_BREAKER_OPEN_SECONDS). Finished jobs older than
+JOB_RETENTION seconds are deleted.
+
+Usage (from backend/):
+    python -m src.services.evaluation_worker [--concurrency 4] [--poll-interval 1.0] [--drain]
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+import uuid
+from typing import Any, Dict, List, Optional
+
+from src.config.logging_config import get_logger, setup_logging
+from src.config.settings import settings
+from src.repositories.cache_repository import AsyncCacheRepository, CacheRepository, cache_access
+from src.repositories.cache_invalidation import listen_for_invalidations
+from src.repositories.connection_pool import close_database_pool, init_database_pool
+from src.repositories.job_repository import JobRepository
+from src.repositories.memory_cache import get_l1_cache
+from src.repositories.request_frequency_repository import RequestFrequencyRepository, request_frequency
+from src.services.llm_request import close_openai_clients
+from src.services.run_poc import run_poc_json_async
+
+logger = get_logger(__name__)
+
+# How often an idle worker deletes expired finished jobs.
+_RETENTION_INTERVAL = 3600.0
+
+# Leases are renewed this many times per JOB_LEASE_SECONDS, so one slow or
+# failed renewal does not let another worker take a job still being evaluated.
+_LEASE_RENEWALS_PER_LEASE = 3
+
+
+def _error_detail(exc: Exception) -> str:
+    # Same policy as the API: configuration/LLM errors are shown, anything
+    # unexpected only in the logs.
+    if isinstance(exc, RuntimeError):
+        return str(exc)
+    return "Failed to generate evaluation. Check server logs for details."
+
+
+async def _renew_lease(job_repository: JobRepository, job_id: str, worker_id: str) -> None:
+    """Heartbeat for a job in hand; stops once the lease has been taken over."""
+    lease_seconds = settings.job_lease_seconds
+    while True:
+        await asyncio.sleep(lease_seconds / _LEASE_RENEWALS_PER_LEASE)
+        try:
+            renewed = await asyncio.to_thread(job_repository.renew_lease, job_id, worker_id, lease_seconds)
+        except Exception as exc:
+            logger.warning(f"Lease renewal failed for job {job_id}: {exc}")
+            continue
+        if not renewed:
+            logger.warning(f"⚠️ Job {job_id} lease was taken over; no longer renewing it")
+            return
+
+
+async def run_job(
+    job: Dict[str, Any],
+    job_repository: JobRepository,
+    cache_repository: AsyncCacheRepository,
+    worker_id: str,
+) -> str:
+    """Evaluate one claimed job and record the outcome; returns its new status."""
+    job_id = job["id"]
+    if job["attempts"] > settings.job_max_attempts:
+        # Only reachable through expired leases: the worker died every time.
+        status = await asyncio.to_thread(
+            job_repository.fail, job_id, worker_id, "Job was abandoned too many times", 0
+        )
+        logger.error(f"❌ Job {job_id} abandoned after {job['attempts'] - 1} attempts")
+        return status or "lost"
+
+    logger.info(f"🛠️ Job {job_id} started (attempt {job['attempts']})")
+    heartbeat = asyncio.create_task(_renew_lease(job_repository, job_id, worker_id))
+    try:
+        _, result_json, degraded = await run_poc_json_async(
+            input_payload=job["payload"],
+            cache_repository=cache_repository,
+        )
+    except Exception as exc:
+        logger.exception(f"Job {job_id} failed")
+        status = await asyncio.to_thread(
+            job_repository.fail, job_id, worker_id, _error_detail(exc), settings.job_max_attempts
+        )
+        return status or "lost"
+    finally:
+        heartbeat.cancel()
+        try:
+            await heartbeat
+        except asyncio.CancelledError:
+            pass
+
+    if degraded:
+        # Rule-based fallbacks are not a final answer: try again once the
+        # breaker lets calls through, not straight back into the open breaker.
+        status = await asyncio.to_thread(
+            job_repository.fail,
+            job_id,
+            worker_id,
+            "OpenAI is unavailable; the evaluation could not be completed",
+            settings.job_max_attempts,
+            settings.llm_breaker_open_seconds,
+        )
+        logger.warning(f"⚡ Job {job_id} got a degraded result; {status or 'lost'}")
+        return status or "lost"
+
+    if not await asyncio.to_thread(job_repository.complete, job_id, worker_id, result_json):
+        logger.warning(f"⚠️ Job {job_id} finished after its lease was taken over; result discarded")
+        return "lost"
+    logger.info(f"✅ Job {job_id} done")
+    return "done"
+
+
+async def _work_loop(
+    job_repository: JobRepository,
+    cache_repository: AsyncCacheRepository,
+    worker_id: str,
+    poll_interval: float,
+    stop: asyncio.Event,
+    drain: bool,
+    report: Dict[str, int],
+) -> None:
+    while not stop.is_set():
+        try:
+            job = await asyncio.to_thread(job_repository.claim, worker_id, settings.job_lease_seconds)
+        except Exception as exc:
+            logger.warning(f"Job claim failed: {exc}")
+            job = None
+
+        if job is None:
+            if drain:
+                return
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        status = await run_job(job, job_repository, cache_repository, worker_id)
+        report[status] = report.get(status, 0) + 1
+
+
+async def _delete_expired_jobs(job_repository: JobRepository) -> None:
+    while True:
+        try:
+            deleted = await asyncio.to_thread(job_repository.delete_finished, settings.job_retention)
+            if deleted:
+                logger.info(f"🧹 Deleted {deleted} finished jobs older than {settings.job_retention:.0f}s")
+        except Exception as exc:
+            logger.warning(f"Job cleanup failed: {exc}")
+        await asyncio.sleep(_RETENTION_INTERVAL)
+
+
+async def run_worker(concurrency: int, poll_interval: float, drain: bool = False) -> Dict[str, Any]:
+    db_pool = await asyncio.to_thread(init_database_pool)
+    if db_pool is None:
+        raise RuntimeError("Postgres is unavailable (is CACHE_ENABLED set and DATABASE_URL reachable?)")
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    job_repository = JobRepository(db_pool)
+    cache_repository = AsyncCacheRepository(CacheRepository(db_pool))
+    report: Dict[str, Any] = {"worker_id": worker_id}
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        # Finish the jobs in hand, claim no new ones.
+        loop.add_signal_handler(signum, stop.set)
+
+    background_tasks = [
+        asyncio.create_task(
+            request_frequency.run_periodic_flush(
+                RequestFrequencyRepository(db_pool).increment_many,
+                settings.request_frequency_flush_interval,
+            )
+        ),
+        asyncio.create_task(
+            cache_access.run_periodic_flush(
+                CacheRepository(db_pool).record_hits,
+                settings.cache_access_flush_interval,
+            )
+        ),
+        asyncio.create_task(_delete_expired_jobs(job_repository)),
+    ]
+    l1_cache = get_l1_cache()
+    if l1_cache is not None:
+        background_tasks.append(asyncio.create_task(listen_for_invalidations(l1_cache)))
+    logger.info(f"👷 Evaluation worker {worker_id} started with {concurrency} slots")
+    try:
+        await asyncio.gather(*(
+            _work_loop(job_repository, cache_repository, worker_id, poll_interval, stop, drain, report)
+            for _ in range(concurrency)
+        ))
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        for task in background_tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await close_openai_clients()
+        await asyncio.to_thread(close_database_pool)
+    logger.info(f"👷 Evaluation worker {worker_id} stopped")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Process queued evaluation jobs.")
+    parser.add_argument("--concurrency", type=int, default=4, help="jobs evaluated at the same time")
+    parser.add_argument("--poll-interval", type=float, default=None, help="seconds between polls of an empty queue")
+    parser.add_argument("--drain", action="store_true", help="exit once the queue is empty")
+    args = parser.parse_args(argv)
+
+    if not os.environ.get("OPENAI_API_KEY"):
+        print(
+            "Error: OPENAI_API_KEY is not set. Set it in your environment and re-run.",
+            file=sys.stderr,
+        )
+        return 2
+
+    setup_logging()
+    poll_interval = args.poll_interval if args.poll_interval is not None else settings.job_poll_interval
+    report = asyncio.run(run_worker(args.concurrency, poll_interval, args.drain))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
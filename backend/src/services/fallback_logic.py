@@ -0,0 +1,240 @@
+"""
+Rule-based stand-ins for the LLM-written sections of an evaluation.
+
+Used when the OpenAI circuit breaker is open: skill analysis, experience
+benchmark, technical notes, peer comparison, success likelihood and badges
+are derived from the quiz answers and the calculated scores instead, in the
+shape of FullProfileEvaluationResponseRaw, so the normal deterministic
+overlay turns them into a complete (degraded) response.
+"""
+from typing import Any, Dict, List
+
+from src.utils.label_mappings import (
+    get_company_label,
+    get_current_role_label,
+    get_problem_solving_label,
+    get_role_label,
+)
+
+_EXPERIENCE_RANK = {"0": 0, "0-2": 1, "2-3": 2, "3-5": 3, "5+": 4, "5-8": 4, "8+": 5}
+
+# Experience a target role usually asks for in the Indian market.
+_TYPICAL_EXPERIENCE_BY_TARGET_ROLE = {
+    "senior-backend": "5-8",
+    "senior-fullstack": "5-8",
+    "tech-lead": "8+",
+    "backend-sde": "3-5",
+    "fullstack-sde": "3-5",
+    "frontend-sde": "3-5",
+    "data-ml": "3-5",
+    "devops-sre": "3-5",
+    "mobile-dev": "3-5",
+}
+
+_UNDECIDED_TARGET_ROLES = ("not-sure", "exploring")
+_ACTIVE_PROBLEM_SOLVING = ("51-100", "100+")
+_SENIOR_EXPERIENCE = ("3-5", "5+", "5-8", "8+")
+
+
+def _first_unique(items: List[str], limit: int) -> List[str]:
+    seen = []
+    for item in items:
+        if item not in seen:
+            seen.append(item)
+    return seen[:limit]
+
+
+def _typical_experience(background: str, target_role: str) -> str:
+    if background == "non-tech":
+        # Career switchers compete for entry-level openings.
+        return "0-2"
+    return _TYPICAL_EXPERIENCE_BY_TARGET_ROLE.get(target_role, "3-5")
+
+
+def _skill_analysis(background: str, quiz_responses: Dict[str, Any], role_label: str, company_label: str) -> Dict[str, List[str]]:
+    experience = quiz_responses.get("experience", "0-2")
+    problem_solving = quiz_responses.get("problemSolving", "0-10")
+    system_design = quiz_responses.get("systemDesign", "not-yet")
+    portfolio = quiz_responses.get("portfolio", "none")
+    # Like the other rule modules: the frontend's label (kept by
+    # canonical_payload), else the one from label_mappings.
+    current_role_label = quiz_responses.get("currentRoleLabel") or get_current_role_label(
+        quiz_responses.get("currentRole", "")
+    )
+
+    strengths: List[str] = []
+    areas: List[str] = []
+
+    if background == "non-tech":
+        strengths.append(f"Domain experience from {current_role_label}")
+        if problem_solving in _ACTIVE_PROBLEM_SOLVING + ("11-50",):
+            strengths.append(f"Early coding practice: {get_problem_solving_label(problem_solving)}")
+        if _EXPERIENCE_RANK.get(experience, 0) >= 3:
+            strengths.append(f"{experience} years of professional experience and work discipline")
+        strengths += [
+            f"Clear intent to move into {role_label} roles",
+            "Transferable communication and stakeholder skills",
+        ]
+
+        areas += [
+            "Programming fundamentals in one language (e.g. Python or JavaScript)",
+            "Data structures and algorithms basics",
+            f"2-3 portfolio projects in the {role_label} stack",
+        ]
+        if problem_solving == "0-10":
+            areas.insert(0, "Regular coding practice (start with 30-50 easy problems)")
+        areas.append(f"Interview preparation for {company_label}")
+    else:
+        if problem_solving in _ACTIVE_PROBLEM_SOLVING:
+            strengths.append(f"Consistent coding practice: {get_problem_solving_label(problem_solving)}")
+        if system_design == "multiple":
+            strengths.append("Hands-on system design experience (led design discussions)")
+        elif system_design == "once":
+            strengths.append("Exposure to real system design discussions")
+        if portfolio == "active-5+":
+            strengths.append("Active public portfolio with 5+ repositories")
+        if experience in _SENIOR_EXPERIENCE:
+            strengths.append(f"{experience} years of professional software experience")
+        strengths += [
+            f"Industry experience as {current_role_label}",
+            f"Clear target: {role_label} at {company_label}",
+            "Already working in a technical role",
+        ]
+
+        if problem_solving in ("0-10", "11-50"):
+            areas.append(f"Coding interview practice: aim for 100+ problems (currently {problem_solving})")
+        if system_design in ("not-yet", "learning"):
+            if experience in _SENIOR_EXPERIENCE:
+                areas.append("System design depth for senior-level interviews")
+            else:
+                areas.append("System design fundamentals")
+        if portfolio in ("none", "inactive"):
+            areas.append("A public portfolio of recent projects")
+        elif portfolio in ("limited-1-5", "limited-1to5"):
+            areas.append("Expand the portfolio to 5+ quality projects")
+        if quiz_responses.get("mockInterviews", "never") in ("never", "rarely"):
+            areas.append("Timed mock interviews")
+        areas += [
+            f"Interview preparation for {company_label}",
+            "Behavioral interview stories (STAR format)",
+            f"Depth in {role_label} fundamentals",
+        ]
+
+    return {
+        "strengths": _first_unique(strengths, 5),
+        "areas_to_develop": _first_unique(areas, 5),
+    }
+
+
+def _experience_benchmark(background: str, quiz_responses: Dict[str, Any], role_label: str) -> Dict[str, str]:
+    experience = quiz_responses.get("experience", "0-2")
+    typical = _typical_experience(background, quiz_responses.get("targetRole", ""))
+    if background == "non-tech":
+        gap_analysis = (
+            f"Your {experience} years are outside software; {role_label} roles typically start at {typical} "
+            "years of hands-on development, so projects and coding fundamentals carry the most weight."
+        )
+    elif _EXPERIENCE_RANK.get(experience, 0) >= _EXPERIENCE_RANK[typical]:
+        gap_analysis = (
+            f"Your {experience} years meet the {typical} years typical for {role_label} roles; "
+            "the remaining gap is interview preparation rather than tenure."
+        )
+    else:
+        gap_analysis = (
+            f"{role_label} roles typically ask for {typical} years against your {experience}; "
+            "strong projects and interview preparation can offset part of the gap."
+        )
+    return {
+        "your_experience_years": experience,
+        "typical_for_target_role_years": typical,
+        "gap_analysis": gap_analysis,
+    }
+
+
+def _technical_notes(quiz_responses: Dict[str, Any], technical_percent: int, company_label: str) -> str:
+    if technical_percent >= 75:
+        return (
+            f"Technical readiness of {technical_percent}% reflects solid coding practice. "
+            f"Keep it sharp with timed mock interviews before {company_label} interviews."
+        )
+    if technical_percent >= 50:
+        return (
+            f"Technical readiness of {technical_percent}% is a workable base. A steady problem-solving "
+            f"routine and system design practice close most of the gap for {company_label} interviews."
+        )
+    return (
+        f"Technical readiness of {technical_percent}% is the main gap. Start with daily problem-solving "
+        f"({quiz_responses.get('problemSolving', '0-10')} problems so far) before targeting {company_label}."
+    )
+
+
+def _badges(background: str, quiz_responses: Dict[str, Any]) -> List[str]:
+    problem_solving = quiz_responses.get("problemSolving", "0-10")
+    badges: List[str] = []
+    if background == "non-tech":
+        badges.append("Career Switcher")
+        if problem_solving in _ACTIVE_PROBLEM_SOLVING:
+            badges.append("Coding Momentum")
+    else:
+        if problem_solving == "100+":
+            badges.append("Consistent Problem Solver")
+        if quiz_responses.get("systemDesign") == "multiple":
+            badges.append("System Design Leader")
+        if quiz_responses.get("portfolio") == "active-5+":
+            badges.append("Active Builder")
+        if quiz_responses.get("experience") in ("5-8", "8+"):
+            badges.append("Seasoned Engineer")
+    if problem_solving == "0-10":
+        badges.append("Needs Coding Practice")
+    return badges
+
+
+def generate_fallback_llm_sections(
+    background: str,
+    quiz_responses: Dict[str, Any],
+    score: int,
+    interview_readiness: Dict[str, Any],
+    target_company_label: str,
+) -> Dict[str, Any]:
+    """The LLM-written sections, derived by rules; shaped like FullProfileEvaluationResponseRaw."""
+    target_role = quiz_responses.get("targetRole", "")
+    if target_role in _UNDECIDED_TARGET_ROLES:
+        role_label = "entry-level engineering"
+    else:
+        # Frontend label first, as for currentRoleLabel in _skill_analysis.
+        role_label = quiz_responses.get("targetRoleLabel") or get_role_label(target_role)
+    company_label = target_company_label or get_company_label(quiz_responses.get("targetCompany", ""))
+    technical_percent = interview_readiness["technical_interview_percent"]
+
+    # Kept inside the ranges the LLM is given for the same scores.
+    percentile = max(35, score)
+    success_percent = max(score - 10, min(score + 5, (score + technical_percent) // 2))
+    if success_percent >= 70:
+        success_notes = f"Your profile and preparation put {company_label} within reach; focus on the areas to develop above."
+    elif success_percent >= 50:
+        success_notes = f"A realistic goal for {company_label} with a few months of focused work on the areas to develop."
+    else:
+        success_notes = f"Build fundamentals first; {company_label} becomes realistic once the areas to develop are addressed."
+
+    return {
+        "profile_evaluation": {
+            "skill_analysis": _skill_analysis(background, quiz_responses, role_label, company_label),
+            "experience_benchmark": _experience_benchmark(background, quiz_responses, role_label),
+            "interview_readiness": {
+                "technical_notes": _technical_notes(quiz_responses, technical_percent, company_label),
+            },
+            "peer_comparison": {
+                "percentile": percentile,
+                "summary": (
+                    f"Based on your profile strength of {score}/100, you rank ahead of about "
+                    f"{percentile}% of similar profiles targeting {company_label}."
+                ),
+                "metrics": {"better_than_peers_percent": percentile},
+            },
+            "success_likelihood": {
+                "score_percent": success_percent,
+                "notes": success_notes,
+            },
+            "badges": _badges(background, quiz_responses),
+        }
+    }
@@ -0,0 +1,295 @@
+"""
+Admission control for OpenAI calls: shared requests-per-minute and
+tokens-per-minute token buckets.
+
+Every chat.completions attempt first takes one request and its estimated
+tokens (prompt + schema + OPENAI_COMPLETION_TOKEN_ESTIMATE) from the
+buckets of its model. The buckets live in the llm_rate_limit table, so the
+API and all worker processes draw from one quota; a row lock makes each
+take atomic. Within a process callers wait in FIFO order (only the head of
+the queue polls the buckets) and give up with LLMAdmissionTimeout once
+they would wait longer than OPENAI_ADMISSION_MAX_WAIT. A 429 from OpenAI
+empties the request bucket, so every process backs off together instead of
+retrying into the burst.
+
+Enabled when OPENAI_RPM_LIMIT and/or OPENAI_TPM_LIMIT is set. Without
+Postgres the buckets are process-local.
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.logging_config import get_logger
+from src.config.metrics import LLM_ADMISSION_QUEUE, LLM_ADMISSION_WAIT_SECONDS, LLM_ADMISSIONS
+from src.config.settings import settings
+from src.repositories.connection_pool import get_database_pool
+
+logger = get_logger(__name__)
+
+# Bucket levels: (requests, tokens).
+Levels = Tuple[float, float]
+
+# Heads of the queues in different processes would otherwise all poll the
+# buckets at the same instant once they refill.
+_POLL_JITTER = 0.1
+
+
+class LLMAdmissionTimeout(RuntimeError):
+    """The OpenAI quota would not admit the call within the maximum wait."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_tokens(messages: List[Dict[str, Any]], response_format: Dict[str, Any]) -> int:
+    """Rough token count of a request (4 characters per token) plus the expected completion."""
+    characters = sum(len(message.get("content") or "") for message in messages)
+    characters += len(json.dumps(response_format, separators=(",", ":")))
+    return characters // 4 + settings.openai_completion_token_estimate
+
+
+def _take(
+    levels: Levels,
+    elapsed: float,
+    rpm: Optional[int],
+    tpm: Optional[int],
+    tokens: int,
+) -> Tuple[Levels, float]:
+    """
+    Refill both buckets for ``elapsed`` seconds and take one request and
+    ``tokens`` from them. Returns the new levels and 0, or the unchanged
+    (refilled) levels and the seconds until both buckets can cover the take.
+    Each bucket holds at most one minute of quota; an unset limit is unlimited.
+    """
+    requests, available_tokens = levels
+    wait = 0.0
+    if rpm:
+        requests = min(float(rpm), requests + elapsed * rpm / 60.0)
+        if requests < 1:
+            wait = max(wait, (1 - requests) * 60.0 / rpm)
+    if tpm:
+        tokens = min(tokens, tpm)
+        available_tokens = min(float(tpm), available_tokens + elapsed * tpm / 60.0)
+        if available_tokens < tokens:
+            wait = max(wait, (tokens - available_tokens) * 60.0 / tpm)
+    if wait > 0:
+        return (requests, available_tokens), wait
+    return (requests - 1 if rpm else requests, available_tokens - tokens if tpm else available_tokens), 0.0
+
+
+class LocalBuckets:
+    """Per-process buckets; used when Postgres is unavailable."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[Levels, float]] = {}
+        self._lock = threading.Lock()
+
+    def try_take(self, name: str, rpm: Optional[int], tpm: Optional[int], tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            levels, updated = self._buckets.get(name, ((float(rpm or 0), float(tpm or 0)), now))
+            levels, wait = _take(levels, now - updated, rpm, tpm, tokens)
+            self._buckets[name] = (levels, now)
+            return wait
+
+    def drain(self, name: str) -> None:
+        with self._lock:
+            levels, _ = self._buckets.get(name, ((0.0, 0.0), 0.0))
+            self._buckets[name] = ((0.0, levels[1]), time.monotonic())
+
+
+class PostgresBuckets:
+    """Buckets in the llm_rate_limit table, shared by every process."""
+
+    def try_take(self, name: str, rpm: Optional[int], tpm: Optional[int], tokens: int) -> Optional[float]:
+        """Seconds to wait (0 if taken), or None when Postgres is unavailable."""
+        pool_instance = get_database_pool()
+        if pool_instance is None:
+            return None
+
+        with pool_instance.connection() as conn:
+            with conn.cursor() as cur:
+                # The row lock serializes takes across processes; the clock is
+                # the database's, so every process sees the same elapsed time.
+                select = """
+                    SELECT requests, tokens, EXTRACT(EPOCH FROM clock_timestamp() - updated_at), clock_timestamp()
+                    FROM llm_rate_limit WHERE name = %s FOR UPDATE
+                """
+                cur.execute(select, (name,))
+                row = cur.fetchone()
+                if row is None:
+                    cur.execute(
+                        "INSERT INTO llm_rate_limit (name, requests, tokens) VALUES (%s, %s, %s) "
+                        "ON CONFLICT (name) DO NOTHING",
+                        (name, float(rpm or 0), float(tpm or 0)),
+                    )
+                    cur.execute(select, (name,))
+                    row = cur.fetchone()
+
+                requests, available_tokens, elapsed, now = row
+                levels, wait = _take((requests, available_tokens), max(0.0, float(elapsed)), rpm, tpm, tokens)
+                cur.execute(
+                    "UPDATE llm_rate_limit SET requests = %s, tokens = %s, updated_at = %s WHERE name = %s",
+                    (levels[0], levels[1], now, name),
+                )
+        return wait
+
+    def drain(self, name: str) -> bool:
+        pool_instance = get_database_pool()
+        if pool_instance is None:
+            return False
+
+        with pool_instance.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE llm_rate_limit
+                    SET requests = 0,
+                        tokens = tokens + EXTRACT(EPOCH FROM clock_timestamp() - updated_at) * %s / 60.0,
+                        updated_at = clock_timestamp()
+                    WHERE name = %s
+                    """,
+                    (float(settings.openai_tpm_limit or 0), name),
+                )
+        return True
+
+
+class LLMAdmission:
+    def __init__(
+        self,
+        rpm: Optional[int],
+        tpm: Optional[int],
+        max_wait: float,
+        shared: Optional[PostgresBuckets] = None,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_wait = max_wait
+        self._shared = shared if shared is not None else PostgresBuckets()
+        self._local = LocalBuckets()
+        # Drains the shared bucket after a 429 without holding up the caller.
+        self._drainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-admission-drain")
+        self._thread_lock = threading.Lock()
+        self._async_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _try_take(self, model: str, tokens: int) -> float:
+        try:
+            wait = self._shared.try_take(model, self.rpm, self.tpm, tokens)
+        except Exception as exc:
+            logger.warning(f"Shared OpenAI rate limit unavailable, using the local one: {exc}")
+            wait = None
+        if wait is None:
+            wait = self._local.try_take(model, self.rpm, self.tpm, tokens)
+        return wait
+
+    def _timeout(self, model: str, tokens: int, started: float, retry_after: float) -> LLMAdmissionTimeout:
+        LLM_ADMISSIONS.labels("timeout").inc()
+        LLM_ADMISSION_WAIT_SECONDS.observe(time.monotonic() - started)
+        logger.warning(f"⏳ OpenAI admission timed out for {model} ({tokens} tokens)")
+        return LLMAdmissionTimeout(
+            f"OpenAI rate limit: no capacity for {model} within {self.max_wait:.0f}s; try again later",
+            retry_after,
+        )
+
+    def _admitted(self, started: float) -> float:
+        waited = time.monotonic() - started
+        LLM_ADMISSIONS.labels("admitted").inc()
+        LLM_ADMISSION_WAIT_SECONDS.observe(waited)
+        return waited
+
+    def acquire(self, model: str, tokens: int) -> float:
+        """Block until the call is admitted; returns the seconds waited."""
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        LLM_ADMISSION_QUEUE.inc()
+        try:
+            if not self._thread_lock.acquire(timeout=self.max_wait):
+                raise self._timeout(model, tokens, started, self.max_wait)
+            try:
+                while True:
+                    wait = self._try_take(model, tokens)
+                    if wait <= 0:
+                        return self._admitted(started)
+                    if time.monotonic() + wait > deadline:
+                        raise self._timeout(model, tokens, started, wait)
+                    time.sleep(wait + random.uniform(0, _POLL_JITTER))
+            finally:
+                self._thread_lock.release()
+        finally:
+            LLM_ADMISSION_QUEUE.dec()
+
+    def _async_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._async_locks.get(loop)
+        if lock is None:
+            lock = self._async_locks[loop] = asyncio.Lock()
+        return lock
+
+    async def acquire_async(self, model: str, tokens: int) -> float:
+        """Async acquire(); waiters are admitted in arrival order."""
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        lock = self._async_lock()
+        LLM_ADMISSION_QUEUE.inc()
+        try:
+            try:
+                await asyncio.wait_for(lock.acquire(), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                raise self._timeout(model, tokens, started, self.max_wait) from None
+            try:
+                while True:
+                    wait = await asyncio.to_thread(self._try_take, model, tokens)
+                    if wait <= 0:
+                        return self._admitted(started)
+                    if time.monotonic() + wait > deadline:
+                        raise self._timeout(model, tokens, started, wait)
+                    await asyncio.sleep(wait + random.uniform(0, _POLL_JITTER))
+            finally:
+                lock.release()
+        finally:
+            LLM_ADMISSION_QUEUE.dec()
+
+    def on_rate_limited(self, model: str) -> None:
+        """
+        OpenAI answered 429: empty the request bucket for every process.
+
+        Never blocks, so sync and async callers can both call it inline: the
+        shared bucket is drained on a background thread, which finishes well
+        within the retry delay that follows a 429.
+        """
+        logger.warning(f"🚦 OpenAI rate limited {model}; draining the shared request bucket")
+        self._local.drain(model)
+        self._drainer.submit(self._drain_shared, model)
+
+    def _drain_shared(self, model: str) -> None:
+        try:
+            self._shared.drain(model)
+        except Exception as exc:
+            logger.warning(f"Could not drain the shared OpenAI rate limit: {exc}")
+
+
+_admission: Optional[LLMAdmission] = None
+_admission_lock = threading.Lock()
+
+
+def get_llm_admission() -> Optional[LLMAdmission]:
+    """The process-wide admission controller, or None when no limit is configured."""
+    global _admission
+    if not settings.openai_rpm_limit and not settings.openai_tpm_limit:
+        return None
+    with _admission_lock:
+        if _admission is None:
+            _admission = LLMAdmission(
+                settings.openai_rpm_limit,
+                settings.openai_tpm_limit,
+                settings.openai_admission_max_wait,
+            )
+        return _admission
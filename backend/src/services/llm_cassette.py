@@ -0,0 +1,193 @@
+"""
+Record/replay of OpenAI chat completions ("cassettes").
+
+An httpx transport under the OpenAI clients, selected by OPENAI_CASSETTE_MODE:
+
+    off      requests go to the network as usual (default)
+    record   completions already in the cassette are replayed; new ones go
+             to the network and successful responses are appended to it
+    replay   completions are answered from the cassette with no network
+             access; a request that was never recorded gets a 404
+
+Entries are keyed by a hash of the request's messages and response_format
+(the JSON schema), so a recording stays valid until the prompt template,
+the payload or the schema changes. The cassette (OPENAI_CASSETTE_PATH) is a
+JSONL file with one recorded completion per line.
+"""
+import hashlib
+import importlib
+import json
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+# openai 1.x is built on httpx and later releases on httpx2; the transports
+# have to come from the same package as the SDK's client.
+httpx = importlib.import_module(DefaultHttpxClient.__mro__[1].__module__.partition(".")[0])
+
+logger = logging.getLogger(__name__)
+
+
+def cassette_key(body: bytes) -> Optional[str]:
+    """Hash of the messages and response_format of a chat.completions request body."""
+    try:
+        request = json.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(request, dict):
+        return None
+    keyed = {"messages": request.get("messages"), "response_format": request.get("response_format")}
+    canonical = json.dumps(keyed, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """Recorded response bodies by cassette key, backed by an append-only JSONL file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry
+        except FileNotFoundError:
+            pass
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, model: Optional[str], body: str) -> None:
+        entry = {"key": key, "model": model, "recorded_at": time.time(), "body": body}
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+@lru_cache(maxsize=None)
+def get_cassette(path: str) -> Cassette:
+    """One Cassette per file, shared by the sync and async clients."""
+    return Cassette(path)
+
+
+def _is_chat_completion(request: httpx.Request) -> bool:
+    return request.method == "POST" and request.url.path.endswith("/chat/completions")
+
+
+class _CassetteLogic:
+    def __init__(self, cassette: Cassette, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unsupported cassette mode: {mode!r}")
+        self.cassette = cassette
+        self.mode = mode
+
+    def _replay(self, request: httpx.Request, key: Optional[str]) -> Optional[httpx.Response]:
+        entry = self.cassette.get(key) if key else None
+        if entry is not None:
+            return httpx.Response(
+                200,
+                headers={"content-type": "application/json"},
+                content=entry["body"].encode("utf-8"),
+                request=request,
+            )
+        if self.mode == "record" and _is_chat_completion(request):
+            return None
+
+        logger.warning(f"⚠️ No recorded completion for {request.url.path} (key {key}); cassette {self.cassette.path}")
+        error = {
+            "error": {
+                "message": f"No recorded completion for cassette key {key} in {self.cassette.path}",
+                "type": "cassette_miss",
+                "param": None,
+                "code": None,
+            }
+        }
+        return httpx.Response(404, json=error, request=request)
+
+    def _record(self, request: httpx.Request, key: Optional[str], response: httpx.Response) -> httpx.Response:
+        # The body has already been decoded, so the rebuilt response must not
+        # carry the upstream content-encoding header.
+        if response.status_code == 200 and key:
+            self.cassette.put(key, _request_model(request), response.text)
+        return httpx.Response(
+            response.status_code,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+            },
+            content=response.content,
+            request=request,
+        )
+
+
+def _request_model(request: httpx.Request) -> Optional[str]:
+    try:
+        return json.loads(request.content).get("model")
+    except (ValueError, AttributeError):
+        return None
+
+
+class CassetteTransport(_CassetteLogic, httpx.BaseTransport):
+    def __init__(self, cassette: Cassette, mode: str, transport: Optional[httpx.BaseTransport] = None):
+        super().__init__(cassette, mode)
+        self._transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = cassette_key(request.read()) if _is_chat_completion(request) else None
+        replayed = self._replay(request, key)
+        if replayed is not None:
+            return replayed
+        response = self._transport.handle_request(request)
+        try:
+            response.read()
+        finally:
+            response.close()
+        return self._record(request, key, response)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncCassetteTransport(_CassetteLogic, httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Cassette, mode: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        super().__init__(cassette, mode)
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = cassette_key(await request.aread()) if _is_chat_completion(request) else None
+        replayed = self._replay(request, key)
+        if replayed is not None:
+            return replayed
+        response = await self._transport.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        return self._record(request, key, response)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def cassette_http_client(mode: str, path: str, asynchronous: bool):
+    """An httpx client for the OpenAI SDK that records to / replays from ``path``."""
+    cassette = get_cassette(path)
+    if asynchronous:
+        return DefaultAsyncHttpxClient(transport=AsyncCassetteTransport(cassette, mode))
+    return DefaultHttpxClient(transport=CassetteTransport(cassette, mode))
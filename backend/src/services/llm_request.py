@@ -0,0 +1,311 @@
+"""
+Precompiled OpenAI request template.
+
+Everything about a chat.completions request that does not depend on the
+user (the normalized response JSON schema, the static system prompt and
+the pooled HTTP clients) is built once per process. Per request only the
+calculated scores, the target company label and the payload are filled in.
+"""
+import hashlib
+import json
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from openai import AsyncOpenAI, OpenAI
+
+from src.config.settings import settings
+from src.models.models_raw import FullProfileEvaluationResponseRaw
+from src.services.llm_cassette import cassette_http_client
+
+
+# The static part of the system prompt goes first so that every request
+# shares the same long prefix, which OpenAI's automatic prompt caching can
+# reuse; the per-request score and company rules follow at the end.
+_STATIC_SYSTEM_INSTRUCTION = (
+    "You are a career advisor specializing in the Indian tech market. Given the candidate's background, quiz responses, and goals, "
+    "produce a structured FullProfileEvaluationResponse focusing on prospects, role fit, gaps, and a roadmap.\n\n"
+    "CONTEXT: The user is based in India and looking for opportunities in the Indian tech ecosystem (Bangalore, Hyderabad, Pune, NCR) "
+    "or remote roles with Indian/global companies. Tailor all recommendations to be realistic and relevant for the Indian market.\n\n"
+    "Field guide for the input JSON:\n"
+    "- background: 'tech' = already works/studies in software; 'non-tech' = transitioning from another domain\n"
+    "- quizResponses.currentRole:\n"
+    "  * Tech roles: swe-product (Product Company SDE), swe-service (Service Company SDE), devops (DevOps/Cloud/Infra), qa-support (QA/Support/Other Technical)\n"
+    "  * Non-tech roles: non-tech-role, support-qa, other-engineering, student (Non-CS background)\n"
+    "  * Legacy: career-switcher (treat as non-tech)\n"
+    "- quizResponses.experience: '0-2', '3-5', '5-8', or '8+' years (NEW: 4 tiers instead of 3)\n"
+    "- quizResponses.targetRole:\n"
+    "  * Tech: backend-sde, fullstack-sde, frontend-sde, data-ml, devops-sre, mobile-dev, tech-lead\n"
+    "  * Non-tech: backend-dev, fullstack-dev, data-analyst, automation-qa, exploring\n"
+    "  * Legacy: faang-sde, backend, fullstack (still valid)\n"
+    "- quizResponses.problemSolving: 0-10, 11-50, 51-100, 100+ (coding practice intensity - DERIVED from codingActivity/learningActivity)\n"
+    "- quizResponses.systemDesign: multiple, once, not-yet (CRITICAL: 'multiple' indicates senior-level expertise - DERIVED from systemDesign comfort)\n"
+    "- quizResponses.portfolio: active-5+, limited-1-5, inactive, none (DEPRECATED: not collected in new flow)\n"
+    "- quizResponses.mockInterviews: weekly+, monthly, rarely, never (DEPRECATED: not collected in new flow)\n"
+    "- quizResponses.requirementType: Maps to primaryGoal (better-company, level-up, higher-comp, switch-domain, upskilling, career-switch, job-security, personal-interest)\n"
+    "- goals.topicOfInterest: ai-ml, web-development, mobile-development, data-science, cybersecurity, cloud-computing, blockchain, etc.\n\n"
+    "⚠️ CRITICAL: LOGICAL CONSISTENCY CHECK (Evaluate FIRST before writing the analysis):\n"
+    "INPUT CONTRADICTIONS - Real-world skill progression rules:\n\n"
+    "1. SYSTEM DESIGN vs CODING CONTRADICTION:\n"
+    "   🚨 IMPOSSIBLE COMBINATION: systemDesign='multiple' + problemSolving < '51-100'\n"
+    "   Reality: You CANNOT have deep system design expertise without extensive coding practice.\n"
+    "   System design requires years of building production systems, which means 100s of problems solved.\n\n"
+    "   Resolution Rules:\n"
+    "   - If systemDesign='multiple' + problemSolving='0-10' or '11-50' + experience <= '3-5':\n"
+    "     → User likely misunderstood questions or is being aspirational\n"
+    "     → OVERRIDE: Treat as systemDesign='once' or 'not-yet'\n"
+    "     → Do NOT list system design as a strength; put consistent coding practice (100+ problems) in areas_to_develop\n\n"
+    "   - If systemDesign='multiple' + problemSolving < '51-100' + experience in ['5-8', '8+'] + currentRole contains 'manager'/'architect':\n"
+    "     → Rare case: Transitioned to management/architecture, coding skills atrophied\n"
+    "     → MUST flag in areas_to_develop: 'Hands-on coding skills - rusty from lack of practice'\n"
+    "     → In technical_notes: 'Architecture experience is valuable, but hands-on coding needs refresh for IC roles.'\n\n"
+    "2. EXPERIENCE vs SKILLS CONTRADICTION:\n"
+    "   - If experience in ['5-8', '8+'] + problemSolving='0-10':\n"
+    "     → Likely stuck in maintenance roles or exaggerating experience\n"
+    "     → Flag in technical_notes: 'Experience level doesn't match interview preparation. Results may not reflect actual capability.'\n\n"
+    "3. PORTFOLIO vs CODING CONTRADICTION:\n"
+    "   - If portfolio='active-5+' + problemSolving='0-10':\n"
+    "     → Projects likely tutorials/clones, not production-grade\n"
+    "     → Good signal for potential, but not for senior roles\n\n"
+    "SCOPE OF YOUR RESPONSE:\n"
+    "Produce ONLY skill_analysis, experience_benchmark, interview_readiness.technical_notes, peer_comparison, success_likelihood and badges.\n"
+    "Scores, profile notes, quick wins, tools, job opportunities, role recommendations and the current profile summary are generated by the backend.\n"
+    "Whenever your text mentions a role, it MUST be a hands-on technical/engineering role (no PM/UX/BA/manual QA) that is realistic in the Indian market.\n\n"
+    "VALIDATION CHECKLIST (Internal - Review Before Finalizing):\n"
+    "☑ Are strengths and areas_to_develop specific to the quiz answers (not generic 'practice more')?\n"
+    "☑ Do areas_to_develop reflect the LOGICAL CONSISTENCY CHECK above?\n"
+    "☑ Does gap_analysis compare the user's experience with what the target role typically needs?\n"
+    "☑ Zero non-technical roles in the entire response?\n\n"
+    "CRITICAL: FORMAT FOR experience_benchmark:\n"
+    "- your_experience_years: Use ONLY numbers like '0-2', '3-5', '5-8', '8+' (NO 'years' or 'year' suffix)\n"
+    "- typical_for_target_role_years: Use ONLY numbers like '0-2', '3-5', '5-8', '8+' (NO 'years' or 'year' suffix)\n"
+    "- Frontend will automatically append 'years' when displaying - do NOT include it in your response\n\n"
+    "In your advice, acknowledge when values show limited exposure (e.g., not-yet, none, never) and tailor guidance for the user's background pivot."
+)
+
+
+def _build_dynamic_instruction(
+    *,
+    calculated_profile_score: int,
+    calculated_interview_readiness: Dict[str, Any],
+    target_company_label: str,
+) -> str:
+    return (
+        f"CRITICAL: SCORE CONSISTENCY RULES\n"
+        f"The user's profile_strength_score has been calculated as {calculated_profile_score}/100.\n"
+        f"The user's interview readiness has been independently calculated based on their practice, experience, and preparation:\n"
+        f"technical {calculated_interview_readiness['technical_interview_percent']}%, HR/behavioral {calculated_interview_readiness['hr_behavioral_percent']}%.\n"
+        f"These scores are filled in by the backend. Everything you write MUST be consistent with them:\n\n"
+        f"1. interview_readiness.technical_notes: explain the {calculated_interview_readiness['technical_interview_percent']}% technical readiness (NOT dependent on profile_strength_score)\n"
+        f"   NOTE: Interview readiness is based on quiz responses (problemSolving, systemDesign, portfolio, experience)\n"
+        f"   It can be higher or lower than profile_strength_score - they measure different things!\n\n"
+        f"2. peer_comparison.percentile: {max(0, calculated_profile_score - 5)} to {min(100, calculated_profile_score + 5)}\n"
+        f"3. success_likelihood.score_percent: {max(0, calculated_profile_score - 10)} to {min(100, calculated_profile_score + 5)}\n"
+        f"   - Should be reasonable given profile_strength_score\n\n"
+        f"IMPORTANT DISTINCTION:\n"
+        f"- profile_strength_score ({calculated_profile_score}%): Overall career strength (experience, skills, track record)\n"
+        f"- interview_readiness ({calculated_interview_readiness['technical_interview_percent']}%): Specifically how prepared they are for technical interviews\n"
+        f"- A person can have high interview readiness but lower profile strength (new grad who practices hard)\n"
+        f"- A person can have strong profile but lower interview readiness (experienced but not interview-prepped)\n\n"
+        f"CRITICAL: USE ACTUAL TARGET COMPANY IN ALL TEXT\n"
+        f"The user selected target company: '{target_company_label}'\n\n"
+        f"When generating ANY text field (areas_to_develop, technical_notes, success_likelihood.notes, peer_comparison.summary):\n"
+        f"- Use the ACTUAL company label: '{target_company_label}'\n"
+        f"- DO NOT default to 'FAANG' or 'Big Tech' unless that's what they selected\n\n"
+        f"Examples:\n"
+        f"- If target is 'High Growth Startups' → 'startup interview preparation' NOT 'FAANG interview preparation'\n"
+        f"- If target is 'Product Unicorns' → 'product company interview preparation'\n"
+        f"- If target is 'Service Companies' → 'service company interview preparation'\n"
+        f"- If target is 'FAANG / Big Tech' → 'FAANG / Big Tech interview preparation' (only if selected!)"
+    )
+
+
+_USER_PROMPT_PREFIX = (
+    "Using this input JSON, return only a JSON object that matches FullProfileEvaluationResponse.\n\n"
+)
+
+
+def _build_response_schema() -> Dict[str, Any]:
+    schema = FullProfileEvaluationResponseRaw.model_json_schema()
+
+    def _apply_json_schema_normalizers(node: Any) -> None:
+        if isinstance(node, dict):
+            # Ensure $ref nodes have no sibling keywords; OpenAI rejects any extras.
+            if "$ref" in node and len(node) > 1:
+                ref_value = node["$ref"]
+                node.clear()
+                node["$ref"] = ref_value
+
+            if node.get("type") == "object":
+                props = node.setdefault("properties", {})
+                if not isinstance(props, dict):
+                    raise TypeError("Object schema 'properties' must be a mapping")
+
+                node["additionalProperties"] = False
+                node["required"] = list(props.keys())
+
+                for child in props.values():
+                    _apply_json_schema_normalizers(child)
+            if "items" in node:
+                _apply_json_schema_normalizers(node["items"])
+            for key in ("oneOf", "anyOf", "allOf"):
+                if key in node and isinstance(node[key], list):
+                    for child in node[key]:
+                        _apply_json_schema_normalizers(child)
+            if "$defs" in node and isinstance(node["$defs"], dict):
+                for child in node["$defs"].values():
+                    _apply_json_schema_normalizers(child)
+            if "definitions" in node and isinstance(node["definitions"], dict):
+                for child in node["definitions"].values():
+                    _apply_json_schema_normalizers(child)
+        elif isinstance(node, list):
+            for child in node:
+                _apply_json_schema_normalizers(child)
+
+    _apply_json_schema_normalizers(schema)
+    return schema
+
+
+class LLMRequestTemplate:
+    """Immutable, reusable parts of the evaluation request."""
+
+    def __init__(self, schema: Dict[str, Any], static_instruction: str):
+        self.schema = schema
+        self.static_instruction = static_instruction
+        self.response_format: Dict[str, Any] = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "FullProfileEvaluationResponse",
+                "schema": schema,
+                "strict": True,
+            },
+        }
+        self.fingerprint = _template_fingerprint(schema, static_instruction)
+
+    def build_messages(
+        self,
+        *,
+        input_payload: Dict[str, Any],
+        calculated_profile_score: int,
+        calculated_interview_readiness: Dict[str, Any],
+        target_company_label: str,
+    ) -> List[Dict[str, str]]:
+        system_instruction = self.static_instruction + "\n\n" + _build_dynamic_instruction(
+            calculated_profile_score=calculated_profile_score,
+            calculated_interview_readiness=calculated_interview_readiness,
+            target_company_label=target_company_label,
+        )
+        return [
+            {"role": "system", "content": system_instruction},
+            {
+                "role": "user",
+                "content": _USER_PROMPT_PREFIX + json.dumps(input_payload),
+            },
+        ]
+
+
+def _template_fingerprint(schema: Dict[str, Any], static_instruction: str) -> str:
+    """
+    Hash of everything in the request that is not user data. Stored LLM
+    output is only reused while this is unchanged.
+    """
+    # A fixed rendering stands in for the text of the dynamic instruction.
+    dynamic_probe = _build_dynamic_instruction(
+        calculated_profile_score=0,
+        calculated_interview_readiness={"technical_interview_percent": 0, "hr_behavioral_percent": 0},
+        target_company_label="",
+    )
+    digest = hashlib.sha256()
+    for part in (static_instruction, dynamic_probe, _USER_PROMPT_PREFIX, json.dumps(schema, sort_keys=True)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def build_llm_request_template() -> LLMRequestTemplate:
+    return LLMRequestTemplate(
+        schema=_build_response_schema(),
+        static_instruction=_STATIC_SYSTEM_INSTRUCTION,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_llm_request_template() -> LLMRequestTemplate:
+    return build_llm_request_template()
+
+
+class LLMUsageTotals:
+    """Process-wide running totals of chat.completions calls and token usage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {
+            "requests": 0,
+            "prompt_tokens": 0,
+            "cached_prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+
+    def record(self, usage: Any) -> None:
+        details = getattr(usage, "prompt_tokens_details", None)
+        with self._lock:
+            self._totals["requests"] += 1
+            if usage is None:
+                return
+            self._totals["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+            self._totals["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+            self._totals["cached_prompt_tokens"] += getattr(details, "cached_tokens", 0) or 0
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._totals)
+
+
+llm_usage = LLMUsageTotals()
+
+
+_clients: Dict[Any, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(client_cls, api_key: Optional[str]):
+    key = (client_cls, api_key)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            kwargs: Dict[str, Any] = {"timeout": settings.openai_timeout}
+            if api_key:
+                kwargs["api_key"] = api_key
+            if settings.openai_base_url:
+                kwargs["base_url"] = settings.openai_base_url
+            if settings.openai_cassette_mode != "off":
+                kwargs["http_client"] = cassette_http_client(
+                    settings.openai_cassette_mode,
+                    settings.openai_cassette_path,
+                    asynchronous=client_cls is AsyncOpenAI,
+                )
+            client = client_cls(**kwargs)
+            _clients[key] = client
+        return client
+
+
+def get_openai_client(api_key: Optional[str] = None) -> OpenAI:
+    """Shared sync client; its HTTP connection pool is reused across calls."""
+    return _get_client(OpenAI, api_key)
+
+
+def get_async_openai_client(api_key: Optional[str] = None) -> AsyncOpenAI:
+    """Shared async client; its HTTP connection pool is reused across calls."""
+    return _get_client(AsyncOpenAI, api_key)
+
+
+async def close_openai_clients() -> None:
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+
+    for client in clients:
+        if isinstance(client, AsyncOpenAI):
+            await client.close()
+        else:
+            client.close()
@@ -0,0 +1,181 @@
+"""
+Enumeration of every payload the quiz can produce.
+
+The quiz is a closed set of options (see QUIZ_QUESTIONS_AND_OPTIONS.md), and
+the frontend maps answers to an /evaluate payload deterministically
+(frontend/src/utils/evaluationLogic.js). This module mirrors that mapping,
+so each enumerated payload is byte-for-byte what a real user would send and
+hashes to the same cache key.
+"""
+from itertools import product
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+Option = Tuple[str, str]  # (value, display label)
+
+TECH_CURRENT_ROLES: List[Option] = [
+    ("swe-product", "Software Engineer - Product Company"),
+    ("swe-service", "Software Engineer - Service Company"),
+    ("devops", "DevOps / Cloud / Infrastructure Engineer"),
+    ("qa-support", "QA / Support / Other Technical Role"),
+]
+
+TECH_EXPERIENCE = ["0-2", "2-3", "3-5", "5-8", "8+"]
+
+# currentSkill options depend on the selected currentRole.
+TECH_CURRENT_SKILLS: Dict[str, List[str]] = {
+    "swe-product": ["backend", "frontend", "fullstack", "system-design"],
+    "swe-service": ["enterprise", "web", "database", "learning-product"],
+    "devops": ["cloud", "containers", "cicd", "iac"],
+    "qa-support": ["automation", "sysadmin", "learning-dev", "infrastructure"],
+}
+
+TECH_PRIMARY_GOALS = ["better-company", "level-up", "higher-comp", "switch-domain", "upskilling"]
+
+TECH_TARGET_ROLES: List[Option] = [
+    ("senior-backend", "Senior Backend Engineer"),
+    ("senior-fullstack", "Senior Full-Stack Engineer"),
+    ("backend-sde", "Backend / API Engineer"),
+    ("fullstack-sde", "Full-Stack Engineer"),
+    ("data-ml", "Data / ML Engineer"),
+    ("tech-lead", "Tech Lead / Staff Engineer"),
+]
+
+TECH_TARGET_COMPANIES: List[Option] = [
+    ("faang", "FAANG / Big Tech"),
+    ("unicorns", "Product Unicorns/Scaleups"),
+    ("startups", "High Growth Startups"),
+    ("better-service", "Better Service Company"),
+    ("evaluating", "Still evaluating"),
+]
+
+TECH_PROBLEM_SOLVING = ["100+", "51-100", "11-50", "0-10"]
+TECH_SYSTEM_DESIGN = ["multiple", "once", "learning", "not-yet"]
+TECH_PORTFOLIO = ["active-5+", "limited-1-5", "inactive", "none"]
+
+NON_TECH_BACKGROUNDS = ["sales-marketing", "operations", "design", "finance", "other"]
+NON_TECH_EXPERIENCE = ["0", "0-2", "2-3", "3-5", "5+"]
+
+NON_TECH_TARGET_ROLES: List[Option] = [
+    ("backend", "Backend Engineer"),
+    ("fullstack", "Full-Stack Engineer"),
+    ("data-ml", "Data / ML Engineer"),
+    ("frontend", "Frontend Engineer"),
+    ("not-sure", "Not sure yet / Exploring"),
+]
+
+NON_TECH_MOTIVATIONS = ["salary", "interest", "stability", "flexibility", "dissatisfied"]
+
+NON_TECH_TARGET_COMPANIES: List[Option] = [
+    ("any-tech", "Any tech company (experience first)"),
+    ("product", "Product companies"),
+    ("service", "Service companies"),
+    ("faang-longterm", "FAANG / Big Tech (long-term)"),
+    ("not-sure", "Not sure / Need guidance"),
+]
+
+# codeComfort only reaches the payload through the problemSolving it maps
+# to, so 'beginner' and 'complete-beginner' collapse into one payload.
+NON_TECH_PROBLEM_SOLVING = ["51-100", "11-50", "0-10"]
+
+_DEFAULT_GOALS: Dict[str, Any] = {
+    "requirementType": [],
+    "targetCompany": "Not specified",
+    "topicOfInterest": [],
+}
+
+_TECH_CURRENT_COMPANY = {
+    "swe-product": "Product Company",
+    "swe-service": "Service Company",
+    "devops": "Tech Company",
+    "qa-support": "Tech Company",
+}
+
+
+def _infer_portfolio(problem_solving: str) -> str:
+    if problem_solving == "51-100":
+        return "limited-1-5"
+    if problem_solving == "11-50":
+        return "inactive"
+    return "none"
+
+
+def _payload(background: str, quiz_responses: Dict[str, Any]) -> Dict[str, Any]:
+    # primaryGoal is an optional field of the API model; model_dump() always
+    # includes it, as None, because the frontend never sends it.
+    return {
+        "background": background,
+        "quizResponses": {**quiz_responses, "primaryGoal": None},
+        "goals": dict(_DEFAULT_GOALS),
+    }
+
+
+def iter_tech_payloads() -> Iterator[Dict[str, Any]]:
+    for (role, role_label), experience, goal, (target_role, target_role_label), (
+        company,
+        company_label,
+    ), problem_solving, portfolio in product(
+        TECH_CURRENT_ROLES,
+        TECH_EXPERIENCE,
+        TECH_PRIMARY_GOALS,
+        TECH_TARGET_ROLES,
+        TECH_TARGET_COMPANIES,
+        TECH_PROBLEM_SOLVING,
+        TECH_PORTFOLIO,
+    ):
+        # systemDesign is only asked when problemSolving is not '0-10'.
+        system_design_options = ["not-yet"] if problem_solving == "0-10" else TECH_SYSTEM_DESIGN
+        for skill, system_design in product(TECH_CURRENT_SKILLS[role], system_design_options):
+            yield _payload("tech", {
+                "currentRole": role,
+                "experience": experience,
+                "targetRole": target_role,
+                "problemSolving": problem_solving,
+                "systemDesign": system_design,
+                "portfolio": portfolio,
+                "mockInterviews": "never",
+                "requirementType": goal,
+                "targetCompany": company,
+                "currentCompany": _TECH_CURRENT_COMPANY[role],
+                "currentSkill": skill,
+                "currentRoleLabel": role_label,
+                "targetRoleLabel": target_role_label,
+                "targetCompanyLabel": company_label,
+            })
+
+
+def iter_non_tech_payloads() -> Iterator[Dict[str, Any]]:
+    for current_background, experience, (target_role, target_role_label), motivation, (
+        company,
+        company_label,
+    ), problem_solving in product(
+        NON_TECH_BACKGROUNDS,
+        NON_TECH_EXPERIENCE,
+        NON_TECH_TARGET_ROLES,
+        NON_TECH_MOTIVATIONS,
+        NON_TECH_TARGET_COMPANIES,
+        NON_TECH_PROBLEM_SOLVING,
+    ):
+        yield _payload("non-tech", {
+            "currentRole": current_background,
+            "experience": experience,
+            "targetRole": target_role,
+            "problemSolving": problem_solving,
+            "systemDesign": "not-yet",
+            "portfolio": _infer_portfolio(problem_solving),
+            "mockInterviews": "never",
+            "requirementType": motivation,
+            "targetCompany": company,
+            "currentCompany": "Transitioning from non-tech background",
+            "currentSkill": problem_solving,
+            "currentRoleLabel": "Career Switcher",
+            "targetRoleLabel": target_role_label,
+            "targetCompanyLabel": company_label,
+        })
+
+
+def iter_quiz_payloads(background: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Every distinct payload for one background ('tech' / 'non-tech') or both."""
+    if background in (None, "tech"):
+        yield from iter_tech_payloads()
+    if background in (None, "non-tech"):
+        yield from iter_non_tech_payloads()
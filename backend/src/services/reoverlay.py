@@ -0,0 +1,114 @@
+"""
+Batch re-overlay: rebuild response_cache from stored raw LLM output.
+
+After a change to the rule modules (scoring, quick wins, tools, personas,
+...), this recomputes the deterministic sections for every payload in
+llm_response_cache that was produced by the current prompt and schema, merges
+them with the stored LLM output and rewrites response_cache. No OpenAI calls
+are made.
+
+Usage (from backend/):
+    python -m src.services.reoverlay [--batch-size 500] [--workers 4]
+
+Other API processes keep serving their in-memory L1 copies until those
+expire (L1_CACHE_TTL); restart them to pick up the new results at once.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.config.logging_config import get_logger
+from src.models.models_raw import FullProfileEvaluationResponseRaw
+from src.repositories.cache_repository import CacheRepository, canonical_response_json
+from src.repositories.connection_pool import close_database_pool, init_database_pool
+from src.services.cache_version import get_cache_namespace
+from src.services.llm_request import get_llm_request_template
+from src.services.run_poc import apply_deterministic_overlay, compute_deterministic_sections
+
+logger = get_logger(__name__)
+
+MODEL_NAME = "gpt-4o"
+
+
+def _reoverlay_rows(rows: List[Dict[str, Any]]) -> Tuple[List[Tuple[str, str]], int]:
+    """Process-pool task: (cache_key, response_json) pairs and a failure count."""
+    entries = []
+    failed = 0
+    for row in rows:
+        try:
+            payload = row["payload"]
+            llm_result = FullProfileEvaluationResponseRaw.model_validate_json(row["raw_json"])
+            result = apply_deterministic_overlay(
+                llm_result, payload, compute_deterministic_sections(payload)
+            )
+            entries.append((row["cache_key"], canonical_response_json(result.model_dump(mode="json"))))
+        except Exception as exc:
+            failed += 1
+            logger.error(f"Re-overlay failed for key {row['cache_key'][:16]}...: {exc}")
+    return entries, failed
+
+
+def run_reoverlay(*, batch_size: int, workers: Optional[int]) -> Dict[str, Any]:
+    db_pool = init_database_pool()
+    if db_pool is None:
+        raise RuntimeError("Re-overlay needs the Postgres cache; check DATABASE_URL and CACHE_ENABLED")
+
+    cache_repo = CacheRepository(db_pool)
+    prompt_fingerprint = get_llm_request_template().fingerprint
+    namespace = get_cache_namespace(MODEL_NAME)
+    counts = {"rows": 0, "rewritten": 0, "failed": 0}
+    started = time.perf_counter()
+
+    def collect(done: Set[Future]) -> None:
+        for future in done:
+            entries, failed = future.result()
+            counts["failed"] += failed
+            counts["rewritten"] += cache_repo.set_many(entries, namespace)
+
+    try:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers) as executor:
+            max_in_flight = 2 * workers
+            in_flight: Set[Future] = set()
+            for rows in cache_repo.iter_raw(MODEL_NAME, prompt_fingerprint, batch_size):
+                counts["rows"] += len(rows)
+                in_flight.add(executor.submit(_reoverlay_rows, rows))
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+            collect(in_flight)
+    finally:
+        close_database_pool()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "namespace": namespace,
+        "prompt_fingerprint": prompt_fingerprint[:16],
+        **counts,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(counts["rows"] / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Recompute cached evaluations from stored LLM output.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None, help="processes for the rule modules")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_reoverlay(batch_size=args.batch_size, workers=args.workers)
+    except RuntimeError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+
+    print(json.dumps(report, indent=2))
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
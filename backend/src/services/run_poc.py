@@ -1,20 +1,43 @@
+import asyncio
 import hashlib
 import json
 import logging
 import os
+import random
 import sys
-from time import sleep
-from typing import Any, Dict, Optional
+from contextlib import contextmanager
+from time import perf_counter, sleep
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import RateLimitError
 from pydantic import ValidationError
-from src.repositories.cache_repository import CacheRepository
+from src.repositories.cache_repository import (
+    AsyncCacheRepository,
+    CacheRepository,
+    canonical_response_json,
+)
+from src.repositories.request_frequency_repository import request_frequency
 from src.models import FullProfileEvaluationResponse, enrich_full_profile_evaluation
 from src.models.models_raw import FullProfileEvaluationResponseRaw
+from src.config.metrics import DEGRADED_EVALUATIONS, OPENAI_REQUEST_SECONDS, OPENAI_RETRIES, observe_stage
+from src.config.settings import settings
+from src.config.tracing import span, traced
+from src.services.cache_version import get_cache_namespace
+from src.services.canonical_payload import canonical_cache_key, canonical_payload
+from src.services.circuit_breaker import LLMUnavailable, get_llm_circuit_breaker
+from src.services.fallback_logic import generate_fallback_llm_sections
+from src.services.llm_admission import estimate_tokens, get_llm_admission
 from src.services.quick_wins_logic import generate_quick_wins
+from src.services.llm_request import (
+    get_async_openai_client,
+    get_llm_request_template,
+    get_openai_client,
+    llm_usage,
+)
 from src.services.job_descriptions import generate_job_opportunities, generate_recommended_roles
 from src.services.scoring_logic import calculate_profile_strength
+from src.services.single_flight import SingleFlight
 from src.services.interview_readiness_logic import calculate_interview_readiness
 from src.services.tools_logic import generate_tool_recommendations
 from src.services.profile_notes_logic import generate_profile_strength_notes
@@ -26,6 +49,10 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Process-wide coalescing of concurrent cache misses, keyed by cache key.
+# Followers get both the validated model and its serialized JSON.
+evaluation_flights: SingleFlight[Tuple[FullProfileEvaluationResponse, str]] = SingleFlight("evaluation")
+
 
 DEFAULT_INPUT: Dict[str, Any] = {
     "background": "tech",
@@ -50,132 +77,171 @@ DEFAULT_INPUT: Dict[str, Any] = {
 }
 
 
-def _normalise_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
-    return json.loads(json.dumps(payload, sort_keys=True))
+def _parse_completion_content(
+    content: str,
+) -> Tuple[Optional[FullProfileEvaluationResponseRaw], str]:
+    """Validate a model reply; returns (result, "") on success or (None, error_text)."""
+    if not content:
+        return None, "Empty response from OpenAI chat.completions"
+
+    try:
+        raw_obj = json.loads(content)
+    except json.JSONDecodeError as exc:
+        return None, (
+            "Model response is not valid JSON: "
+            f"{exc}\nResponse text: {content}"
+        )
+
+    try:
+        raw_instance = FullProfileEvaluationResponseRaw.model_validate(raw_obj)
+    except ValidationError as exc:
+        return None, (
+            "Model response failed validation against FullProfileEvaluationResponse: "
+            f"{exc}"
+        )
+
+    return raw_instance, ""
+
+
+def _build_correction_messages(
+    base_messages: List[Dict[str, str]],
+    content: str,
+    error_text: str,
+) -> List[Dict[str, str]]:
+    correction_prompt = (
+        "The previous response did not satisfy the required schema. "
+        f"Error details:\n{error_text}\n\n"
+        "Please respond again with only a JSON object that strictly matches the schema."
+    )
+    return base_messages + [
+        {"role": "assistant", "content": content or ""},
+        {"role": "user", "content": correction_prompt},
+    ]
 
 
-def _filter_and_rerank_roles(
-    recommended_roles: list,
-    current_role: str,
-    target_role: str,
-    experience: str
-) -> list:
+class _StructuredCall:
     """
-    Filter and rerank recommended roles based on:
-    1. Current role domain (DevOps users should see DevOps-relevant roles)
-    2. Target role (Data Analytics users should see data-focused roles)
-    3. Experience level (8+ years should see Staff/Principal/EM roles)
+    State of one structured OpenAI call: the request, the retry policy and
+    the breaker, admission, metrics and usage bookkeeping. The sync and async
+    entry points only drive it, blocking or awaiting where they differ.
+
+    OPENAI_MAX_RETRIES counts every attempt, the first one included.
     """
-    if not recommended_roles:
-        return recommended_roles
-
-    # Score each role based on how well it matches user profile
-    scored_roles = []
-
-    for role in recommended_roles:
-        score = 0
-        title_lower = role.get("title", "").lower()
-        seniority_raw = role.get("seniority", "")
-        # Convert Enum to string if needed
-        seniority = str(seniority_raw).lower() if seniority_raw else ""
-
-        # 1. TARGET ROLE MATCHING (HIGHEST PRIORITY - user's explicit choice)
-        if target_role:
-            target_lower = target_role.lower()
-
-            # Data Analytics/ML target → Data Engineer, Data Analyst, ML Engineer (NOT generic engineer roles)
-            if "data" in target_lower or "ml" in target_lower or "analytics" in target_lower:
-                if any(x in title_lower for x in ["data engineer", "data analyst", "ml engineer", "machine learning", "analytics engineer"]):
-                    score += 30  # HIGHEST - user's explicit target
-
-            # Backend target → Backend, Full-Stack, Senior Backend
-            if "backend" in target_lower:
-                if any(x in title_lower for x in ["backend", "api", "full-stack"]):
-                    score += 25  # HIGHEST - user's explicit target
-
-            # Frontend target → Frontend, Full-Stack
-            if "frontend" in target_lower:
-                if any(x in title_lower for x in ["frontend", "full-stack", "react", "angular", "vue"]):
-                    score += 25  # HIGHEST - user's explicit target
-
-            # DevOps/SRE target → DevOps, SRE, Cloud, Infrastructure
-            if "devops" in target_lower or "sre" in target_lower or "infrastructure" in target_lower:
-                if any(x in title_lower for x in ["devops", "sre", "cloud", "infrastructure", "platform", "reliability engineer", "site reliability"]):
-                    score += 30  # HIGHEST - user's explicit target
-
-            # Tech Lead/Manager target → Tech Lead, Manager, Director
-            if "tech-lead" in target_lower or "lead" in target_lower or "manager" in target_lower:
-                if any(x in title_lower for x in ["tech lead", "engineering manager", "director", "manager"]):
-                    score += 30  # HIGHEST - user's explicit target
-
-            # Staff/Principal target → Staff, Principal, Architect
-            if "staff" in target_lower or "principal" in target_lower or "architect" in target_lower:
-                if any(x in title_lower for x in ["staff", "principal", "architect"]):
-                    score += 30  # HIGHEST - user's explicit target
-
-        # 2. CURRENT ROLE DOMAIN MATCHING (secondary priority)
-        if current_role:
-            current_lower = current_role.lower()
-
-            # DevOps users → DevOps/SRE/Platform/Infrastructure roles
-            if "devops" in current_lower or "infra" in current_lower or "cloud" in current_lower:
-                if any(x in title_lower for x in ["devops", "sre", "cloud", "infrastructure", "platform", "reliability engineer", "site reliability"]):
-                    score += 15  # Good match (but lower than target role)
-
-            # QA/Support users → QA Automation, Test Engineer, Backend roles
-            if "qa" in current_lower or "support" in current_lower:
-                if any(x in title_lower for x in ["qa", "automation", "test", "backend", "engineer"]):
-                    score += 12  # Good match
-
-            # SWE-Product users → Backend, Full-Stack, Senior roles (stay in product world)
-            if "product" in current_lower:
-                if any(x in title_lower for x in ["backend", "fullstack", "full-stack", "senior", "staff"]):
-                    score += 12  # Good match
-
-            # SWE-Service users → can transition to Product roles
-            if "service" in current_lower:
-                if any(x in title_lower for x in ["backend", "fullstack", "senior"]):
-                    score += 10  # Moderate match
-
-        # 3. EXPERIENCE LEVEL MATCHING (third priority)
-        if experience:
-            # 8+ years → Staff, Principal, Engineering Manager, Architect, Tech Lead
-            if experience == "8+":
-                if any(x in title_lower for x in ["staff", "principal", "engineering manager", "architect", "tech lead", "director"]) or \
-                   any(x in seniority for x in ["staff", "principal", "principal engineer", "engineering manager", "director"]):
-                    score += 18  # Strong match for senior roles
-                # Regular engineer roles should be lower priority
-                elif any(x in title_lower for x in ["senior", "lead"]) or \
-                     "senior" in seniority or "principal" in seniority:
-                    score += 10
-
-            # 5-8 years → Senior, Tech Lead, Staff (if strong coding)
-            elif experience == "5-8":
-                if any(x in title_lower for x in ["senior", "tech lead", "staff", "architect"]) or \
-                   any(x in seniority for x in ["senior", "staff", "architect", "tech lead"]):
-                    score += 15
-
-            # 3-5 years → Mid-level, Senior (lower-bound)
-            elif experience == "3-5":
-                if any(x in title_lower for x in ["senior", "mid-level", "sde-2"]) or \
-                   any(x in seniority for x in ["mid-senior", "senior", "mid-level"]):
-                    score += 10
-
-            # 0-2 years → Junior, Entry-level, SDE-1
-            elif experience in ["0-2", "0"]:
-                if any(x in title_lower for x in ["junior", "entry", "sde-1", "graduate", "intern"]) or \
-                   any(x in seniority for x in ["junior", "entry-level"]):
-                    score += 12
-
-        # 4. GENERAL RELEVANCE BOOST (baseline for all roles)
-        if any(x in title_lower for x in ["engineer", "developer", "architect", "lead"]):
-            score += 5  # All technical roles get small boost
-
-        scored_roles.append((role, score))
-
-    # Sort by score (descending) and return just the roles
-    sorted_roles = sorted(scored_roles, key=lambda x: x[1], reverse=True)
-    return [role for role, score in sorted_roles]
+
+    def __init__(
+        self,
+        *,
+        openai_model: str,
+        input_payload: Dict[str, Any],
+        calculated_profile_score: int,
+        calculated_interview_readiness: Dict[str, Any],
+        target_company_label: str,
+    ):
+        self.model = openai_model
+        self.admission = get_llm_admission()
+        self.breaker = get_llm_circuit_breaker()
+        self.max_attempts = max(1, settings.openai_max_retries)
+        template = get_llm_request_template()
+        self._response_format = template.response_format
+        self._base_messages = template.build_messages(
+            input_payload=input_payload,
+            calculated_profile_score=calculated_profile_score,
+            calculated_interview_readiness=calculated_interview_readiness,
+            target_company_label=target_company_label,
+        )
+        self._messages = list(self._base_messages)
+
+    def attempts(self) -> range:
+        return range(1, self.max_attempts + 1)
+
+    def allow(self) -> None:
+        if self.breaker is not None and not self.breaker.allow():
+            raise LLMUnavailable("OpenAI circuit breaker is open; the LLM is not called")
+
+    def estimated_tokens(self) -> int:
+        return estimate_tokens(self._messages, self._response_format)
+
+    @contextmanager
+    def admitting(self, attempt: int) -> Iterator[None]:
+        """Wraps the admission wait; an attempt that is never admitted leaves no breaker outcome."""
+        with span("openai.admission", model=self.model, attempt=attempt):
+            try:
+                yield
+            except BaseException:
+                # Timed out or cancelled after allow(): possibly the half-open probe.
+                if self.breaker is not None:
+                    self.breaker.release()
+                raise
+
+    def attempt_span(self, attempt: int):
+        return span(
+            "openai.attempt",
+            model=self.model,
+            attempt=attempt,
+            correction=len(self._messages) > len(self._base_messages),
+        )
+
+    def request(self) -> Dict[str, Any]:
+        """Keyword arguments for chat.completions.create."""
+        return {
+            "model": self.model,
+            "messages": self._messages,
+            "response_format": self._response_format,
+        }
+
+    def retry_delay(self, attempt: int) -> float:
+        # Jittered so that calls failing together do not all retry together.
+        return settings.openai_retry_delay * attempt * random.uniform(0.5, 1.5)
+
+    def failed(self, exc: Exception, attempt: int, duration: float) -> bool:
+        """Record a call that raised; returns whether to retry it."""
+        OPENAI_REQUEST_SECONDS.labels(self.model, "error").observe(duration)
+        if self.breaker is not None:
+            self.breaker.record_failure(duration)
+        if self.admission is not None and isinstance(exc, RateLimitError):
+            self.admission.on_rate_limited(self.model)
+        if attempt == self.max_attempts:
+            return False
+        OPENAI_RETRIES.labels(self.model, "error").inc()
+        return True
+
+    def completed(
+        self, completion: Any, attempt: int, duration: float
+    ) -> Optional[FullProfileEvaluationResponseRaw]:
+        """
+        Validate a reply and record its outcome. Returns the result, or None
+        to retry with a correction prompt; raises once no attempt is left.
+        """
+        OPENAI_REQUEST_SECONDS.labels(self.model, "ok").observe(duration)
+
+        if completion is None:
+            if self.breaker is not None:
+                self.breaker.record_failure(duration)
+            if attempt == self.max_attempts:
+                raise RuntimeError("OpenAI completion failed without raising an exception")
+            OPENAI_RETRIES.labels(self.model, "empty").inc()
+            return None
+
+        llm_usage.record(getattr(completion, "usage", None))
+        content = completion.choices[0].message.content or ""
+        with span("validation.llm_output", attempt=attempt) as validation:
+            result, error_text = _parse_completion_content(content)
+            validation.set_attribute("valid", result is not None)
+        # Only a usable reply counts as a healthy call for the breaker.
+        if self.breaker is not None:
+            if result is not None:
+                self.breaker.record_success(duration)
+            else:
+                self.breaker.record_failure(duration)
+        if result is not None:
+            return result
+
+        if attempt == self.max_attempts:
+            raise RuntimeError(error_text)
+
+        OPENAI_RETRIES.labels(self.model, "invalid").inc()
+        self._messages = _build_correction_messages(self._base_messages, content, error_text)
+        return None
 
 
 def call_openai_structured(
@@ -186,531 +252,549 @@ def call_openai_structured(
     calculated_profile_score: int,
     calculated_interview_readiness: Dict[str, Any],
     target_company_label: str,
-) -> FullProfileEvaluationResponse:
-    client = OpenAI(api_key=api_key) if api_key else OpenAI()
-
-    system_instruction = (
-        "You are a career advisor specializing in the Indian tech market. Given the candidate's background, quiz responses, and goals, "
-        "produce a structured FullProfileEvaluationResponse focusing on prospects, role fit, gaps, and a roadmap.\n\n"
-        "CONTEXT: The user is based in India and looking for opportunities in the Indian tech ecosystem (Bangalore, Hyderabad, Pune, NCR) "
-        "or remote roles with Indian/global companies. Tailor all recommendations to be realistic and relevant for the Indian market.\n\n"
-        f"CRITICAL: SCORE CONSISTENCY RULES\n"
-        f"The user's profile_strength_score has been calculated as {calculated_profile_score}/100.\n"
-        f"The user's interview readiness has been independently calculated based on their practice, experience, and preparation.\n"
-        f"ALL percentage scores MUST be consistent with these calculated baselines:\n\n"
-        f"1. peer_comparison.metrics.profile_strength_percent: MUST be {calculated_profile_score} (exact match)\n"
-        f"2. interview_readiness.technical_interview_percent: MUST be {calculated_interview_readiness['technical_interview_percent']} (calculated independently, NOT dependent on profile_strength_score)\n"
-        f"3. interview_readiness.hr_behavioral_percent: MUST be {calculated_interview_readiness['hr_behavioral_percent']} (based on soft skills and experience)\n"
-        f"   NOTE: Interview readiness is based on quiz responses (problemSolving, systemDesign, portfolio, experience)\n"
-        f"   It can be higher or lower than profile_strength_score - they measure different things!\n\n"
-        f"4. peer_comparison.percentile: {max(0, calculated_profile_score - 5)} to {min(100, calculated_profile_score + 5)}\n"
-        f"5. success_likelihood.score_percent: {max(0, calculated_profile_score - 10)} to {min(100, calculated_profile_score + 5)}\n"
-        f"   - Should be reasonable given profile_strength_score\n\n"
-        f"IMPORTANT DISTINCTION:\n"
-        f"- profile_strength_score ({calculated_profile_score}%): Overall career strength (experience, skills, track record)\n"
-        f"- interview_readiness ({calculated_interview_readiness['technical_interview_percent']}%): Specifically how prepared they are for technical interviews\n"
-        f"- A person can have high interview readiness but lower profile strength (new grad who practices hard)\n"
-        f"- A person can have strong profile but lower interview readiness (experienced but not interview-prepped)\n\n"
-        f"CRITICAL: USE ACTUAL TARGET COMPANY IN ALL TEXT\n"
-        f"The user selected target company: '{target_company_label}'\n\n"
-        f"When generating ANY text field (areas_to_develop, technical_notes, success_likelihood.notes, peer_comparison.summary):\n"
-        f"- Use the ACTUAL company label: '{target_company_label}'\n"
-        f"- DO NOT default to 'FAANG' or 'Big Tech' unless that's what they selected\n\n"
-        f"Examples:\n"
-        f"- If target is 'High Growth Startups' → 'startup interview preparation' NOT 'FAANG interview preparation'\n"
-        f"- If target is 'Product Unicorns' → 'product company interview preparation'\n"
-        f"- If target is 'Service Companies' → 'service company interview preparation'\n"
-        f"- If target is 'FAANG / Big Tech' → 'FAANG / Big Tech interview preparation' (only if selected!)\n\n"
-        "Field guide for the input JSON:\n"
-        "- background: 'tech' = already works/studies in software; 'non-tech' = transitioning from another domain\n"
-        "- quizResponses.currentRole:\n"
-        "  * Tech roles: swe-product (Product Company SDE), swe-service (Service Company SDE), devops (DevOps/Cloud/Infra), qa-support (QA/Support/Other Technical)\n"
-        "  * Non-tech roles: non-tech-role, support-qa, other-engineering, student (Non-CS background)\n"
-        "  * Legacy: career-switcher (treat as non-tech)\n"
-        "- quizResponses.experience: '0-2', '3-5', '5-8', or '8+' years (NEW: 4 tiers instead of 3)\n"
-        "- quizResponses.targetRole:\n"
-        "  * Tech: backend-sde, fullstack-sde, frontend-sde, data-ml, devops-sre, mobile-dev, tech-lead\n"
-        "  * Non-tech: backend-dev, fullstack-dev, data-analyst, automation-qa, exploring\n"
-        "  * Legacy: faang-sde, backend, fullstack (still valid)\n"
-        "- quizResponses.problemSolving: 0-10, 11-50, 51-100, 100+ (coding practice intensity - DERIVED from codingActivity/learningActivity)\n"
-        "- quizResponses.systemDesign: multiple, once, not-yet (CRITICAL: 'multiple' indicates senior-level expertise - DERIVED from systemDesign comfort)\n"
-        "- quizResponses.portfolio: active-5+, limited-1-5, inactive, none (DEPRECATED: not collected in new flow)\n"
-        "- quizResponses.mockInterviews: weekly+, monthly, rarely, never (DEPRECATED: not collected in new flow)\n"
-        "- quizResponses.requirementType: Maps to primaryGoal (better-company, level-up, higher-comp, switch-domain, upskilling, career-switch, job-security, personal-interest)\n"
-        "- goals.topicOfInterest: ai-ml, web-development, mobile-development, data-science, cybersecurity, cloud-computing, blockchain, etc.\n\n"
-        "⚠️ CRITICAL: LOGICAL CONSISTENCY CHECK (Evaluate FIRST before making recommendations):\n"
-        "INPUT CONTRADICTIONS - Real-world skill progression rules:\n\n"
-        "1. SYSTEM DESIGN vs CODING CONTRADICTION:\n"
-        "   🚨 IMPOSSIBLE COMBINATION: systemDesign='multiple' + problemSolving < '51-100'\n"
-        "   Reality: You CANNOT have deep system design expertise without extensive coding practice.\n"
-        "   System design requires years of building production systems, which means 100s of problems solved.\n\n"
-        "   Resolution Rules:\n"
-        "   - If systemDesign='multiple' + problemSolving='0-10' or '11-50' + experience <= '3-5':\n"
-        "     → User likely misunderstood questions or is being aspirational\n"
-        "     → OVERRIDE: Treat as systemDesign='once' or 'not-yet'\n"
-        "     → Recommend Junior/Mid roles (NOT senior)\n"
-        "     → In profile_strength_notes: 'Strong interest in system design, but limited coding practice. Focus on solving 100+ problems first.'\n\n"
-        "   - If systemDesign='multiple' + problemSolving < '51-100' + experience in ['5-8', '8+'] + currentRole contains 'manager'/'architect':\n"
-        "     → Rare case: Transitioned to management/architecture, coding skills atrophied\n"
-        "     → Can recommend Architect/Lead roles BUT:\n"
-        "     → MUST flag in areas_to_develop: 'Hands-on coding skills - rusty from lack of practice'\n"
-        "     → In profile_strength_notes: 'Architecture experience is valuable, but hands-on coding needs refresh for IC roles.'\n\n"
-        "   - General rule: NEVER recommend Staff/Principal/Senior SDE if problemSolving < '51-100'\n"
-        "     → These roles require deep coding expertise, no exceptions\n\n"
-        "2. EXPERIENCE vs SKILLS CONTRADICTION:\n"
-        "   - If experience in ['5-8', '8+'] + problemSolving='0-10':\n"
-        "     → Likely stuck in maintenance roles or exaggerating experience\n"
-        "     → Recommend mid-level roles, NOT senior\n"
-        "     → Flag in notes: 'Experience level doesn't match interview preparation. Results may not reflect actual capability.'\n\n"
-        "3. PORTFOLIO vs CODING CONTRADICTION:\n"
-        "   - If portfolio='active-5+' + problemSolving='0-10':\n"
-        "     → Projects likely tutorials/clones, not production-grade\n"
-        "     → Good signal for potential, but not for senior roles\n\n"
-        "CRITICAL GUIDELINES FOR recommended_roles_based_on_interests:\n"
-        "1. SENIORITY MATCHING (HIGHEST PRIORITY - NEW 4-TIER SYSTEM):\n"
-        "   - 0-2 years → Entry/Junior/SDE-1 roles ONLY\n"
-        "   - 3-5 years → Mid-Level/SDE-2/Senior (lower-bound) roles\n"
-        "   - 5-8 years → Senior/SDE-3/Staff roles (IF coding skills match - see consistency check)\n"
-        "   - 8+ years → Staff/Principal/Lead/Architect roles (IF coding skills match - see consistency check)\n"
-        "   - systemDesign='multiple' + problemSolving >= '51-100' + experience in ['5-8', '8+'] → MUST include Staff/Principal/Architect roles\n"
-        "   - experience='8+' + strong skills → Prioritize Principal/Architect/Engineering Manager roles\n\n"
-        "2. TECHNICAL SKILLS ALIGNMENT:\n"
-        "   - problemSolving >= 51-100 + systemDesign != 'not-yet' → PRIORITIZE Engineering roles (Backend/Full Stack/SDE)\n"
-        "   - systemDesign='multiple' + problemSolving >= '51-100' → CRITICAL signal for senior technical roles (Staff/Principal)\n"
-        "   - systemDesign='multiple' WITHOUT strong coding (< 51-100) → See LOGICAL CONSISTENCY CHECK above - override system design claim\n"
-        "   - portfolio='active-5+' → Strong indicator for IC engineering roles\n\n"
-        "3. RESPECT TARGET ROLE:\n"
-        "   - If targetRole='faang-sde'/'backend'/'fullstack' → Top 3 recommendations MUST be engineering roles\n"
-        "   - If targetRole='tech-lead' → Include Lead/Architect roles\n"
-        "   - 🔍 CRITICAL: If targetRole='exploring'/'not-sure' OR targetRoleLabel contains 'Exploring':\n"
-        "     * User is still deciding their path - PROVIDE SPECIFIC SUGGESTIONS!\n"
-        "     * Based on their background, experience, skills, and topicOfInterest, suggest 3-5 CONCRETE roles\n"
-        "     * DO NOT just echo 'Not sure yet / Exploring' - that's not helpful!\n"
-        "     * Example: Non-tech + interested in AI/ML → suggest 'Data Analyst', 'Junior ML Engineer', 'Backend Engineer'\n"
-        "     * Example: Tech 0-2 years + web-development interest → suggest 'Junior Frontend Engineer', 'Full-Stack Engineer', 'Backend Engineer'\n"
-        "     * Use topicOfInterest as PRIMARY signal when targetRole is exploring\n\n"
-        "4. TECHNICAL ROLES ONLY - CRITICAL RESTRICTION:\n"
-        "   ❌ NEVER RECOMMEND NON-TECHNICAL ROLES:\n"
-        "   - Product Manager / Product Owner\n"
-        "   - UX Designer / UI Designer / Product Designer\n"
-        "   - Business Analyst / Data Analyst (non-coding)\n"
-        "   - Project Manager / Scrum Master\n"
-        "   - Technical Writer / Documentation Specialist\n"
-        "   - QA Manual Tester (non-automation)\n\n"
-        "   ✅ ONLY RECOMMEND HANDS-ON TECHNICAL/ENGINEERING ROLES:\n"
-        "   - Software Development Engineer (SDE-1/2/3)\n"
-        "   - Backend Engineer / Frontend Engineer / Full Stack Engineer\n"
-        "   - DevOps Engineer / Site Reliability Engineer (SRE)\n"
-        "   - Data Engineer / ML Engineer / AI Engineer\n"
-        "   - Mobile Engineer (iOS/Android)\n"
-        "   - Platform Engineer / Infrastructure Engineer\n"
-        "   - Security Engineer / Cloud Engineer\n"
-        "   - Tech Lead / Staff Engineer / Principal Engineer (for 5+ years)\n"
-        "   - Solutions Architect / System Architect (for systemDesign='multiple')\n\n"
-        "   RATIONALE: We are a technical education platform teaching coding, system design, and engineering skills.\n"
-        "   All recommendations must align with technical/hands-on engineering career paths.\n\n"
-        "5. INDIA MARKET CONTEXT:\n"
-        "   - Include Indian unicorns/startups: Flipkart, Swiggy, Zomato, CRED, PhonePe, Razorpay, Ola, Byju's, Freshworks, Zoho\n"
-        "   - Include product companies: Microsoft India, Google India, Amazon India, Adobe India, Oracle, SAP Labs\n"
-        "   - For topicOfInterest='fintech' → Mention Paytm, PhonePe, Razorpay, CRED\n"
-        "   - For topicOfInterest='ecommerce' → Mention Flipkart, Meesho, Myntra\n"
-        "   - For topicOfInterest='edtech' → Mention BYJU'S, Unacademy, Vedantu, upGrad\n"
-        "   - For topicOfInterest='healthtech' → Mention PharmEasy, Practo, 1mg\n\n"
-        "CRITICAL RULES FOR recommended_tools:\n"
-        "🚨 ABSOLUTE BAN - NEVER RECOMMEND THESE (Response will be REJECTED if found):\n"
-        "   ❌ LeetCode\n"
-        "   ❌ HackerRank\n"
-        "   ❌ GitHub / GitLab / Bitbucket\n"
-        "   ❌ Coursera / Udemy / GeeksForGeeks / CodeChef\n"
-        "   ❌ VS Code / IntelliJ IDEA / Turbo C / Dev C++\n"
-        "   ❌ Any basic IDE or generic learning platform\n\n"
-        "These are TOO BASIC and everyone already knows them. Recommending them shows lack of expertise.\n\n"
-        "✅ ONLY recommend SPECIFIC, PROFESSIONAL tools from these curated lists:\n\n"
-        "   NON-TECH BACKGROUND TOOL RECOMMENDATIONS:\n"
-        "   → Non-Tech → Backend Engineer:\n"
-        "      Core: Python, Flask, SQL, Git, Postman\n"
-        "      Guidance: Start with automating small tasks, practice REST API testing with Postman\n\n"
-        "   → Non-Tech → Full-Stack Engineer:\n"
-        "      Core: HTML, CSS, JavaScript (basics) → React + Node.js\n"
-        "      Sandboxes: Replit, CodeSandbox (for practice without local setup)\n"
-        "      Guidance: Start with frontend basics, then add backend gradually\n\n"
-        "   → Non-Tech → Data/ML Engineer:\n"
-        "      Core: Python, Pandas, NumPy, scikit-learn, Jupyter\n"
-        "      Guidance: Start with EDA on public datasets (Kaggle), focus on data cleaning\n\n"
-        "   → Non-Tech → Data Analyst:\n"
-        "      Core: Excel (advanced formulas), SQL, PowerBI/Tableau\n"
-        "      Guidance: Practice with Kaggle datasets, build dashboards\n\n"
-        "   TECH BACKGROUND TOOL RECOMMENDATIONS:\n"
-        "   → Tech → FAANG/Product SDE:\n"
-        "      Interview Prep: System Design Primer (GitHub), LLD/HLD prep materials\n"
-        "      Project Tools: Postman (API testing), Docker (containerization), GitHub Actions (CI/CD)\n"
-        "      Do NOT recommend LeetCode/HackerRank - assume they already know these\n\n"
-        "   → Tech → Full-stack / Startup Engineer:\n"
-        "      Stack: MERN stack tools (React DevTools, MongoDB Compass, Postman)\n"
-        "      DevOps: Docker basics, GitHub Actions, Vercel/Netlify deployment\n"
-        "      Guidance: Focus on rapid prototyping and deployment tools\n\n"
-        "   → Tech → Data/ML Engineer:\n"
-        "      ML Tools: PyTorch/TensorFlow, MLflow, Weights & Biases\n"
-        "      Data Pipeline: Airflow, Databricks basics, Great Expectations\n"
-        "      Guidance: Focus on productionizing models and data pipelines\n\n"
-        "   → Tech → Tech Lead/Architect:\n"
-        "      Design: Draw.io, Excalidraw, Miro (architecture diagrams)\n"
-        "      Cloud Infra: AWS/GCP tools (CloudFormation, Terraform)\n"
-        "      Monitoring: Datadog, New Relic, Prometheus + Grafana\n"
-        "      Guidance: Focus on system architecture, scaling, and team collaboration\n\n"
-        "   ADDITIONAL PROFESSIONAL TOOLS (pick 3-5 based on role):\n"
-        "   - API Testing: Postman, Insomnia, Thunder Client\n"
-        "   - Database Management: DataGrip, DBeaver, TablePlus\n"
-        "   - Monitoring: Prometheus + Grafana, Datadog, New Relic\n"
-        "   - Load Testing: k6, Locust, Apache JMeter\n"
-        "   - Error Tracking: Sentry, Rollbar, Bugsnag\n"
-        "   - Infrastructure: Terraform, Pulumi, Ansible\n"
-        "   - Containerization: Docker, Kubernetes Dashboard\n"
-        "   - CI/CD: GitHub Actions, Jenkins, ArgoCD\n"
-        "   - ML/Data: MLflow, Weights & Biases, Great Expectations\n\n"
-        "CRITICAL RULES FOR quick_wins:\n"
-        "❌ AVOID vague, generic suggestions like:\n"
-        "   - 'Improve coding skills'\n"
-        "   - 'Practice more problems'\n"
-        "   - 'Learn system design'\n\n"
-        "✅ PROVIDE SPECIFIC, ACTIONABLE quick wins (3-5 items) with clear steps:\n"
-        "   Format: '[ACTION] → [SPECIFIC OUTCOME] → [TIME ESTIMATE]'\n\n"
-        "   Use the following decision tree based on user's quiz responses:\n\n"
-        "   NON-TECH BACKGROUND QUICK WINS:\n"
-        "   → Current Role = 'non-tech' (sales, ops, design, etc.):\n"
-        "      'Start with basic programming: try \"Intro to Python\" (Scaler Topics / W3Schools). Build a small automation like Excel-to-CSV script.'\n\n"
-        "   → Current Role = 'it-services' (IT services / testing / support):\n"
-        "      'Brush up on coding fundamentals — loops, conditions. Try solving 5 problems on HackerRank.'\n\n"
-        "   → Current Role = 'technical' (Other technical but not software dev):\n"
-        "      'Revisit core CS concepts. Build a basic CRUD app using Python or Node.js.'\n\n"
-        "   → Current Role = 'fresh-graduate' (non-CS branch):\n"
-        "      'Learn DSA basics and attempt 10 beginner-level problems this week.'\n\n"
-        "   → Experience = '0' years:\n"
-        "      'Set up GitHub, complete 1 online course on programming basics.'\n\n"
-        "   → Experience = '0-2' years:\n"
-        "      'Create a mini-project — e.g., to-do app or data dashboard.'\n\n"
-        "   → Experience = '3-5' years:\n"
-        "      'Add measurable projects to your portfolio showing transition intent.'\n\n"
-        "   → Experience = '5+' years:\n"
-        "      'Update your resume headline to reflect transition goals (e.g., \"Operations Manager → Aspiring Backend Engineer\").'\n\n"
-        "   → Target Role = 'backend':\n"
-        "      'Build a small REST API using Flask/Django. Learn SQL basics.'\n\n"
-        "   → Target Role = 'fullstack':\n"
-        "      'Build a simple web app with HTML, CSS, JS. Host it on GitHub Pages.'\n\n"
-        "   → Target Role = 'data-ml':\n"
-        "      'Do 1 mini project using Pandas & scikit-learn (e.g., movie recommender).'\n\n"
-        "   → Target Role = 'data-analyst':\n"
-        "      'Explore Excel → SQL → Power BI sequence. Analyze a public dataset.'\n\n"
-        "   → Code Comfort = 'havent-tried' (Haven't tried yet):\n"
-        "      'Write your first \"Hello World\" program today — use Scaler Topics Playground.'\n\n"
-        "   → Code Comfort = 'follow-tutorials' (Can follow tutorials but struggle independently):\n"
-        "      'Practice 5 easy-level problems.'\n\n"
-        "   → Code Comfort = 'solve-problems' (Can solve simple problems):\n"
-        "      'Attempt 1 beginner DSA contest or solve 10 new problems in a week.'\n\n"
-        "   → Motivation = 'interest' (Interest in technology):\n"
-        "      'Explore open-source projects — try contributing small edits.'\n\n"
-        "   → Motivation = 'job-stability' (Job stability / future-proofing):\n"
-        "      'Learn a growing tech like Python or Cloud Fundamentals.'\n\n"
-        "   TECH BACKGROUND QUICK WINS:\n"
-        "   → Current Role = 'student-freshgrad' (Student / Fresh Grad):\n"
-        "      'Complete 10 DSA problems this week. Attend 1 coding contest.'\n\n"
-        "   → Current Role = 'swe-product' (Working SWE - Product):\n"
-        "      'Revise 1 core concept daily (System Design / DSA).'\n\n"
-        "   → Current Role = 'swe-service' (Working SWE - Service):\n"
-        "      'Try building a side project or switch tech stack exposure (MERN, backend).'\n\n"
-        "   → Current Role = 'career-switcher' (Career Switcher):\n"
-        "      'Start documenting learnings on GitHub and LinkedIn.'\n\n"
-        "   → Experience = '0' years:\n"
-        "      'Focus on fundamentals — arrays, loops, functions.'\n\n"
-        "   → Experience = '0-2' years:\n"
-        "      'Create a resume-ready project showing practical application.'\n\n"
-        "   → Experience = '3-5' years:\n"
-        "      'Mentor juniors or write blogs on tech concepts.'\n\n"
-        "   → Experience = '5+' years:\n"
-        "      'Prepare for leadership — learn system design + mentoring skills.'\n\n"
-        "   → Target Role = 'faang-sde' (FAANG / Product SDE):\n"
-        "      'Start a 90-day Code streak. Revise system design weekly.'\n\n"
-        "   → Target Role = 'backend' (Backend Engineer):\n"
-        "      'Build an API with Node/Express or Django.'\n\n"
-        "   → Target Role = 'data-ml' (Data/ML Engineer):\n"
-        "      'Try Kaggle competitions or build 1 model with scikit-learn.'\n\n"
-        "   → Target Role = 'fullstack' (Full-stack / Startup Engineer):\n"
-        "      'Create a complete CRUD app using MERN or Django + React.'\n\n"
-        "   → Target Role = 'tech-lead' (Tech Lead):\n"
-        "      'Write design docs for a personal project. Focus on scalability concepts.'\n\n"
-        "   → System Design = 'multiple' (Yes, multiple times):\n"
-        "      'Try low-level design problems (class diagrams, APIs).'\n\n"
-        "   → System Design = 'once' (Yes, once):\n"
-        "      'Read 2 new design case studies (TinyURL, Instagram).'\n\n"
-        "   → System Design = 'not-yet' (Not yet):\n"
-        "      'Watch 1 short \"System Design for Beginners\" video today.'\n\n"
-        "   → Portfolio = 'active-5+' (GitHub active - 5+ repos):\n"
-        "      'Add README, host one project live.'\n\n"
-        "   → Portfolio = 'limited-1-5' (GitHub limited - 1-5 repos):\n"
-        "      'Commit 1 new project this week.'\n\n"
-        "   → Portfolio = 'inactive' (GitHub inactive):\n"
-        "      'Upload your practice code or course projects.'\n\n"
-        "   → Portfolio = 'none' (No GitHub):\n"
-        "      'Create a GitHub account and push first project today.'\n\n"
-        "   IMPLEMENTATION GUIDELINES:\n"
-        "   - Select 3-5 most relevant quick wins based on the user's specific profile\n"
-        "   - Prioritize based on: current role → experience → target role → skills\n"
-        "   - Combine related suggestions when appropriate\n"
-        "   - Ensure actionable items that can be completed in 1-4 weeks\n"
-        "   - Use the exact wording provided above, but adapt if multiple conditions apply\n\n"
-        "NOTE: opportunities_you_qualify_for is generated using intelligent logic based on user profile.\n"
-        "Do NOT include this field in your response - it will be populated by the backend.\n\n"
-        "VALIDATION CHECKLIST (Internal - Review Before Finalizing):\n"
-        "☑ Does EVERY recommended role match experience level?\n"
-        "☑ Does systemDesign='multiple' lead to senior/staff roles?\n"
-        "☑ Are ALL roles HANDS-ON TECHNICAL/ENGINEERING roles (no PM/UX/BA/QA Manual)?\n"
-        "☑ 🚨 CRITICAL: Check recommended_tools does NOT contain: LeetCode, HackerRank, GitHub, Coursera, VS Code\n"
-        "☑ Are recommended_tools SPECIFIC professional tools (Postman, Docker, Terraform, etc)?\n"
-        "☑ Are quick_wins using the EXACT wording from the decision tree above?\n"
-        "☑ Are quick_wins DETAILED with specific actions (not generic 'practice more')?\n"
-        "☑ Does targetRole align with top 3 recommendations?\n"
-        "☑ Zero non-technical roles in the entire response?\n\n"
-        "CRITICAL: FORMAT FOR experience_benchmark:\n"
-        "- your_experience_years: Use ONLY numbers like '0-2', '3-5', '5-8', '8+' (NO 'years' or 'year' suffix)\n"
-        "- typical_for_target_role_years: Use ONLY numbers like '0-2', '3-5', '5-8', '8+' (NO 'years' or 'year' suffix)\n"
-        "- Frontend will automatically append 'years' when displaying - do NOT include it in your response\n\n"
-        "In your advice, acknowledge when values show limited exposure (e.g., not-yet, none, never) and tailor guidance for the user's background pivot."
+) -> FullProfileEvaluationResponseRaw:
+    client = get_openai_client(api_key)
+    call = _StructuredCall(
+        openai_model=openai_model,
+        input_payload=input_payload,
+        calculated_profile_score=calculated_profile_score,
+        calculated_interview_readiness=calculated_interview_readiness,
+        target_company_label=target_company_label,
     )
 
-    schema = FullProfileEvaluationResponseRaw.model_json_schema()
-
-    def _apply_json_schema_normalizers(node: Any) -> None:
-        if isinstance(node, dict):
-            # Ensure $ref nodes have no sibling keywords; OpenAI rejects any extras.
-            if "$ref" in node and len(node) > 1:
-                ref_value = node["$ref"]
-                node.clear()
-                node["$ref"] = ref_value
-
-            if node.get("type") == "object":
-                props = node.setdefault("properties", {})
-                if not isinstance(props, dict):
-                    raise TypeError("Object schema 'properties' must be a mapping")
-
-                node["additionalProperties"] = False
-                node["required"] = list(props.keys())
-
-                for child in props.values():
-                    _apply_json_schema_normalizers(child)
-            if "items" in node:
-                _apply_json_schema_normalizers(node["items"])
-            for key in ("oneOf", "anyOf", "allOf"):
-                if key in node and isinstance(node[key], list):
-                    for child in node[key]:
-                        _apply_json_schema_normalizers(child)
-            if "$defs" in node and isinstance(node["$defs"], dict):
-                for child in node["$defs"].values():
-                    _apply_json_schema_normalizers(child)
-            if "definitions" in node and isinstance(node["definitions"], dict):
-                for child in node["definitions"].values():
-                    _apply_json_schema_normalizers(child)
-        elif isinstance(node, list):
-            for child in node:
-                _apply_json_schema_normalizers(child)
-
-    _apply_json_schema_normalizers(schema)
-
-    base_messages = [
-        {"role": "system", "content": system_instruction},
-        {
-            "role": "user",
-            "content": (
-                "Using this input JSON, return only a JSON object that matches FullProfileEvaluationResponse.\n\n"
-                + json.dumps(input_payload)
-            ),
-        },
-    ]
+    for attempt in call.attempts():
+        call.allow()
+        if call.admission is not None:
+            with call.admitting(attempt):
+                call.admission.acquire(openai_model, call.estimated_tokens())
+        started = perf_counter()
+        try:
+            with call.attempt_span(attempt):
+                completion = client.chat.completions.create(**call.request())
+        except Exception as exc:  # pragma: no cover - network/service errors
+            if not call.failed(exc, attempt, perf_counter() - started):
+                raise
+        else:
+            result = call.completed(completion, attempt, perf_counter() - started)
+            if result is not None:
+                return result
+        sleep(call.retry_delay(attempt))
 
-    messages = list(base_messages)
+    raise RuntimeError("Exhausted attempts without valid response")
+
+
+async def call_openai_structured_async(
+    *,
+    api_key: Optional[str],
+    openai_model: str,
+    input_payload: Dict[str, Any],
+    calculated_profile_score: int,
+    calculated_interview_readiness: Dict[str, Any],
+    target_company_label: str,
+) -> FullProfileEvaluationResponseRaw:
+    """Async twin of call_openai_structured; never blocks the event loop."""
+    client = get_async_openai_client(api_key)
+    call = _StructuredCall(
+        openai_model=openai_model,
+        input_payload=input_payload,
+        calculated_profile_score=calculated_profile_score,
+        calculated_interview_readiness=calculated_interview_readiness,
+        target_company_label=target_company_label,
+    )
 
-    for attempt in range(1, 4):
-        completion = None
+    for attempt in call.attempts():
+        call.allow()
+        if call.admission is not None:
+            with call.admitting(attempt):
+                await call.admission.acquire_async(openai_model, call.estimated_tokens())
+        started = perf_counter()
         try:
-            completion = client.chat.completions.create(
-                model=openai_model,
-                messages=messages,
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "FullProfileEvaluationResponse",
-                        "schema": schema,
-                        "strict": True,
-                    },
-                },
-            )
+            with call.attempt_span(attempt):
+                completion = await client.chat.completions.create(**call.request())
         except Exception as exc:  # pragma: no cover - network/service errors
-            if attempt == 3:
+            if not call.failed(exc, attempt, perf_counter() - started):
                 raise
-            sleep(1.5 * attempt)
-            continue
+        else:
+            result = call.completed(completion, attempt, perf_counter() - started)
+            if result is not None:
+                return result
+        await asyncio.sleep(call.retry_delay(attempt))
 
-        if completion is None:
-            if attempt == 3:
-                raise RuntimeError("OpenAI completion failed without raising an exception")
-            sleep(1.5 * attempt)
-            continue
+    raise RuntimeError("Exhausted attempts without valid response")
 
-        content = completion.choices[0].message.content or ""
-        if not content:
-            error_text = "Empty response from OpenAI chat.completions"
-        else:
-            try:
-                raw_obj = json.loads(content)
-            except json.JSONDecodeError as exc:
-                error_text = (
-                    "Model response is not valid JSON: "
-                    f"{exc}\nResponse text: {content}"
-                )
-            else:
-                try:
-                    raw_instance = FullProfileEvaluationResponseRaw.model_validate(raw_obj)
-                except ValidationError as exc:
-                    error_text = (
-                        "Model response failed validation against FullProfileEvaluationResponse: "
-                        f"{exc}"
-                    )
-                else:
-                    return enrich_full_profile_evaluation(raw_instance)
-
-        if attempt == 3:
-            raise RuntimeError(error_text)
 
-        correction_prompt = (
-            "The previous response did not satisfy the required schema. "
-            f"Error details:\n{error_text}\n\n"
-            "Please respond again with only a JSON object that strictly matches the schema."
+def compute_deterministic_sections(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run every rule module for a normalized payload.
+
+    Pure and fast (no I/O), so callers can show these sections before the
+    LLM answers. Returns the LLM prompt inputs alongside a partial,
+    JSON-ready ``profile_evaluation``.
+    """
+    background = payload.get("background", "")
+    quiz_responses = payload.get("quizResponses", {})
+
+    with span("rules.profile_strength"):
+        scoring_result = calculate_profile_strength(background, quiz_responses)
+    score = scoring_result["score"]
+
+    # Calculate interview readiness independently (not dependent on profile strength score)
+    with span("rules.interview_readiness"):
+        interview_readiness_result = calculate_interview_readiness(background, quiz_responses)
+
+    target_company = quiz_responses.get("targetCompany", "")
+    target_company_label = quiz_responses.get("targetCompanyLabel") or get_company_label(target_company)
+
+    with span("rules.profile_notes"):
+        personalized_notes = generate_profile_strength_notes(background, quiz_responses, score)
+
+    # Check if there are contradictions in the profile (optional feature)
+    if scoring_result.get("has_contradictions", False):
+        contradiction_note = scoring_result.get("contradiction_note", "")
+        if contradiction_note:
+            personalized_notes = f"{contradiction_note} {personalized_notes}"
+
+    with span("rules.job_opportunities"):
+        opportunities = generate_job_opportunities(background, quiz_responses)
+
+    # Use v3 system: Generate recommended roles with timeline, copy, goals, and action items
+    with span("rules.recommended_roles"):
+        recommended_roles_v3 = generate_recommended_roles(
+            background=background,
+            quiz_responses=quiz_responses
         )
-        messages = base_messages + [
-            {"role": "assistant", "content": content or ""},
-            {"role": "user", "content": correction_prompt},
-        ]
-        sleep(1.5 * attempt)
 
-    raise RuntimeError("Exhausted attempts without valid response")
+    with span("rules.current_profile"):
+        current_profile = generate_current_profile_summary(background, quiz_responses)
+    with span("rules.tools"):
+        recommended_tools = generate_tool_recommendations(background, quiz_responses)
+    with span("rules.peer_group"):
+        peer_group_description = generate_peer_group_description(background, quiz_responses)
+    with span("rules.quick_wins"):
+        quick_wins = generate_quick_wins(background, quiz_responses)
+
+    profile_evaluation = {
+        "profile_strength_score": score,
+        "profile_strength_notes": personalized_notes,
+        "current_profile": current_profile,
+        "recommended_tools": recommended_tools,
+        "interview_readiness": {
+            "technical_interview_percent": interview_readiness_result["technical_interview_percent"],
+            "hr_behavioral_percent": interview_readiness_result["hr_behavioral_percent"],
+        },
+        "peer_comparison": {
+            "peer_group_description": peer_group_description,
+            "metrics": {"profile_strength_percent": score},
+        },
+        "quick_wins": quick_wins,
+        "opportunities_you_qualify_for": [card.model_dump(mode="json") for card in opportunities],
+        "recommended_roles_based_on_interests": [
+            role.model_dump(mode="json") for role in recommended_roles_v3
+        ][:3],
+    }
+
+    return {
+        "scoring_result": scoring_result,
+        "interview_readiness_result": interview_readiness_result,
+        "target_company_label": target_company_label,
+        "profile_evaluation": profile_evaluation,
+    }
+
+
+def apply_deterministic_overlay(
+    llm_result: FullProfileEvaluationResponseRaw,
+    payload: Dict[str, Any],
+    deterministic: Dict[str, Any],
+) -> FullProfileEvaluationResponse:
+    """
+    Merge the LLM-written sections with the output of the rule modules into
+    the full response.
 
+    ``payload`` is the canonical payload and ``deterministic`` its
+    compute_deterministic_sections() output, so the rule sections can be
+    recomputed against stored LLM output (see reoverlay) without an OpenAI
+    call.
+    """
+    background = payload.get("background", "")
+    quiz_responses = payload.get("quizResponses", {})
+    llm_profile = llm_result.model_dump()["profile_evaluation"]
+    rules = deterministic["profile_evaluation"]
+    score = rules["profile_strength_score"]
+
+    llm_peer = llm_profile["peer_comparison"]
+    profile_evaluation = {
+        "profile_strength_score": score,
+        "profile_strength_notes": rules["profile_strength_notes"],
+        "current_profile": rules["current_profile"],
+        "skill_analysis": llm_profile["skill_analysis"],
+        "recommended_tools": rules["recommended_tools"],
+        "experience_benchmark": llm_profile["experience_benchmark"],
+        # Interview readiness is calculated independently of profile_strength_score
+        "interview_readiness": {
+            **rules["interview_readiness"],
+            "technical_notes": llm_profile["interview_readiness"]["technical_notes"],
+        },
+        "peer_comparison": {
+            "percentile": llm_peer["percentile"],
+            "peer_group_description": rules["peer_comparison"]["peer_group_description"],
+            "summary": llm_peer["summary"],
+            "metrics": {
+                # profile_strength_percent is the rule score. The LLM was only
+                # ever told to copy that score, and it no longer writes the field.
+                **rules["peer_comparison"]["metrics"],
+                "better_than_peers_percent": llm_peer["metrics"]["better_than_peers_percent"],
+            },
+        },
+        "success_likelihood": llm_profile["success_likelihood"],
+        "quick_wins": rules["quick_wins"],
+        "opportunities_you_qualify_for": rules["opportunities_you_qualify_for"],
+        "recommended_roles_based_on_interests": rules["recommended_roles_based_on_interests"],
+        "badges": llm_profile["badges"],
+    }
+
+    result = enrich_full_profile_evaluation({"profile_evaluation": profile_evaluation})
+
+    # Potential is measured from the percentile after the motivational floor.
+    peer_comparison = result.profile_evaluation.peer_comparison
+    peer_comparison.potential_percentile = calculate_potential_percentile(
+        peer_comparison.percentile, background, quiz_responses, score
+    )
+
+    return result
+
+
+def _degraded_evaluation(
+    payload: Dict[str, Any],
+    deterministic: Dict[str, Any],
+) -> FullProfileEvaluationResponse:
+    """A complete response with rule-based stand-ins for the LLM sections; never cached."""
+    logger.warning("⚡ LLM unavailable - answering with rule-based fallbacks (degraded, not cached)")
+    DEGRADED_EVALUATIONS.inc()
+    with observe_stage("fallback"):
+        fallback = FullProfileEvaluationResponseRaw.model_validate(
+            generate_fallback_llm_sections(
+                payload.get("background", ""),
+                payload.get("quizResponses", {}),
+                deterministic["scoring_result"]["score"],
+                deterministic["interview_readiness_result"],
+                deterministic["target_company_label"],
+            )
+        )
+    with observe_stage("overlay"):
+        result = apply_deterministic_overlay(fallback, payload, deterministic)
+    result.degraded = True
+    return result
+
+
+def _require_api_key() -> str:
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY is not set. Provide it via the environment variable.")
+    return api_key
+
+
+@traced("run_poc")
 def run_poc(
     *,
     input_payload: Optional[Dict[str, Any]] = None,
+    cache_repository: Optional[CacheRepository] = None,
 ) -> FullProfileEvaluationResponse:
 
     payload_input = input_payload if input_payload is not None else DEFAULT_INPUT
-    payload = _normalise_payload(payload_input)
+    payload = canonical_payload(payload_input)
 
     model_name = "gpt-4o"
 
-    cache_repo = CacheRepository()
+    cache_repo = cache_repository or CacheRepository()
 
-    cache_key = cache_repo.generate_cache_key(payload, model_name)
-    cached_json = cache_repo.get(cache_key, model_name)
+    cache_key = canonical_cache_key(payload)
+    with observe_stage("cache_lookup"):
+        cached_json = cache_repo.get(cache_key, get_cache_namespace(model_name))
 
     if cached_json:
         logger.info("✅ CACHE HIT - Returning cached response (no OpenAI API call, instant response!)")
-        return FullProfileEvaluationResponse.model_validate_json(cached_json)
+        with observe_stage("validation"):
+            return FullProfileEvaluationResponse.model_validate_json(cached_json)
 
     logger.info("🔴 CACHE MISS - Calling OpenAI API (this will cost money and take 2-5 seconds)")
 
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY is not set. Provide it via the environment variable.")
+    with observe_stage("scoring"):
+        deterministic = compute_deterministic_sections(payload)
+    prompt_fingerprint = get_llm_request_template().fingerprint
 
-    background = payload.get("background", "")
-    quiz_responses = payload.get("quizResponses", {})
+    # Stored LLM output for the same prompt only needs the current rules re-applied.
+    with observe_stage("raw_cache_lookup"):
+        raw_json = cache_repo.get_raw(cache_key, model_name, prompt_fingerprint)
+    if raw_json:
+        llm_result = FullProfileEvaluationResponseRaw.model_validate_json(raw_json)
+    else:
+        try:
+            with observe_stage("llm"):
+                llm_result = call_openai_structured(
+                    api_key=_require_api_key(),
+                    openai_model=model_name,
+                    input_payload=payload,
+                    calculated_profile_score=deterministic["scoring_result"]["score"],
+                    calculated_interview_readiness=deterministic["interview_readiness_result"],
+                    target_company_label=deterministic["target_company_label"],
+                )
+        except LLMUnavailable:
+            return _degraded_evaluation(payload, deterministic)
+        with observe_stage("raw_cache_write"):
+            cache_repo.set_raw(cache_key, model_name, prompt_fingerprint, payload, llm_result.model_dump_json())
 
-    scoring_result = calculate_profile_strength(background, quiz_responses)
-    calculated_score = scoring_result["score"]
+    with observe_stage("overlay"):
+        result = apply_deterministic_overlay(llm_result, payload, deterministic)
 
-    # Calculate interview readiness independently (not dependent on profile strength score)
-    interview_readiness_result = calculate_interview_readiness(background, quiz_responses)
+    with observe_stage("cache_write"):
+        cache_repo.set(
+            cache_key, get_cache_namespace(model_name), canonical_response_json(result.model_dump(mode="json"))
+        )
+    logger.info("💾 Response cached successfully - next identical request will be instant!")
 
-    from src.utils.label_mappings import get_company_label
-    target_company = quiz_responses.get("targetCompany", "")
-    target_company_label = quiz_responses.get("targetCompanyLabel") or get_company_label(target_company)
+    return result
 
-    result = call_openai_structured(
-        api_key=api_key,
-        openai_model=model_name,
-        input_payload=payload,
-        calculated_profile_score=calculated_score,
-        calculated_interview_readiness=interview_readiness_result,
-        target_company_label=target_company_label,
-    )
 
-    hardcoded_quick_wins = generate_quick_wins(background, quiz_responses)
-    hardcoded_opportunities = generate_job_opportunities(background, quiz_responses)
-    hardcoded_tools = generate_tool_recommendations(background, quiz_responses)
-    result_dict = result.model_dump()
-    result_dict["profile_evaluation"]["profile_strength_score"] = scoring_result["score"]
+@traced("evaluate_and_cache")
+async def evaluate_and_cache_async(
+    payload: Dict[str, Any],
+    cache_key: str,
+    model_name: str,
+    cache_repo: AsyncCacheRepository,
+    deterministic: Optional[Dict[str, Any]] = None,
+) -> Tuple[FullProfileEvaluationResponse, str]:
+    """
+    Evaluate a cache miss and store it; the entry point for callers that
+    already hold the canonical payload and its cache key (the bulk and
+    warmup CLIs). Does not consult the response cache or coalesce calls.
+
+    ``deterministic`` is compute_deterministic_sections(payload) when the
+    caller has already run the rule modules. The overlay is the only
+    validation; its JSON is serialized once in canonical form
+    (canonical_response_json), written to the cache and returned with it. While the OpenAI circuit breaker is open the result
+    is a degraded one (``result.degraded``), which is returned but not stored.
+    """
+    if deterministic is None:
+        with observe_stage("scoring"):
+            deterministic = compute_deterministic_sections(payload)
+    prompt_fingerprint = get_llm_request_template().fingerprint
+
+    # Stored LLM output for the same prompt only needs the current rules re-applied.
+    with observe_stage("raw_cache_lookup"):
+        raw_json = await cache_repo.get_raw(cache_key, model_name, prompt_fingerprint)
+    if raw_json:
+        llm_result = FullProfileEvaluationResponseRaw.model_validate_json(raw_json)
+    else:
+        try:
+            with observe_stage("llm"):
+                llm_result = await call_openai_structured_async(
+                    api_key=_require_api_key(),
+                    openai_model=model_name,
+                    input_payload=payload,
+                    calculated_profile_score=deterministic["scoring_result"]["score"],
+                    calculated_interview_readiness=deterministic["interview_readiness_result"],
+                    target_company_label=deterministic["target_company_label"],
+                )
+        except LLMUnavailable:
+            result = _degraded_evaluation(payload, deterministic)
+            return result, canonical_response_json(result.model_dump(mode="json"))
+        with observe_stage("raw_cache_write"):
+            await cache_repo.set_raw(
+                cache_key, model_name, prompt_fingerprint, payload, llm_result.model_dump_json()
+            )
 
-    # Override interview readiness with calculated values (independent of profile_strength_score)
-    interview_readiness = result_dict["profile_evaluation"]["interview_readiness"]
-    interview_readiness["technical_interview_percent"] = interview_readiness_result["technical_interview_percent"]
-    interview_readiness["hr_behavioral_percent"] = interview_readiness_result["hr_behavioral_percent"]
+    with observe_stage("overlay"):
+        result = apply_deterministic_overlay(llm_result, payload, deterministic)
 
-    personalized_notes = generate_profile_strength_notes(background, quiz_responses, scoring_result["score"])
+    with observe_stage("cache_write"):
+        result_json = canonical_response_json(result.model_dump(mode="json"))
+        await cache_repo.set(cache_key, get_cache_namespace(model_name), result_json)
+    logger.info("💾 Response cached successfully - next identical request will be instant!")
 
-    # Check if there are contradictions in the profile (optional feature)
-    if scoring_result.get("has_contradictions", False):
-        contradiction_note = scoring_result.get("contradiction_note", "")
-        if contradiction_note:
-            personalized_notes = f"{contradiction_note} {personalized_notes}"
+    return result, result_json
 
-    result_dict["profile_evaluation"]["profile_strength_notes"] = personalized_notes
 
-    result_dict["profile_evaluation"]["quick_wins"] = hardcoded_quick_wins
-    result_dict["profile_evaluation"]["opportunities_you_qualify_for"] = hardcoded_opportunities
-    result_dict["profile_evaluation"]["recommended_tools"] = hardcoded_tools
+async def _cached_or_evaluated_async(
+    input_payload: Optional[Dict[str, Any]],
+    cache_repository: Optional[AsyncCacheRepository],
+) -> Tuple[str, str, Optional[FullProfileEvaluationResponse]]:
+    """
+    (cache key, response JSON, model) for a payload. A cache hit returns the
+    stored JSON as-is and no model; a miss returns the freshly evaluated model
+    and its JSON.
+    """
+    payload_input = input_payload if input_payload is not None else DEFAULT_INPUT
+    payload = canonical_payload(payload_input)
 
-    current_profile_summary = generate_current_profile_summary(background, quiz_responses)
-    result_dict["profile_evaluation"]["current_profile"] = current_profile_summary
+    model_name = "gpt-4o"
 
-    peer_comparison = result_dict["profile_evaluation"]["peer_comparison"]
-    current_percentile = peer_comparison.get("percentile", 50)
+    cache_repo = cache_repository or AsyncCacheRepository()
 
-    peer_group_desc = generate_peer_group_description(background, quiz_responses)
-    potential_percentile = calculate_potential_percentile(
-        current_percentile, background, quiz_responses, scoring_result["score"]
-    )
+    cache_key = canonical_cache_key(payload)
+    request_frequency.record(cache_key, model_name)
+    with observe_stage("cache_lookup"):
+        cached_json = await cache_repo.get(cache_key, get_cache_namespace(model_name))
 
-    peer_comparison["peer_group_description"] = peer_group_desc
-    peer_comparison["potential_percentile"] = potential_percentile
+    if cached_json:
+        logger.info("✅ CACHE HIT - Returning cached response (no OpenAI API call, instant response!)")
+        return cache_key, cached_json, None
 
-    target_role = quiz_responses.get("targetRole", "")
-    target_company = quiz_responses.get("targetCompany", "")
-    current_role = quiz_responses.get("currentRole", "")
-    experience = quiz_responses.get("experience", "")
-    recommended_roles = result_dict["profile_evaluation"]["recommended_roles_based_on_interests"]
-
-    # Filter and rerank roles based on current role, target role, and experience
-    recommended_roles = _filter_and_rerank_roles(
-        recommended_roles,
-        current_role,
-        target_role,
-        experience
+    logger.info("🔴 CACHE MISS - Calling OpenAI API (this will cost money and take 2-5 seconds)")
+
+    # Identical payloads arriving while the first one is still with the LLM
+    # share its result instead of paying for another completion.
+    result, result_json = await evaluation_flights.run(
+        cache_key,
+        lambda: evaluate_and_cache_async(payload, cache_key, model_name, cache_repo),
     )
+    return cache_key, result_json, result
 
-    # Use v3 system: Generate recommended roles with timeline, copy, goals, and action items
-    recommended_roles_v3 = generate_recommended_roles(
-        background=background,
-        quiz_responses=quiz_responses
+
+@traced("run_poc")
+async def run_poc_async(
+    *,
+    input_payload: Optional[Dict[str, Any]] = None,
+    cache_repository: Optional[AsyncCacheRepository] = None,
+) -> FullProfileEvaluationResponse:
+    """Non-blocking variant of run_poc."""
+    _, response_json, result = await _cached_or_evaluated_async(input_payload, cache_repository)
+    if result is None:
+        with observe_stage("validation"):
+            result = FullProfileEvaluationResponse.model_validate_json(response_json)
+    return result
+
+
+@traced("run_poc")
+async def run_poc_json_async(
+    *,
+    input_payload: Optional[Dict[str, Any]] = None,
+    cache_repository: Optional[AsyncCacheRepository] = None,
+) -> Tuple[str, str, bool]:
+    """
+    run_poc_async for callers that only send the evaluation on, as used by
+    the HTTP API: returns the canonical cache key, the serialized
+    FullProfileEvaluationResponse and whether it is degraded (a rule-based
+    fallback that was not cached).
+
+    Cache hits are returned exactly as stored, with no Pydantic round trip.
+    That is safe because the cache namespace fingerprints models.py, so a
+    stored entry always matches the current schema.
+    """
+    cache_key, response_json, result = await _cached_or_evaluated_async(input_payload, cache_repository)
+    return cache_key, response_json, result is not None and result.degraded
+
+
+async def stream_run_poc_async(
+    *,
+    input_payload: Optional[Dict[str, Any]] = None,
+    cache_repository: Optional[AsyncCacheRepository] = None,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Incremental variant of run_poc_async.
+
+    Yields ("deterministic", partial_dict) as soon as the rule modules have
+    run, then ("complete", FullProfileEvaluationResponse) once the LLM-backed
+    sections are merged in. A cache hit yields only the "complete" event.
+    """
+    payload_input = input_payload if input_payload is not None else DEFAULT_INPUT
+    payload = canonical_payload(payload_input)
+
+    model_name = "gpt-4o"
+
+    cache_repo = cache_repository or AsyncCacheRepository()
+
+    cache_key = canonical_cache_key(payload)
+    request_frequency.record(cache_key, model_name)
+    with observe_stage("cache_lookup"):
+        cached_json = await cache_repo.get(cache_key, get_cache_namespace(model_name))
+
+    if cached_json:
+        logger.info("✅ CACHE HIT - Returning cached response (no OpenAI API call, instant response!)")
+        with observe_stage("validation"):
+            cached_result = FullProfileEvaluationResponse.model_validate_json(cached_json)
+        yield "complete", cached_result
+        return
+
+    with observe_stage("scoring"):
+        deterministic = compute_deterministic_sections(payload)
+    yield "deterministic", {"profile_evaluation": deterministic["profile_evaluation"]}
+
+    logger.info("🔴 CACHE MISS - Calling OpenAI API (this will cost money and take 2-5 seconds)")
+
+    result, _ = await evaluation_flights.run(
+        cache_key,
+        lambda: evaluate_and_cache_async(payload, cache_key, model_name, cache_repo, deterministic),
     )
+    yield "complete", result
 
-    # Convert to dict format for result_dict
-    recommended_roles_dicts = [role.model_dump() for role in recommended_roles_v3]
 
-    result_dict["profile_evaluation"]["recommended_roles_based_on_interests"] = recommended_roles_dicts[:3]
+async def run_poc_batch_async(
+    input_payloads: List[Dict[str, Any]],
+    *,
+    cache_repository: Optional[AsyncCacheRepository] = None,
+    max_concurrency: Optional[int] = None,
+) -> AsyncIterator[Tuple[List[int], Optional[str], Optional[Exception]]]:
+    """
+    Evaluate many payloads, yielding results as they complete.
 
-    result = FullProfileEvaluationResponse.model_validate(result_dict)
+    Payloads are deduplicated by cache key and all cache hits are fetched with
+    one multi-key lookup. Misses run at most ``max_concurrency`` at a time.
+    Each yield is (input indices, result JSON, error) for one distinct
+    payload; exactly one of result JSON and error is set. Cached results are
+    passed on as stored.
+    """
+    model_name = "gpt-4o"
+    cache_repo = cache_repository or AsyncCacheRepository()
+    limit = max_concurrency or settings.batch_max_concurrency
+
+    payloads: Dict[str, Dict[str, Any]] = {}
+    indices: Dict[str, List[int]] = {}
+    for index, payload_input in enumerate(input_payloads):
+        payload = canonical_payload(payload_input)
+        cache_key = canonical_cache_key(payload)
+        request_frequency.record(cache_key, model_name)
+        payloads.setdefault(cache_key, payload)
+        indices.setdefault(cache_key, []).append(index)
+
+    with observe_stage("cache_lookup"):
+        cached = await cache_repo.get_many(payloads.keys(), get_cache_namespace(model_name))
+    logger.info(
+        f"Batch of {len(input_payloads)} payloads: {len(payloads)} distinct, "
+        f"{len(cached)} cached, {len(payloads) - len(cached)} to evaluate"
+    )
 
-    result_json = result.model_dump_json()
-    cache_repo.set(cache_key, model_name, result_json)
-    logger.info("💾 Response cached successfully - next identical request will be instant!")
+    for cache_key, cached_json in cached.items():
+        yield indices[cache_key], cached_json, None
 
-    return FullProfileEvaluationResponse.model_validate_json(result_json)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def evaluate(cache_key: str) -> Tuple[str, Optional[str], Optional[Exception]]:
+        async with semaphore:
+            try:
+                _, result_json = await evaluation_flights.run(
+                    cache_key,
+                    lambda: evaluate_and_cache_async(
+                        payloads[cache_key], cache_key, model_name, cache_repo
+                    ),
+                )
+                return cache_key, result_json, None
+            except Exception as exc:
+                logger.error(f"Batch evaluation failed for key {cache_key[:16]}...: {exc}")
+                return cache_key, None, exc
+
+    tasks = [
+        asyncio.ensure_future(evaluate(cache_key))
+        for cache_key in payloads
+        if cache_key not in cached
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            cache_key, result_json, error = await next_done
+            yield indices[cache_key], result_json, error
+    finally:
+        # The consumer went away (e.g. client disconnect): don't start the rest.
+        for task in tasks:
+            task.cancel()
 
 
 def main() -> int:
@@ -0,0 +1,53 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, TypeVar
+
+from src.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    In-process request coalescing ("single flight").
+
+    The first caller for a key starts the work; callers that arrive with the
+    same key while it is still running await the same task instead of
+    repeating it. The work runs in its own task, so a leader whose client
+    disconnects does not cancel the result its followers are waiting for.
+    """
+
+    def __init__(self, name: str = "single_flight"):
+        self._name = name
+        self._in_flight: Dict[str, "asyncio.Task[T]"] = {}
+        self._executions = 0
+        self._coalesced = 0
+
+    async def run(self, key: str, work: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+
+        if task is not None:
+            self._coalesced += 1
+            logger.info(f"🔗 {self._name}: joined in-flight work for key {key[:16]}...")
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(work())
+        self._in_flight[key] = task
+        self._executions += 1
+        task.add_done_callback(lambda finished: self._forget(key, finished))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: "asyncio.Task[T]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved even if every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executions": self._executions,
+            "coalesced": self._coalesced,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,157 @@
+"""
+Regression checks for the bulk CLI's cache-miss path, evaluated and
+degraded, with the completion replayed from a cassette (no network, no
+Postgres).
+
+Run from backend/:
+    python -m unittest discover -s tests
+"""
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from loadtest.mock_openai import build_evaluation  # noqa: E402
+from src.config.settings import settings  # noqa: E402
+from src.repositories.cache_repository import AsyncCacheRepository  # noqa: E402
+from src.services import run_poc  # noqa: E402
+from src.services.bulk_evaluate import BulkRun, _load_checkpoint, _prepare, _read_chunks  # noqa: E402
+from src.services.circuit_breaker import CircuitBreaker  # noqa: E402
+from src.services.llm_cassette import cassette_key, get_cassette  # noqa: E402
+from src.services.llm_request import close_openai_clients, get_llm_request_template  # noqa: E402
+from src.services.run_poc import DEFAULT_INPUT  # noqa: E402
+
+
+def _record_completion(cassette_path: str, prepared) -> None:
+    """Put the completion for ``prepared`` into the cassette, keyed as run_poc will request it."""
+    deterministic = prepared["deterministic"]
+    template = get_llm_request_template()
+    messages = template.build_messages(
+        input_payload=prepared["payload"],
+        calculated_profile_score=deterministic["scoring_result"]["score"],
+        calculated_interview_readiness=deterministic["interview_readiness_result"],
+        target_company_label=deterministic["target_company_label"],
+    )
+    request_body = json.dumps({"messages": messages, "response_format": template.response_format})
+    completion = {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "gpt-4o",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": build_evaluation(b"test"), "refusal": None},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }
+        ],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+    get_cassette(cassette_path).put(cassette_key(request_body.encode("utf-8")), "gpt-4o", json.dumps(completion))
+
+
+def _open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(
+        "test", window=60, min_calls=1, failure_rate=0.5,
+        slow_call_seconds=20, slow_call_rate=0.5, open_seconds=3600,
+    )
+    breaker.record_failure(0.1)
+    return breaker
+
+
+class BulkEvaluateMissTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._saved = (settings.openai_cassette_mode, settings.openai_cassette_path)
+        settings.openai_cassette_mode = "replay"
+        settings.openai_cassette_path = os.path.join(self._tmp.name, "cassette.jsonl")
+        await close_openai_clients()
+
+        self.prepared = _prepare((0, DEFAULT_INPUT))
+        _record_completion(settings.openai_cassette_path, self.prepared)
+
+    async def asyncTearDown(self):
+        await close_openai_clients()
+        settings.openai_cassette_mode, settings.openai_cassette_path = self._saved
+        self._tmp.cleanup()
+
+    async def test_evaluate_returns_result_json(self):
+        with open(os.path.join(self._tmp.name, "out.jsonl"), "w", encoding="utf-8") as out:
+            bulk = BulkRun(out, AsyncCacheRepository(), concurrency=1)
+            result_json, degraded, error = await bulk._evaluate(self.prepared)
+
+        self.assertIsNone(error)
+        self.assertFalse(degraded)
+        self.assertIsInstance(result_json, str)
+        self.assertIn("profile_evaluation", json.loads(result_json))
+
+    async def test_run_chunk_writes_ok_line(self):
+        output_path = os.path.join(self._tmp.name, "out.jsonl")
+        with open(output_path, "w", encoding="utf-8") as out:
+            bulk = BulkRun(out, AsyncCacheRepository(), concurrency=1)
+            await bulk.run_chunk([self.prepared])
+
+        self.assertEqual(bulk.counts["ok"], 1)
+        self.assertEqual(bulk.counts["error"], 0)
+        with open(output_path, encoding="utf-8") as f:
+            record = json.loads(f.readline())
+        self.assertEqual(record["status"], "ok")
+        self.assertEqual(record["source"], "llm")
+        self.assertIn("profile_evaluation", record["result"])
+
+    async def test_degraded_result_is_not_checkpointed(self):
+        output_path = os.path.join(self._tmp.name, "out.jsonl")
+        with mock.patch.object(run_poc, "get_llm_circuit_breaker", return_value=_open_breaker()):
+            with open(output_path, "w", encoding="utf-8") as out:
+                bulk = BulkRun(out, AsyncCacheRepository(), concurrency=1)
+                await bulk.run_chunk([self.prepared])
+
+        self.assertEqual(bulk.counts["ok"], 0)
+        self.assertEqual(bulk.counts["degraded"], 1)
+        with open(output_path, encoding="utf-8") as f:
+            record = json.loads(f.readline())
+        self.assertEqual(record["status"], "degraded")
+        self.assertTrue(record["result"]["degraded"])
+        self.assertEqual(_load_checkpoint(output_path), set())
+
+
+class BulkInputTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def _write(self, name, text):
+        path = os.path.join(self._tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_input_is_read_in_chunks(self):
+        lines = ['{"n": %d}' % n for n in range(5)]
+        path = self._write("in.jsonl", "\n".join(lines[:2] + ["", "not json"] + lines[2:]) + "\n")
+        chunks = _read_chunks(path, done={1}, chunk_size=2)
+
+        pending, invalid = next(chunks)
+        self.assertEqual(pending, [(0, {"n": 0}), (3, {"n": 2})])
+        self.assertEqual([record["index"] for record in invalid], [2])
+        self.assertEqual(list(chunks), [([(4, {"n": 3}), (5, {"n": 4})], [])])
+
+    def test_checkpoint_drops_a_cut_off_line(self):
+        path = self._write(
+            "out.jsonl",
+            '{"index": 0, "status": "ok"}\n{"index": 1, "status": "error"}\n{"index": 2, "sta',
+        )
+        self.assertEqual(_load_checkpoint(path), {0})
+        with open(path, encoding="utf-8") as f:
+            self.assertTrue(f.read().endswith('"error"}\n'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Deletes and rewrites in one process drop the entry from another process's
+L1 (Postgres LISTEN/NOTIFY).
+
+Needs a Postgres database with init.sql applied; set TEST_DATABASE_URL to
+run these (the response_cache table is emptied before each test).
+
+Run from backend/:
+    TEST_DATABASE_URL=postgresql://... python -m unittest discover -s tests
+"""
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from src.config.settings import settings  # noqa: E402
+from src.repositories.cache_invalidation import listen_for_invalidations  # noqa: E402
+from src.repositories.cache_pruner import CachePruner  # noqa: E402
+from src.repositories.cache_repository import CacheRepository  # noqa: E402
+from src.repositories.connection_pool import DatabasePool  # noqa: E402
+from src.repositories.memory_cache import LRUByteCache  # noqa: E402
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "TEST_DATABASE_URL is not set")
+class L1InvalidationTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        for name, value in (("database_url", TEST_DATABASE_URL), ("cache_enabled", True)):
+            patcher = mock.patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.pool = DatabasePool(
+            TEST_DATABASE_URL, pool_size=1, max_overflow=2, pool_timeout=5, max_lifetime=300
+        )
+        self.addCleanup(self.pool.close)
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("TRUNCATE response_cache")
+
+        # "This" process: a repository writing through its own L1 ...
+        self.writer = CacheRepository(self.pool, l1_cache=LRUByteCache(max_bytes=1 << 20))
+        # ... and another process's L1, kept current by the listener.
+        self.l1 = LRUByteCache(max_bytes=1 << 20)
+        self.reader = CacheRepository(self.pool, l1_cache=self.l1)
+        self.listener = asyncio.create_task(listen_for_invalidations(self.l1))
+        await asyncio.sleep(0.3)
+
+    async def asyncTearDown(self):
+        self.listener.cancel()
+        try:
+            await self.listener
+        except asyncio.CancelledError:
+            pass
+
+    def _cache(self, *cache_keys):
+        for cache_key in cache_keys:
+            self.writer.set(cache_key, "ns", '{"ok":true}')
+            self.assertIsNotNone(self.reader.get(cache_key, "ns"))
+
+    async def _wait_for_miss(self, cache_key):
+        for _ in range(40):
+            if self.reader.get_from_memory(cache_key, "ns") is None:
+                return
+            await asyncio.sleep(0.05)
+        self.fail(f"{cache_key} is still in the other process's L1")
+
+    async def test_delete(self):
+        self._cache("a", "b")
+        self.writer.delete("a", "ns")
+        await self._wait_for_miss("a")
+        self.assertIsNotNone(self.reader.get_from_memory("b", "ns"))
+
+    async def test_rewrite(self):
+        self._cache("a")
+        self.writer.set_many([("a", '{"ok":false}')], "ns")
+        await self._wait_for_miss("a")
+        self.assertEqual(self.reader.get("a", "ns"), '{"ok":false}')
+
+    async def test_namespace_gc(self):
+        self._cache("a")
+        self.writer.delete_other_namespaces(["current"])
+        await self._wait_for_miss("a")
+
+    async def test_pruned_entries(self):
+        self._cache("a", "b", "c")
+        pruner = CachePruner(self.pool, max_entries=1, batch_size=1)
+        self.assertEqual(pruner.prune()["evicted"], 2)
+        for cache_key in ("a", "b"):
+            await self._wait_for_miss(cache_key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Cache pruning: TTL expiry and LRU/LFU eviction down to the size caps, in
+chunks of batch_size rows each committed on its own, by one process at a
+time (advisory lock).
+
+Needs a Postgres database with init.sql applied; set TEST_DATABASE_URL to
+run these (the response_cache table is emptied before each test).
+
+Run from backend/:
+    TEST_DATABASE_URL=postgresql://... python -m unittest discover -s tests
+"""
+import os
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from src.config.settings import settings  # noqa: E402
+from src.repositories.cache_pruner import _PRUNE_LOCK_ID, CachePruner  # noqa: E402
+from src.repositories.cache_repository import CacheRepository  # noqa: E402
+from src.repositories.connection_pool import DatabasePool  # noqa: E402
+from src.repositories.memory_cache import LRUByteCache  # noqa: E402
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+class _CountingConnection:
+    def __init__(self, conn):
+        self._conn = conn
+        self.commits = 0
+
+    def cursor(self, *args, **kwargs):
+        return self._conn.cursor(*args, **kwargs)
+
+    def commit(self):
+        self.commits += 1
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+
+class _CountingPool:
+    """Hands the pruner a connection that counts its commits."""
+
+    def __init__(self, pool: DatabasePool):
+        self._pool = pool
+        self.connections = []
+
+    @contextmanager
+    def connection(self):
+        with self._pool.connection() as conn:
+            counting = _CountingConnection(conn)
+            self.connections.append(counting)
+            yield counting
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "TEST_DATABASE_URL is not set")
+class CachePrunerTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(settings, "cache_enabled", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = DatabasePool(
+            TEST_DATABASE_URL, pool_size=1, max_overflow=2, pool_timeout=5, max_lifetime=300
+        )
+        self.addCleanup(self.pool.close)
+        self._execute("TRUNCATE response_cache")
+        repository = CacheRepository(self.pool, l1_cache=LRUByteCache(max_bytes=1 << 20))
+        # key0 is the oldest and least recently used entry, but the most used.
+        for n, hit_count in enumerate((10, 1, 2, 3, 4)):
+            repository.set(f"key{n}", "ns", '{"n":%d}' % n)
+            self._execute(
+                """
+                UPDATE response_cache
+                SET updated_at = CURRENT_TIMESTAMP - %s * INTERVAL '1 hour',
+                    last_accessed_at = CURRENT_TIMESTAMP - %s * INTERVAL '1 minute',
+                    hit_count = %s
+                WHERE cache_key = %s
+                """,
+                (5 - n, 5 - n, hit_count, f"key{n}"),
+            )
+
+    def _execute(self, sql, params=()):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                return cur.fetchall() if cur.description else None
+
+    def _keys(self):
+        return sorted(row[0] for row in self._execute("SELECT cache_key FROM response_cache"))
+
+    def test_ttl_expiry_in_chunks(self):
+        counting_pool = _CountingPool(self.pool)
+        # Entries 1h..5h old; a 2.5h TTL expires key0, key1, key2.
+        pruner = CachePruner(counting_pool, ttl_seconds=9000, batch_size=2)
+        self.assertEqual(pruner.prune(), {"expired": 3, "evicted": 0, "skipped": False})
+        self.assertEqual(self._keys(), ["key3", "key4"])
+        # One commit per chunk: 2 rows, then the last row.
+        self.assertEqual(counting_pool.connections[0].commits, 2)
+
+    def test_lru_eviction(self):
+        report = CachePruner(self.pool, max_entries=2, policy="lru", batch_size=2).prune()
+        self.assertEqual(report["evicted"], 3)
+        self.assertEqual(self._keys(), ["key3", "key4"])
+
+    def test_lfu_eviction(self):
+        CachePruner(self.pool, max_entries=2, policy="lfu").prune()
+        self.assertEqual(self._keys(), ["key0", "key4"])
+
+    def test_max_bytes_eviction(self):
+        CachePruner(self.pool, max_bytes=1).prune()
+        self.assertEqual(self._keys(), [])
+
+    def test_skipped_while_another_process_prunes(self):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_lock(%s)", (_PRUNE_LOCK_ID,))
+            try:
+                report = CachePruner(self.pool, max_entries=1).prune()
+            finally:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT pg_advisory_unlock(%s)", (_PRUNE_LOCK_ID,))
+
+        self.assertTrue(report["skipped"])
+        self.assertEqual(len(self._keys()), 5)
+        # The lock is released after a pass, so the next one runs.
+        self.assertFalse(CachePruner(self.pool, max_entries=1).prune()["skipped"])
+        self.assertEqual(len(self._keys()), 1)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            CachePruner(self.pool, policy="fifo")
+
+
+if __name__ == "__main__":
+    unittest.main()
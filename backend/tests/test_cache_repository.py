@@ -0,0 +1,44 @@
+"""
+Regression check that a cache lookup probes L1 once (no Postgres: the
+database tier fails and counts as a miss).
+
+Run from backend/:
+    python -m unittest discover -s tests
+"""
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from src.config.settings import settings  # noqa: E402
+from src.repositories.cache_repository import AsyncCacheRepository, CacheRepository  # noqa: E402
+from src.repositories.memory_cache import LRUByteCache  # noqa: E402
+
+
+class CacheLookupTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(settings, "cache_enabled", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.l1 = LRUByteCache(max_bytes=1 << 20)
+        self.repository = CacheRepository(l1_cache=self.l1)
+
+    def test_sync_miss_probes_l1_once(self):
+        self.assertIsNone(self.repository.get("missing", "gpt-4o"))
+        self.assertEqual(self.l1.stats()["misses"], 1)
+
+    async def test_async_miss_probes_l1_once(self):
+        self.assertIsNone(await AsyncCacheRepository(self.repository).get("missing", "gpt-4o"))
+        self.assertEqual(self.l1.stats()["misses"], 1)
+
+    async def test_async_hit_is_served_from_l1(self):
+        self.repository._remember("present", "gpt-4o", '{"ok": true}')
+        self.assertEqual(await AsyncCacheRepository(self.repository).get("present", "gpt-4o"), '{"ok": true}')
+        self.assertEqual(self.l1.stats()["misses"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Canonical cache keys: payloads that differ only in display-only fields share
+a key and an LLM input, and every feature still changes the key (pure
+functions, no Postgres).
+
+Run from backend/:
+    python -m unittest discover -s tests
+"""
+import copy
+import os
+import unittest
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from src.services.canonical_payload import (  # noqa: E402
+    QUIZ_FEATURES,
+    canonical_cache_key,
+    canonical_payload,
+    key_space_report,
+)
+from src.services.run_poc import DEFAULT_INPUT  # noqa: E402
+
+
+def _variant(**changes):
+    payload = copy.deepcopy(DEFAULT_INPUT)
+    payload["goals"]["requirementType"] = ["upskilling", "switch"]
+    for path, value in changes.items():
+        section, _, field = path.partition("__")
+        payload[section][field] = value
+    return payload
+
+
+class CanonicalKeyTest(unittest.TestCase):
+    def setUp(self):
+        self.base = _variant()
+
+    def assertSameEvaluation(self, other):
+        self.assertEqual(canonical_cache_key(other), canonical_cache_key(self.base))
+        self.assertEqual(canonical_payload(other), canonical_payload(self.base))
+
+    def test_display_only_fields_are_dropped(self):
+        self.assertSameEvaluation(_variant(quizResponses__primaryGoal="switch"))
+        self.assertSameEvaluation(_variant(goals__targetCompany="Not specified"))
+
+    def test_goal_lists_are_order_insensitive(self):
+        self.assertSameEvaluation(_variant(goals__requirementType=["switch", "upskilling", "switch"]))
+
+    def test_unknown_fields_are_dropped(self):
+        other = _variant()
+        other["utm_source"] = "newsletter"
+        other["quizResponses"]["sessionId"] = "abc"
+        self.assertSameEvaluation(other)
+        self.assertNotIn("sessionId", canonical_payload(other)["quizResponses"])
+
+    def test_every_feature_changes_the_key(self):
+        base_key = canonical_cache_key(self.base)
+        for field in QUIZ_FEATURES:
+            with self.subTest(field=field):
+                changed = _variant(**{f"quizResponses__{field}": "changed"})
+                self.assertNotEqual(canonical_cache_key(changed), base_key)
+        self.assertNotEqual(canonical_cache_key(_variant(goals__topicOfInterest=["dsa"])), base_key)
+        other = _variant()
+        other["background"] = "non-tech"
+        self.assertNotEqual(canonical_cache_key(other), base_key)
+
+    def test_absent_quiz_fields_stay_absent(self):
+        other = _variant()
+        del other["quizResponses"]["mockInterviews"]
+        self.assertNotIn("mockInterviews", canonical_payload(other)["quizResponses"])
+        self.assertNotEqual(canonical_cache_key(other), canonical_cache_key(self.base))
+
+    def test_key_space_report(self):
+        report = key_space_report([self.base, _variant(quizResponses__primaryGoal="switch")])
+        self.assertEqual(report["distinct_raw_keys"], 2)
+        self.assertEqual(report["distinct_canonical_keys"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
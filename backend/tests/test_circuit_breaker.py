@@ -0,0 +1,151 @@
+"""
+Circuit breaker state transitions (failure rate, slow calls, half-open
+probe) and the shape of the degraded, rule-based response an open breaker
+answers with (no network, no Postgres).
+
+Run from backend/:
+    python -m unittest discover -s tests
+"""
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from src.models.models import FullProfileEvaluationResponse  # noqa: E402
+from src.repositories.cache_repository import CacheRepository  # noqa: E402
+from src.services import run_poc  # noqa: E402
+from src.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker  # noqa: E402
+
+NON_TECH_INPUT = {
+    "background": "non-tech",
+    "quizResponses": {
+        "currentRole": "other",
+        "experience": "0-2",
+        "targetRole": "backend-sde",
+        "codeComfort": "complete-beginner",
+        "stepsTaken": "just-exploring",
+        "timePerWeek": "0-2",
+        "targetCompany": "product",
+    },
+    "goals": {"requirementType": [], "targetCompany": "", "topicOfInterest": []},
+}
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = [0.0]
+        self.breaker = CircuitBreaker(
+            "test", window=60, min_calls=4, failure_rate=0.5,
+            slow_call_seconds=10, slow_call_rate=0.5, open_seconds=30,
+            clock=lambda: self.now[0],
+        )
+
+    def _open(self):
+        for _ in range(4):
+            self.breaker.record_failure(0.1)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_stays_closed_below_min_calls(self):
+        for _ in range(3):
+            self.breaker.record_failure(0.1)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_opens_on_failure_rate(self):
+        self.breaker.record_success(0.1)
+        self.breaker.record_success(0.1)
+        self.breaker.record_failure(0.1)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record_failure(0.1)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_opens_on_slow_call_rate(self):
+        for duration in (0.1, 0.1, 12.0, 15.0):
+            self.breaker.record_success(duration)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_old_calls_leave_the_window(self):
+        for _ in range(3):
+            self.breaker.record_failure(0.1)
+        self.now[0] = 61.0
+        self.breaker.record_failure(0.1)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_after_open_seconds_with_a_single_probe(self):
+        self._open()
+        self.now[0] = 29.0
+        self.assertFalse(self.breaker.allow())
+        self.now[0] = 30.0
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_probe_success_closes(self):
+        self._open()
+        self.now[0] = 30.0
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success(0.1)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.stats()["calls_in_window"], 0)
+
+    def test_probe_failure_reopens(self):
+        self._open()
+        self.now[0] = 30.0
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure(0.1)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_slow_probe_reopens(self):
+        self._open()
+        self.now[0] = 30.0
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success(12.0)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_release_frees_the_probe(self):
+        self._open()
+        self.now[0] = 30.0
+        self.assertTrue(self.breaker.allow())
+        self.breaker.release()
+        self.assertTrue(self.breaker.allow())
+
+
+class DegradedResponseTest(unittest.TestCase):
+    def setUp(self):
+        breaker = CircuitBreaker(
+            "test", window=60, min_calls=1, failure_rate=0.5,
+            slow_call_seconds=20, slow_call_rate=0.5, open_seconds=3600,
+        )
+        breaker.record_failure(0.1)
+        patcher = mock.patch.object(run_poc, "get_llm_circuit_breaker", return_value=breaker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _evaluate(self, input_payload):
+        result = run_poc.run_poc(input_payload=input_payload, cache_repository=CacheRepository())
+        self.assertTrue(result.degraded)
+        # The full public response, as a cached LLM answer would be.
+        return FullProfileEvaluationResponse.model_validate_json(result.model_dump_json())
+
+    def test_tech_fallback_is_a_complete_response(self):
+        result = self._evaluate(run_poc.DEFAULT_INPUT)
+        profile = result.profile_evaluation
+        self.assertTrue(profile.skill_analysis.strengths)
+        self.assertTrue(profile.interview_readiness.technical_notes)
+        metrics = profile.peer_comparison.metrics
+        self.assertEqual(metrics.profile_strength_percent, profile.profile_strength_score)
+
+    def test_non_tech_fallback_is_a_complete_response(self):
+        result = self._evaluate(NON_TECH_INPUT)
+        profile = result.profile_evaluation
+        self.assertTrue(profile.skill_analysis.strengths)
+        self.assertTrue(profile.interview_readiness.technical_notes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""
+HTTP caching of evaluations: the stored bytes are served as-is with a
+strong ETag, If-None-Match gets a 304, GET /evaluation gzips for clients
+that accept it, degraded POST results carry no key or validator, and batch
+bodies are read item by item (L1-only cache, no network, no Postgres).
+
+Run from backend/:
+    python -m unittest discover -s tests
+"""
+import json
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from loadtest.mock_openai import build_evaluation  # noqa: E402
+from src.api.main import EVALUATION_KEY_HEADER, app, get_cache_repository  # noqa: E402
+from src.config.settings import settings  # noqa: E402
+from src.repositories.cache_repository import (  # noqa: E402
+    AsyncCacheRepository,
+    CacheRepository,
+    _decode_body,
+    canonical_response_json,
+)
+from src.repositories.memory_cache import LRUByteCache  # noqa: E402
+from src.repositories.request_frequency_repository import request_frequency  # noqa: E402
+from src.services import run_poc  # noqa: E402
+from src.services.cache_version import get_cache_namespace  # noqa: E402
+from src.services.canonical_payload import canonical_cache_key, canonical_payload  # noqa: E402
+from src.services.circuit_breaker import CircuitBreaker  # noqa: E402
+
+EVALUATION_URL = "/career-profile-tool/api/evaluation/"
+EVALUATE_URL = "/career-profile-tool/api/evaluate"
+
+
+class _ApiTestCase(unittest.TestCase):
+    """A stored evaluation for DEFAULT_INPUT in an L1-only cache."""
+
+    def setUp(self):
+        patcher = mock.patch.object(settings, "cache_enabled", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.repository = CacheRepository(l1_cache=LRUByteCache(max_bytes=1 << 20))
+        app.dependency_overrides[get_cache_repository] = lambda: AsyncCacheRepository(self.repository)
+        self.addCleanup(app.dependency_overrides.clear)
+        # POSTs count requests while the cache is on; drop them afterwards.
+        self.addCleanup(request_frequency.flush, lambda counts: True)
+        self.client = TestClient(app)
+
+        self.cache_key = canonical_cache_key(canonical_payload(run_poc.DEFAULT_INPUT))
+        self.body = canonical_response_json(json.loads(build_evaluation(b"api")))
+        self.repository._remember(self.cache_key, get_cache_namespace("gpt-4o"), self.body)
+
+
+class EvaluationApiTest(_ApiTestCase):
+    def _get(self, **headers):
+        return self.client.get(EVALUATION_URL + self.cache_key, headers=headers)
+
+    def test_get_serves_the_stored_bytes_with_a_strong_etag(self):
+        response = self._get(**{"Accept-Encoding": "identity"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.body.encode("utf-8"))
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertFalse(response.headers["etag"].startswith("W/"))
+        self.assertIn("public", response.headers["cache-control"])
+
+    def test_if_none_match_gets_a_304(self):
+        etag = self._get(**{"Accept-Encoding": "identity"}).headers["etag"]
+        response = self._get(**{"Accept-Encoding": "identity", "If-None-Match": f"W/{etag}"})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response.headers["etag"], etag)
+
+    def test_gzip_has_its_own_etag(self):
+        identity_etag = self._get(**{"Accept-Encoding": "identity"}).headers["etag"]
+        response = self.client.get(
+            EVALUATION_URL + self.cache_key, headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+        self.assertEqual(response.headers["etag"], identity_etag[:-1] + '-gzip"')
+        # httpx has already gunzipped the body.
+        self.assertEqual(response.content, self.body.encode("utf-8"))
+        # The identity validator does not revalidate the gzip representation.
+        response = self._get(**{"Accept-Encoding": "gzip", "If-None-Match": identity_etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_key_is_a_404(self):
+        self.assertEqual(self.client.get(EVALUATION_URL + "0" * 64).status_code, 404)
+
+    def test_post_cache_hit_matches_get(self):
+        response = self.client.post(EVALUATE_URL, json=run_poc.DEFAULT_INPUT)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.body.encode("utf-8"))
+        self.assertEqual(response.headers[EVALUATION_KEY_HEADER], self.cache_key)
+        get_etag = self._get(**{"Accept-Encoding": "identity"}).headers["etag"]
+        self.assertEqual(response.headers["etag"], get_etag)
+
+    def test_degraded_post_has_no_key_or_etag(self):
+        self.repository._forget()
+        breaker = CircuitBreaker(
+            "test", window=60, min_calls=1, failure_rate=0.5,
+            slow_call_seconds=20, slow_call_rate=0.5, open_seconds=3600,
+        )
+        breaker.record_failure(0.1)
+        with mock.patch.object(run_poc, "get_llm_circuit_breaker", return_value=breaker):
+            response = self.client.post(EVALUATE_URL, json=run_poc.DEFAULT_INPUT)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["degraded"])
+        self.assertNotIn(EVALUATION_KEY_HEADER.lower(), response.headers)
+        self.assertNotIn("etag", response.headers)
+        self.assertEqual(response.headers["cache-control"], "no-store")
+
+
+class BatchBodyTest(_ApiTestCase):
+    BATCH_URL = "/career-profile-tool/api/evaluate/batch"
+
+    def _post(self, body, content_type="application/x-ndjson"):
+        return self.client.post(self.BATCH_URL, content=body, headers={"Content-Type": content_type})
+
+    def test_ndjson_is_read_line_by_line(self):
+        line = json.dumps(run_poc.DEFAULT_INPUT).encode("utf-8")
+
+        def body():
+            # Lines split across chunks, and no newline at the end.
+            yield line[:10]
+            yield line[10:] + b"\n\n" + line[:20]
+            yield line[20:]
+
+        response = self._post(body())
+        self.assertEqual(response.status_code, 200)
+        records = [json.loads(record) for record in response.text.splitlines()]
+        self.assertEqual(sorted(record["index"] for record in records), [0, 1])
+        self.assertTrue(all(record["status"] == "ok" for record in records))
+
+    def test_json_array(self):
+        response = self._post(json.dumps([run_poc.DEFAULT_INPUT]), "application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.text)["status"], "ok")
+
+    def test_too_many_items(self):
+        line = json.dumps(run_poc.DEFAULT_INPUT) + "\n"
+        with mock.patch.object(settings, "batch_max_items", 2):
+            self.assertEqual(self._post(line * 3).status_code, 413)
+            self.assertEqual(self._post(line * 2).status_code, 200)
+
+    def test_malformed_line(self):
+        self.assertEqual(self._post(json.dumps(run_poc.DEFAULT_INPUT) + "\n{oops\n").status_code, 400)
+
+    def test_invalid_item(self):
+        response = self._post(json.dumps(run_poc.DEFAULT_INPUT) + '\n{"background": 1}\n')
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["detail"][0]["index"], 1)
+
+
+class StoredFormTest(unittest.TestCase):
+    def test_jsonb_text_reads_back_in_the_stored_form(self):
+        response = json.loads(build_evaluation(b"jsonb"))
+        stored = canonical_response_json(response)
+        # Postgres returns JSONB with its own spacing and key order.
+        jsonb_text = json.dumps(dict(reversed(list(response.items()))), indent=1)
+        self.assertEqual(_decode_body("key", {"response_zstd": None, "response_json": jsonb_text}), stored)
+
+
+if __name__ == "__main__":
+    unittest.main()
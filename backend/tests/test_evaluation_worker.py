@@ -0,0 +1,75 @@
+"""
+The job worker renews its lease while a job is evaluated and stops once
+the job is done or the lease is lost (in-memory job repository, no
+Postgres).
+
+Run from backend/:
+    python -m unittest discover -s tests
+"""
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from src.config.settings import settings  # noqa: E402
+from src.repositories.job_repository import JobRepository  # noqa: E402
+from src.services import evaluation_worker  # noqa: E402
+
+
+class _Jobs(JobRepository):
+    def __init__(self, keep_lease: bool = True):
+        super().__init__()
+        self.keep_lease = keep_lease
+        self.renewals = 0
+        self.completed = []
+
+    def renew_lease(self, job_id, worker_id, lease_seconds):
+        self.renewals += 1
+        return self.keep_lease
+
+    def complete(self, job_id, worker_id, result_json):
+        self.completed.append(job_id)
+        return True
+
+
+def _slow_evaluation(seconds: float):
+    async def evaluate(**kwargs):
+        await asyncio.sleep(seconds)
+        return "key", '{"ok":true}', False
+    return evaluate
+
+
+class LeaseHeartbeatTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(settings, "job_lease_seconds", 0.15)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.job = {"id": "job-1", "payload": {}, "attempts": 1}
+
+    async def _run(self, jobs: _Jobs, seconds: float) -> str:
+        with mock.patch.object(evaluation_worker, "run_poc_json_async", _slow_evaluation(seconds)):
+            return await evaluation_worker.run_job(self.job, jobs, None, "worker-1")
+
+    async def test_lease_is_renewed_while_the_job_runs(self):
+        jobs = _Jobs()
+        self.assertEqual(await self._run(jobs, 0.4), "done")
+        self.assertGreaterEqual(jobs.renewals, 3)
+        self.assertEqual(jobs.completed, ["job-1"])
+
+        # No renewals once the job has finished.
+        renewals = jobs.renewals
+        await asyncio.sleep(0.15)
+        self.assertEqual(jobs.renewals, renewals)
+
+    async def test_renewal_stops_once_the_lease_is_lost(self):
+        jobs = _Jobs(keep_lease=False)
+        await self._run(jobs, 0.4)
+        self.assertEqual(jobs.renewals, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
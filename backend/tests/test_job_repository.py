@@ -0,0 +1,91 @@
+"""
+evaluation_jobs queue semantics: claim order, SKIP LOCKED hand-out, lease
+expiry and renewal, and delayed retries.
+
+Needs a Postgres database with init.sql applied; set TEST_DATABASE_URL to
+run these (the evaluation_jobs table is emptied before each test).
+
+Run from backend/:
+    TEST_DATABASE_URL=postgresql://... python -m unittest discover -s tests
+"""
+import os
+import time
+import unittest
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from src.repositories.connection_pool import DatabasePool  # noqa: E402
+from src.repositories.job_repository import JobRepository  # noqa: E402
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "TEST_DATABASE_URL is not set")
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = DatabasePool(
+            TEST_DATABASE_URL, pool_size=1, max_overflow=2, pool_timeout=5, max_lifetime=300
+        )
+        self.addCleanup(self.pool.close)
+        self._execute("TRUNCATE evaluation_jobs")
+        self.jobs = JobRepository(self.pool)
+
+    def _execute(self, sql, params=()):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+
+    def _enqueue(self, name):
+        return self.jobs.enqueue(name, {"background": "tech"})
+
+    def test_claims_oldest_first_and_never_twice(self):
+        first, second = self._enqueue("a"), self._enqueue("b")
+        self.assertEqual(self.jobs.claim("w1", 60)["id"], first)
+        self.assertEqual(self.jobs.claim("w2", 60)["id"], second)
+        self.assertIsNone(self.jobs.claim("w3", 60))
+
+    def test_locked_job_is_skipped(self):
+        first, second = self._enqueue("a"), self._enqueue("b")
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                # Another worker is between its SELECT and UPDATE on the first job.
+                cur.execute("SELECT id FROM evaluation_jobs WHERE id = %s FOR UPDATE", (first,))
+                self.assertEqual(self.jobs.claim("w2", 60)["id"], second)
+
+    def test_expired_lease_is_claimed_again(self):
+        job_id = self._enqueue("a")
+        self.jobs.claim("w1", 0.1)
+        time.sleep(0.2)
+        job = self.jobs.claim("w2", 60)
+        self.assertEqual((job["id"], job["attempts"]), (job_id, 2))
+        # The first worker's result is discarded.
+        self.assertFalse(self.jobs.complete(job_id, "w1", "{}"))
+        self.assertTrue(self.jobs.complete(job_id, "w2", "{}"))
+
+    def test_renewed_lease_is_not_claimed(self):
+        job_id = self._enqueue("a")
+        self.jobs.claim("w1", 0.2)
+        self.assertTrue(self.jobs.renew_lease(job_id, "w1", 60))
+        time.sleep(0.3)
+        self.assertIsNone(self.jobs.claim("w2", 60))
+        self.assertFalse(self.jobs.renew_lease(job_id, "w2", 60))
+
+    def test_failed_attempt_waits_for_retry_at(self):
+        job_id = self._enqueue("a")
+        self.jobs.claim("w1", 60)
+        self.assertEqual(self.jobs.fail(job_id, "w1", "boom", 3, retry_after=0.2), "queued")
+        self.assertIsNone(self.jobs.claim("w2", 60))
+        time.sleep(0.3)
+        self.assertEqual(self.jobs.claim("w2", 60)["id"], job_id)
+
+    def test_last_attempt_fails_for_good(self):
+        job_id = self._enqueue("a")
+        self.jobs.claim("w1", 60)
+        self.assertEqual(self.jobs.fail(job_id, "w1", "boom", 1), "failed")
+        self.assertIsNone(self.jobs.claim("w2", 60))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Token-bucket admission for OpenAI calls: refill and take, FIFO timeout,
+429 draining, and the breaker probe a timed-out attempt gives back
+(process-local buckets, no Postgres).
+
+Run from backend/:
+    python -m unittest discover -s tests
+"""
+import asyncio
+import os
+import time
+import unittest
+from unittest import mock
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from src.services import run_poc  # noqa: E402
+from src.services.circuit_breaker import HALF_OPEN, CircuitBreaker  # noqa: E402
+from src.services.llm_admission import (  # noqa: E402
+    LLMAdmission,
+    LLMAdmissionTimeout,
+    PostgresBuckets,
+    _take,
+)
+
+
+class _NoSharedBuckets(PostgresBuckets):
+    """Postgres unavailable: LLMAdmission falls back to its local buckets."""
+
+    def __init__(self):
+        self.drained = []
+
+    def try_take(self, name, rpm, tpm, tokens):
+        return None
+
+    def drain(self, name):
+        self.drained.append(name)
+        return False
+
+
+class TakeTest(unittest.TestCase):
+    def test_take_from_full_buckets(self):
+        levels, wait = _take((60.0, 1000.0), 0.0, rpm=60, tpm=1000, tokens=300)
+        self.assertEqual(wait, 0.0)
+        self.assertEqual(levels, (59.0, 700.0))
+
+    def test_empty_request_bucket_waits_for_one_refill(self):
+        levels, wait = _take((0.0, 1000.0), 0.0, rpm=60, tpm=None, tokens=300)
+        self.assertAlmostEqual(wait, 1.0)
+        self.assertEqual(levels, (0.0, 1000.0))
+
+    def test_refill_is_capped_at_one_minute_of_quota(self):
+        levels, wait = _take((0.0, 0.0), 3600.0, rpm=60, tpm=1000, tokens=100)
+        self.assertEqual(wait, 0.0)
+        self.assertEqual(levels, (59.0, 900.0))
+
+    def test_token_shortfall_sets_the_wait(self):
+        _, wait = _take((10.0, 100.0), 0.0, rpm=60, tpm=600, tokens=200)
+        self.assertAlmostEqual(wait, 10.0)
+
+
+class AdmissionTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.shared = _NoSharedBuckets()
+        self.admission = LLMAdmission(rpm=2, tpm=None, max_wait=0.2, shared=self.shared)
+
+    def test_timeout_once_the_wait_exceeds_max_wait(self):
+        self.admission.acquire("gpt-4o", 100)
+        self.admission.acquire("gpt-4o", 100)
+        started = time.monotonic()
+        with self.assertRaises(LLMAdmissionTimeout) as raised:
+            self.admission.acquire("gpt-4o", 100)
+        # A 30s refill is never waited for when max_wait is 0.2s.
+        self.assertLess(time.monotonic() - started, 0.2)
+        self.assertAlmostEqual(raised.exception.retry_after, 30.0, delta=0.5)
+
+    async def test_async_timeout(self):
+        await self.admission.acquire_async("gpt-4o", 100)
+        await self.admission.acquire_async("gpt-4o", 100)
+        with self.assertRaises(LLMAdmissionTimeout):
+            await self.admission.acquire_async("gpt-4o", 100)
+
+    def test_models_have_separate_buckets(self):
+        self.admission.acquire("gpt-4o", 100)
+        self.admission.acquire("gpt-4o", 100)
+        self.admission.acquire("gpt-4o-mini", 100)
+
+    def test_rate_limited_drains_the_buckets(self):
+        self.admission.on_rate_limited("gpt-4o")
+        with self.assertRaises(LLMAdmissionTimeout):
+            self.admission.acquire("gpt-4o", 100)
+        self.admission._drainer.shutdown(wait=True)
+        self.assertEqual(self.shared.drained, ["gpt-4o"])
+
+
+class AdmissionTimeoutReleasesProbeTest(unittest.IsolatedAsyncioTestCase):
+    async def test_half_open_probe_is_released(self):
+        now = [0.0]
+        breaker = CircuitBreaker(
+            "test", window=60, min_calls=1, failure_rate=0.5,
+            slow_call_seconds=20, slow_call_rate=0.5, open_seconds=30,
+            clock=lambda: now[0],
+        )
+        breaker.record_failure(0.1)
+        now[0] = 31.0
+        admission = LLMAdmission(rpm=1, tpm=None, max_wait=0.1, shared=_NoSharedBuckets())
+        admission.acquire("gpt-4o", 100)
+
+        with mock.patch.object(run_poc, "get_llm_circuit_breaker", return_value=breaker), \
+                mock.patch.object(run_poc, "get_llm_admission", return_value=admission):
+            with self.assertRaises(LLMAdmissionTimeout):
+                await run_poc.call_openai_structured_async(
+                    api_key="sk-test",
+                    openai_model="gpt-4o",
+                    input_payload=run_poc.DEFAULT_INPUT,
+                    calculated_profile_score=60,
+                    calculated_interview_readiness={
+                        "technical_interview_percent": 60,
+                        "hr_behavioral_percent": 60,
+                    },
+                    target_company_label="FAANG",
+                )
+
+        # The probe slot is free again rather than held until open_seconds pass.
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+L1 expiry: the TTL is capped at CACHE_TTL, and expired entries are misses
+(in-process only, no Postgres).
+
+Run from backend/:
+    python -m unittest discover -s tests
+"""
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from src.config.settings import settings  # noqa: E402
+from src.repositories import memory_cache  # noqa: E402
+from src.repositories.memory_cache import LRUByteCache, l1_ttl_seconds  # noqa: E402
+
+
+class L1TtlTest(unittest.TestCase):
+    def _ttl(self, l1_cache_ttl, cache_ttl):
+        with mock.patch.object(settings, "l1_cache_ttl", l1_cache_ttl), \
+                mock.patch.object(settings, "cache_ttl", cache_ttl):
+            return l1_ttl_seconds()
+
+    def test_capped_at_cache_ttl(self):
+        self.assertEqual(self._ttl(3600, 600), 600)
+        self.assertEqual(self._ttl(300, 600), 300)
+
+    def test_either_limit_alone(self):
+        self.assertEqual(self._ttl(None, 600), 600)
+        self.assertEqual(self._ttl(3600, None), 3600)
+        self.assertIsNone(self._ttl(None, None))
+
+    def test_expired_entry_is_a_miss(self):
+        now = [100.0]
+        cache = LRUByteCache(max_bytes=1024, ttl_seconds=10)
+        with mock.patch.object(memory_cache.time, "monotonic", lambda: now[0]):
+            cache.set("key", b"value")
+            now[0] = 109.0
+            self.assertEqual(cache.get("key"), b"value")
+            now[0] = 110.0
+            self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
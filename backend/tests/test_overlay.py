@@ -0,0 +1,60 @@
+"""
+Which sections of the response come from the rule modules and which from
+the LLM once apply_deterministic_overlay has merged them.
+
+Run from backend/:
+    python -m unittest discover -s tests
+"""
+import json
+import os
+import unittest
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from loadtest.mock_openai import build_evaluation  # noqa: E402
+from src.models.models_raw import FullProfileEvaluationResponseRaw  # noqa: E402
+from src.services.canonical_payload import canonical_payload  # noqa: E402
+from src.services.run_poc import (  # noqa: E402
+    DEFAULT_INPUT,
+    apply_deterministic_overlay,
+    compute_deterministic_sections,
+)
+
+
+class OverlayTest(unittest.TestCase):
+    def setUp(self):
+        self.payload = canonical_payload(DEFAULT_INPUT)
+        self.deterministic = compute_deterministic_sections(self.payload)
+        raw = json.loads(build_evaluation(b"overlay"))
+        # Far from the rule score, so the source of each number is unambiguous.
+        raw["profile_evaluation"]["peer_comparison"]["metrics"]["better_than_peers_percent"] = 97
+        self.llm_result = FullProfileEvaluationResponseRaw.model_validate(raw)
+
+    def test_profile_strength_percent_is_the_rule_score(self):
+        result = apply_deterministic_overlay(self.llm_result, self.payload, self.deterministic)
+        score = self.deterministic["scoring_result"]["score"]
+        metrics = result.profile_evaluation.peer_comparison.metrics
+        self.assertEqual(result.profile_evaluation.profile_strength_score, score)
+        self.assertEqual(metrics.profile_strength_percent, score)
+        self.assertEqual(metrics.better_than_peers_percent, 97)
+
+    def test_llm_sections_are_kept(self):
+        result = apply_deterministic_overlay(self.llm_result, self.payload, self.deterministic)
+        llm_profile = self.llm_result.profile_evaluation
+        self.assertEqual(
+            result.profile_evaluation.skill_analysis.strengths, llm_profile.skill_analysis.strengths
+        )
+        self.assertEqual(
+            result.profile_evaluation.interview_readiness.technical_notes,
+            llm_profile.interview_readiness.technical_notes,
+        )
+        self.assertEqual(
+            result.profile_evaluation.interview_readiness.technical_interview_percent,
+            self.deterministic["interview_readiness_result"]["technical_interview_percent"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
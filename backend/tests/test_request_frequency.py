@@ -0,0 +1,31 @@
+"""
+Regression check that request counts are not buffered without the cache
+database (CACHE_ENABLED=false).
+
+Run from backend/:
+    python -m unittest discover -s tests
+"""
+import os
+import unittest
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from src.repositories.request_frequency_repository import (  # noqa: E402
+    RequestFrequencyRepository,
+    request_frequency,
+)
+
+
+class RequestFrequencyWithoutCacheTest(unittest.TestCase):
+    def test_nothing_is_recorded(self):
+        request_frequency.record("key", "gpt-4o")
+        self.assertEqual(request_frequency.pending(), 0)
+
+    def test_flush_drops_counts(self):
+        self.assertTrue(RequestFrequencyRepository().increment_many({("key", "gpt-4o"): 3}))
+
+
+if __name__ == "__main__":
+    unittest.main()
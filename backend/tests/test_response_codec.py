@@ -0,0 +1,78 @@
+"""
+zstd response codec: round trips with and without a trained dictionary, and
+a frame written with another dictionary reads as a cache miss (no
+Postgres; skipped without zstd).
+
+Run from backend/:
+    python -m unittest discover -s tests
+"""
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from loadtest.mock_openai import build_evaluation  # noqa: E402
+from src.repositories import cache_repository  # noqa: E402
+from src.repositories.response_codec import (  # noqa: E402
+    ZSTD_AVAILABLE,
+    ResponseCodec,
+    frame_dictionary_id,
+    train_dictionary,
+)
+
+
+def _samples(prefix: bytes, count: int = 200):
+    return [build_evaluation(prefix + str(n).encode()).encode("utf-8") for n in range(count)]
+
+
+@unittest.skipUnless(ZSTD_AVAILABLE, "zstd is not installed")
+class ResponseCodecTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dictionary = train_dictionary(_samples(b"train"), 16 * 1024)
+        cls.other_dictionary = train_dictionary(_samples(b"other"), 8 * 1024)
+
+    def setUp(self):
+        self.body = build_evaluation(b"codec").encode("utf-8")
+
+    def test_round_trip_without_dictionary(self):
+        codec = ResponseCodec(level=3)
+        frame = codec.compress(self.body)
+        self.assertEqual(frame_dictionary_id(frame), 0)
+        self.assertEqual(codec.decompress(frame), self.body)
+
+    def test_round_trip_with_dictionary(self):
+        codec = ResponseCodec(level=3, dictionary=self.dictionary)
+        frame = codec.compress(self.body)
+        self.assertEqual(frame_dictionary_id(frame), codec.dict_id)
+        self.assertEqual(codec.decompress(frame), self.body)
+        self.assertLess(len(frame), len(ResponseCodec(level=3).compress(self.body)))
+
+    def test_plain_frames_stay_readable_after_adding_a_dictionary(self):
+        frame = ResponseCodec(level=3).compress(self.body)
+        self.assertEqual(ResponseCodec(level=3, dictionary=self.dictionary).decompress(frame), self.body)
+
+    def test_dictionary_id_mismatch(self):
+        codec = ResponseCodec(level=3, dictionary=self.dictionary)
+        other = ResponseCodec(level=3, dictionary=self.other_dictionary)
+        self.assertNotEqual(codec.dict_id, other.dict_id)
+
+        frame = other.compress(self.body)
+        with self.assertRaises(ValueError):
+            codec.decompress(frame)
+        with self.assertRaises(ValueError):
+            ResponseCodec(level=3).decompress(frame)
+
+    def test_mismatched_row_is_a_cache_miss(self):
+        frame = ResponseCodec(level=3, dictionary=self.other_dictionary).compress(self.body)
+        codec = ResponseCodec(level=3, dictionary=self.dictionary)
+        row = {"response_json": None, "response_zstd": frame}
+        with mock.patch.object(cache_repository, "get_response_codec", return_value=codec):
+            self.assertIsNone(cache_repository._decode_body("key", row))
+
+
+if __name__ == "__main__":
+    unittest.main()
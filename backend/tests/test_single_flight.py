@@ -0,0 +1,106 @@
+"""
+Coalescing of concurrent identical work: one execution per key in flight,
+shared results and errors, and a cancelled leader that does not cancel its
+followers (in-process, no Postgres).
+
+Run from backend/:
+    python -m unittest discover -s tests
+"""
+import asyncio
+import json
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ["CACHE_ENABLED"] = "false"
+
+from loadtest.mock_openai import build_evaluation  # noqa: E402
+from src.models.models_raw import FullProfileEvaluationResponseRaw  # noqa: E402
+from src.repositories.cache_repository import AsyncCacheRepository  # noqa: E402
+from src.services import run_poc  # noqa: E402
+from src.services.single_flight import SingleFlight  # noqa: E402
+
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.flights = SingleFlight("test")
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def _work(self):
+        self.calls += 1
+        await self.release.wait()
+        return f"result {self.calls}"
+
+    async def test_concurrent_callers_share_one_execution(self):
+        callers = [asyncio.create_task(self.flights.run("key", self._work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        self.release.set()
+
+        self.assertEqual(await asyncio.gather(*callers), ["result 1"] * 5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.flights.stats(), {"executions": 1, "coalesced": 4, "in_flight": 0})
+
+    async def test_different_keys_run_separately(self):
+        first = asyncio.create_task(self.flights.run("a", self._work))
+        second = asyncio.create_task(self.flights.run("b", self._work))
+        await asyncio.sleep(0)
+        self.release.set()
+        await asyncio.gather(first, second)
+        self.assertEqual(self.calls, 2)
+
+    async def test_finished_work_is_not_reused(self):
+        self.release.set()
+        self.assertEqual(await self.flights.run("key", self._work), "result 1")
+        self.assertEqual(await self.flights.run("key", self._work), "result 2")
+
+    async def test_errors_reach_every_caller(self):
+        async def fail():
+            await self.release.wait()
+            raise RuntimeError("boom")
+
+        callers = [asyncio.create_task(self.flights.run("key", fail)) for _ in range(3)]
+        await asyncio.sleep(0)
+        self.release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(self.flights.stats()["in_flight"], 0)
+
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        leader = asyncio.create_task(self.flights.run("key", self._work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(self.flights.run("key", self._work))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        self.release.set()
+        self.assertEqual(await follower, "result 1")
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+
+
+class CoalescedCacheMissTest(unittest.IsolatedAsyncioTestCase):
+    async def test_identical_misses_make_one_openai_call(self):
+        calls = []
+
+        async def call_openai(**kwargs):
+            calls.append(kwargs)
+            await asyncio.sleep(0.05)
+            return FullProfileEvaluationResponseRaw.model_validate(json.loads(build_evaluation(b"flight")))
+
+        with mock.patch.object(run_poc, "call_openai_structured_async", call_openai):
+            results = await asyncio.gather(*(
+                run_poc.run_poc_json_async(
+                    input_payload=run_poc.DEFAULT_INPUT, cache_repository=AsyncCacheRepository()
+                )
+                for _ in range(4)
+            ))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({response_json for _, response_json, _ in results}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()